@@ -0,0 +1,49 @@
+"""
+Сравнение памяти на одну точку: список B-записей (объекты полей) и FixTable (колонки).
+
+    python -m benchmarks.memory --fixes 100000
+"""
+import argparse
+import gc
+import io
+import tracemalloc
+from typing import Callable
+
+from benchmarks.synthetic import synthetic_flight
+from igcrepair.reader.stream import IGCReader
+from igcrepair.reader.table import FixTable
+
+
+def measure(build: Callable[[], object]) -> int:
+    """
+    :param build: Функция, строящая измеряемую структуру.
+    :return: Объем памяти, занятой результатом build, в байтах.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--fixes', type=int, default=100_000)
+    args = parser.parse_args()
+
+    data = synthetic_flight(args.fixes)
+    records = measure(lambda: list(IGCReader(io.BytesIO(data), record_types='B')))
+    table = measure(lambda: FixTable.from_records(IGCReader(io.BytesIO(data), record_types='B')))
+
+    print('fixes: {0}'.format(args.fixes))
+    print('BRecord objects: {0:.1f} bytes/fix'.format(records / args.fixes))
+    print('FixTable:        {0:.1f} bytes/fix'.format(table / args.fixes))
+    print('ratio:           {0:.1f}x'.format(records / table))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+Пропускная способность параллельного разбора в зависимости от количества процессов.
+
+    python -m benchmarks.parallel --files 200 --fixes 20000
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.synthetic import synthetic_flight
+from igcrepair.reader.parallel import ingest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--files', type=int, default=200)
+    parser.add_argument('--fixes', type=int, default=20_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        for i in range(args.files):
+            with open(os.path.join(directory, '{0:04d}.igc'.format(i)), 'wb') as file:
+                file.write(synthetic_flight(args.fixes, seed=i))
+
+        baseline = None
+        for workers in sorted(set(args.workers)):
+            start = time.perf_counter()
+            fixes = sum(len(result.fixes.time) for result in ingest(directory, max_workers=workers))
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(
+                'workers: {0:3d}  {1:8.2f} s  {2:12.0f} fixes/s  speedup {3:.1f}x'.format(
+                    workers, elapsed, fixes / elapsed, baseline / elapsed
+                )
+            )
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,260 @@
+"""
+Набор тестов производительности классов полей, разбора записей и чтения файлов целиком на синтетических треках.
+Для каждого теста выводятся операции в секунду, перцентили задержки на операцию и пиковая память (tracemalloc).
+
+    python -m benchmarks.suite --sizes 1000 100000 1000000
+    python -m benchmarks.suite --save baseline.json
+    python -m benchmarks.suite --compare baseline.json --threshold 10
+
+Данные генерируются с фиксированным seed, поэтому результаты воспроизводимы на одной машине. Базовые значения
+зависят от машины: сравнивать имеет смысл только с baseline, снятым там же.
+"""
+import argparse
+import gc
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import IO, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_b_records, synthetic_flight
+from igcrepair.reader.constants import (
+    B_RECORD_LENGTH,
+    B_RECORD_TIME,
+    B_RECORD_LATITUDE,
+    B_RECORD_LONGITUDE,
+    EXTENSION_SUBTYPES,
+)
+from igcrepair.reader.fields import TimeUTC, Latitude, Longitude
+from igcrepair.reader.records import IRecord
+from igcrepair.reader.stream import IGCReader
+from igcrepair.reader.table import FixTable
+from igcrepair.reader.utils import record2field
+from igcrepair.repair.gaps import repair_gaps
+from igcrepair.writer.columnar import Track, export_file, read_track
+from igcrepair.writer.igc import IGCWriter
+
+
+SIZES: List[int] = [1_000, 100_000, 1_000_000]
+# Для тестов отдельных полей размер не важен, берется фиксированное количество вызовов.
+MICRO_OPS: int = 100_000
+PERCENTILES: Sequence[int] = (50, 90, 99)
+THRESHOLD: float = 10.
+REPEAT: int = 3
+
+I_RECORDS: List[str] = [
+    'I033638FXA3940SIU4143ENL',
+    'I073638FXA3941ENL4246TAS4751GSP5254TRT5559VAT6063OAT',
+    'I013638ENL',
+]
+
+
+class Case(NamedTuple):
+    name: str
+    ops: int  # количество операций за один запуск
+    run: Callable[[], Iterable]  # каждый элемент результата - одна или несколько операций
+
+
+class Result(NamedTuple):
+    name: str
+    ops: int
+    seconds: float
+    ops_per_second: float
+    latency: Dict[str, float]  # перцентили задержки на операцию, мкс
+    peak_memory: Optional[int]  # байты
+
+
+def cases(sizes: Iterable[int], directory: str) -> Iterator[Case]:
+    """
+    :param sizes: Количества точек в синтетических треках.
+    :param directory: Каталог для временных файлов треков.
+    :return:
+    """
+    lines = synthetic_b_records(MICRO_OPS)
+    latitudes = [line[B_RECORD_LATITUDE] for line in lines]
+    longitudes = [line[B_RECORD_LONGITUDE] for line in lines]
+    times = [line[B_RECORD_TIME] for line in lines]
+    i_records = [I_RECORDS[i % len(I_RECORDS)] for i in range(MICRO_OPS)]
+    unique_i_records = [unique_i_record(i) for i in range(MICRO_OPS)]
+
+    yield Case('Latitude.from_string', MICRO_OPS, lambda: map(Latitude.from_string, latitudes))
+    yield Case('Longitude.from_string', MICRO_OPS, lambda: map(Longitude.from_string, longitudes))
+    yield Case('TimeUTC.from_string', MICRO_OPS, lambda: map(TimeUTC.from_string, times))
+    # Три различные строки: после первых вызовов измеряются попадания в кэш I-записей.
+    yield Case('IRecord.from_string', MICRO_OPS, lambda: map(IRecord.from_string, i_records))
+    # Все строки различны, кэш очищается перед каждым запуском: измеряется разбор.
+    yield Case('IRecord.from_string(unique)', MICRO_OPS, lambda: parse_i_records(unique_i_records))
+    yield Case(
+        'record2field', MICRO_OPS, lambda: (record2field(line, Latitude, B_RECORD_LATITUDE) for line in lines)
+    )
+
+    for size in sizes:
+        path = os.path.join(directory, '{0}.igc'.format(size))
+        with open(path, 'wb') as file:
+            file.write(synthetic_flight(size))
+        yield Case('IGCReader[{0}]'.format(size), size, lambda path=path: IGCReader(path, record_types='B'))
+        # Пара для сравнения ленивого и обычного разбора при чтении одного поля.
+        yield Case(
+            'IGCReader[{0}].time'.format(size), size,
+            lambda path=path: (record.time for record in IGCReader(path, record_types='B')),
+        )
+        yield Case(
+            'IGCReader(lazy)[{0}].time'.format(size), size,
+            lambda path=path: (record.time for record in IGCReader(path, record_types='B', lazy=True)),
+        )
+        yield Case('FixTable.from_file[{0}]'.format(size), size, lambda path=path: [FixTable.from_file(path)])
+        columns = export_file(path)
+        yield Case('read_track[{0}]'.format(size), size, lambda columns=columns: [read_track(columns)])
+        track = read_track(columns)
+        yield Case('IGCWriter[{0}]'.format(size), size, lambda track=track: [write_fixes(track)])
+        yield Case('repair_gaps[{0}]'.format(size), size, lambda track=track: [repair_gaps(track.fixes)])
+
+
+def unique_i_record(i: int) -> str:
+    """
+    :return: I-запись с двумя дополнениями. Типы, длины и начало дополнений выбираются по i, записи различны для
+             i < 3 * 81 * len(EXTENSION_SUBTYPES) ** 2.
+    """
+    subtypes = sorted(EXTENSION_SUBTYPES)
+    i, first = divmod(i, len(subtypes))
+    i, second = divmod(i, len(subtypes))
+    i, first_width = divmod(i, 9)
+    offset, second_width = divmod(i, 9)
+    start = B_RECORD_LENGTH + 1 + offset
+    middle = start + first_width + 1
+    return 'I02{0:02d}{1:02d}{2}{3:02d}{4:02d}{5}'.format(
+        start, middle - 1, subtypes[first], middle, middle + second_width, subtypes[second]
+    )
+
+
+def parse_i_records(i_records: List[str]) -> Iterator[IRecord]:
+    IRecord.cache_clear()
+    return map(IRecord.from_string, i_records)
+
+
+def write_fixes(track: Track) -> None:
+    with IGCWriter(io.BytesIO()) as writer:
+        i_record = IRecord.from_string(track.i_record) if track.i_record is not None else None
+        writer.write_fixes(track.fixes, track.extensions, i_record)
+
+
+def run(case: Case, repeat: int = REPEAT, memory: bool = True) -> Result:
+    """
+    Запускает тест repeat раз для измерения времени, затем (если memory) еще раз под tracemalloc для измерения
+    пиковой памяти. Время берется по самому быстрому запуску, как в timeit: остальные чаще всего замедлены
+    посторонней нагрузкой. Задержка на операцию - интервал между соседними элементами результата, деленный на
+    количество операций в элементе; перцентили считаются по всем запускам.
+    """
+    seconds = float('inf')
+    latencies = []
+    for _ in range(repeat):
+        gc.collect()
+        timestamps = [time.perf_counter()]
+        for _ in case.run():
+            timestamps.append(time.perf_counter())
+        seconds = min(seconds, timestamps[-1] - timestamps[0])
+        latencies.append(np.diff(timestamps) / (case.ops / max(len(timestamps) - 1, 1)) * 1e6)
+    latency = np.concatenate(latencies)
+
+    peak_memory = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            for _ in case.run():
+                pass
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return Result(
+        name=case.name,
+        ops=case.ops,
+        seconds=seconds,
+        ops_per_second=case.ops / seconds,
+        latency={'p{0}'.format(p): float(np.percentile(latency, p)) for p in PERCENTILES},
+        peak_memory=peak_memory,
+    )
+
+
+def compare(results: Iterable[Result], baseline: Dict[str, dict], threshold: float = THRESHOLD) -> List[str]:
+    """
+    :param results: Текущие результаты.
+    :param baseline: Сохраненные результаты (см. save).
+    :param threshold: Допустимое ухудшение в процентах.
+    :return: Описания регрессий: скорость упала или пиковая память выросла больше чем на threshold процентов.
+    """
+    regressions = []
+    for result in results:
+        expected = baseline.get(result.name)
+        if expected is None:
+            continue
+        change = (result.ops_per_second / expected['ops_per_second'] - 1) * 100
+        if change < -threshold:
+            regressions.append('{0}: скорость {1:+.1f}%'.format(result.name, change))
+        if result.peak_memory is not None and expected.get('peak_memory'):
+            change = (result.peak_memory / expected['peak_memory'] - 1) * 100
+            if change > threshold:
+                regressions.append('{0}: пиковая память {1:+.1f}%'.format(result.name, change))
+    return regressions
+
+
+def save(results: Iterable[Result], path: str) -> None:
+    with open(path, 'w') as file:
+        json.dump({result.name: result._asdict() for result in results}, file, indent=2, ensure_ascii=False)
+
+
+def load(path: str) -> Dict[str, dict]:
+    with open(path) as file:
+        return json.load(file)
+
+
+def report(result: Result, stream: IO = sys.stdout) -> None:
+    print(
+        '{0:<28} {1:>14,.0f} ops/s  {2}  {3}'.format(
+            result.name,
+            result.ops_per_second,
+            '  '.join('{0} {1:>9.2f} us'.format(name, value) for name, value in result.latency.items()),
+            '{0:>10.1f} MiB'.format(result.peak_memory / 2 ** 20) if result.peak_memory is not None else '',
+        ),
+        file=stream,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='количества точек в треках')
+    parser.add_argument('--filter', default='', help='запускать только тесты, в имени которых есть подстрока')
+    parser.add_argument('--repeat', type=int, default=REPEAT, help='количество запусков каждого теста')
+    parser.add_argument('--no-memory', action='store_true', help='не измерять пиковую память')
+    parser.add_argument('--save', help='сохранить результаты в JSON')
+    parser.add_argument('--compare', help='сравнить с результатами из JSON')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help='допустимое ухудшение, %%')
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for case in cases(args.sizes, directory):
+            if args.filter not in case.name:
+                continue
+            result = run(case, repeat=args.repeat, memory=not args.no_memory)
+            report(result)
+            results.append(result)
+
+    if args.save:
+        save(results, args.save)
+    if args.compare:
+        regressions = compare(results, load(args.compare), args.threshold)
+        for regression in regressions:
+            print('РЕГРЕССИЯ {0}'.format(regression))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,55 @@
+import math
+import random
+from typing import List
+
+
+HEADER: List[str] = [
+    'AXCSAAA',
+    'HFDTE160701',
+    'HFPLTPILOTINCHARGE:Synthetic Pilot',
+    'HFGTYGLIDERTYPE:Benchmark',
+]
+
+
+def b_record(seconds: int, latitude: float, longitude: float, validity: str, pressure: int, gnss: int) -> str:
+    seconds %= 24 * 3600
+    lat_minutes = round(abs(latitude) * 60 * 1000)
+    lon_minutes = round(abs(longitude) * 60 * 1000)
+    return 'B{0:02d}{1:02d}{2:02d}{3:02d}{4:05d}{5}{6:03d}{7:05d}{8}{9}{10:05d}{11:05d}'.format(
+        seconds // 3600, seconds // 60 % 60, seconds % 60,
+        lat_minutes // 60000, lat_minutes % 60000, 'S' if latitude < 0 else 'N',
+        lon_minutes // 60000, lon_minutes % 60000, 'W' if longitude < 0 else 'E',
+        validity, pressure, gnss,
+    )
+
+
+def synthetic_b_records(n_fixes: int, seed: int = 0) -> List[str]:
+    """
+    Генерирует правдоподобный трек: 1 Гц, скорость 20-40 м/с, плавно меняющийся курс и высота, редкие потери GPS.
+    :param n_fixes: Количество B-записей.
+    :param seed:
+    :return: Строки B-записей.
+    """
+    rng = random.Random(seed)
+    latitude, longitude, heading, altitude = 54.1, -2.8, 0., 1000.
+    lines: List[str] = []
+    for i in range(n_fixes):
+        heading += rng.gauss(0, 0.05)
+        speed = 20 + 20 * rng.random()
+        latitude = min(max(latitude + speed * math.cos(heading) / 111_000, -89.), 89.)
+        longitude += speed * math.sin(heading) / (111_000 * math.cos(math.radians(latitude)))
+        longitude = (longitude + 180) % 360 - 180
+        altitude = min(max(altitude + rng.gauss(0, 1.5), 0.), 9000.)
+        validity = 'V' if rng.random() < 0.01 else 'A'
+        lines.append(b_record(43200 + i, latitude, longitude, validity, round(altitude), round(altitude) + 40))
+    return lines
+
+
+def synthetic_flight(n_fixes: int, seed: int = 0) -> bytes:
+    """
+    :param n_fixes: Количество B-записей.
+    :param seed:
+    :return: Полный IGC-файл.
+    """
+    lines = HEADER + synthetic_b_records(n_fixes, seed) + ['GABCDEF0123456789']
+    return ('\r\n'.join(lines) + '\r\n').encode()
@@ -0,0 +1,50 @@
+"""
+Сравнение разбора HHMMSS: прежний TimeUTC.from_string через datetime.strptime и арифметический разбор.
+
+    python -m benchmarks.time_utc --fixes 100000
+"""
+import argparse
+import datetime
+import time
+from typing import Callable, List
+
+from benchmarks.synthetic import synthetic_b_records
+from igcrepair.reader.fields import TimeUTC
+
+
+def strptime_from_string(string: str) -> TimeUTC:
+    """
+    Реализация TimeUTC.from_string до перехода на арифметический разбор.
+    """
+    return TimeUTC(datetime.datetime.strptime(string, TimeUTC.TIME_FORMAT).time())
+
+
+def timed(function: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--fixes', type=int, default=100_000)
+    args = parser.parse_args()
+
+    strings: List[str] = [line[1:7] for line in synthetic_b_records(args.fixes)]
+    buffer = ''.join(strings).encode()
+
+    results = {
+        'strptime TimeUTC': timed(lambda: [strptime_from_string(string) for string in strings]),
+        'TimeUTC.from_string': timed(lambda: [TimeUTC.from_string(string) for string in strings]),
+        'TimeUTC.seconds_from_string': timed(lambda: [TimeUTC.seconds_from_string(string) for string in strings]),
+        'TimeUTC.seconds_from_strings': timed(lambda: TimeUTC.seconds_from_strings(strings)),
+        'TimeUTC.seconds_from_bytes': timed(lambda: TimeUTC.seconds_from_bytes(buffer)),
+    }
+
+    baseline = results['strptime TimeUTC']
+    for name, seconds in results.items():
+        print('{0:<30} {1:>12,.0f} ops/s {2:>8.1f}x'.format(name, args.fixes / seconds, baseline / seconds))
+
+
+if __name__ == '__main__':
+    main()
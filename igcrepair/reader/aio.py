@@ -0,0 +1,178 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import AsyncIterator, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from igcrepair.reader.batch import Fixes, decode_lines, split_lines
+from igcrepair.reader.layout import compile_layout
+from igcrepair.reader.records import Record, IRecord, JRecord, BRecord
+from igcrepair.reader.stream import IGCReader
+from igcrepair.reader.utils import RecordError, RecordFieldError
+
+
+# Сколько байтов читается из потока за один раз.
+READ_SIZE: int = 1 << 16
+# Сколько B-записей декодируется в исполнителе за один раз.
+BATCH_SIZE: int = 4096
+
+
+class FixBatch(NamedTuple):
+    """
+    Векторно декодированные B-записи, идущие в файле подряд.
+    """
+
+    fixes: Fixes
+    extensions: Dict[str, np.ndarray]  # необработанные значения дополнений, см. BRecordLayout.decode_lines
+    first_line: int  # номер строки первой B-записи
+
+
+def decode_batch(buffer: bytes, i_record: Optional[str] = None) -> Tuple[Fixes, Dict[str, np.ndarray]]:
+    """
+    Функция для исполнителя (в том числе пула процессов): аргументы и результат легко сериализуются.
+    :param buffer: Строки B-записей, разделенные LF.
+    :param i_record: Строка I-записи, по которой разбираются дополнения.
+    :return: Колонки основной части и значения дополнений.
+    """
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    starts, lengths = split_lines(data)
+    if i_record is None:
+        return decode_lines(data, starts, lengths), {}
+    return compile_layout(i_record).decode_lines(data, starts, lengths)
+
+
+class AsyncIGCReader:
+    """
+    Чтение IGC-файла из asyncio.StreamReader, например из загрузки по сокету. Поток читается блоками только тогда, когда
+    потребитель запрашивает следующие записи, поэтому при медленном потребителе буфер StreamReader заполняется и
+    транспорт приостанавливает чтение из сокета.
+    """
+
+    def __init__(
+        self,
+        stream: asyncio.StreamReader,
+        record_types: Optional[Iterable[str]] = None,
+        encoding: str = 'utf-8',
+        executor: Optional[Executor] = None,
+        batch_size: int = BATCH_SIZE,
+    ) -> None:
+        """
+        :param stream: Поток с содержимым IGC-файла.
+        :param record_types: Типы записей, которые нужно разбирать (см. IGCReader).
+        :param encoding: Кодировка потока.
+        :param executor: Исполнитель для векторного декодирования B-записей в batches. По умолчанию используется
+                         исполнитель цикла событий.
+        :param batch_size: Максимальное количество B-записей в одном FixBatch.
+        """
+        self.stream: asyncio.StreamReader = stream
+        self.parser: IGCReader = IGCReader((), record_types=record_types, encoding=encoding)
+        self.executor: Optional[Executor] = executor
+        self.batch_size: int = batch_size
+
+    @property
+    def i_record(self) -> Optional[IRecord]:
+        return self.parser.i_record
+
+    @property
+    def j_record(self) -> Optional[JRecord]:
+        return self.parser.j_record
+
+    async def lines(self) -> AsyncIterator[Tuple[int, bytes]]:
+        """
+        :return: Номера строк и строки без символов конца строки.
+        """
+        tail = b''
+        line_number = 0
+        while True:
+            chunk = await self.stream.read(READ_SIZE)
+            if not chunk:
+                break
+            lines = (tail + chunk).split(b'\n')
+            tail = lines.pop()
+            for line in lines:
+                line_number += 1
+                yield line_number, line.rstrip(b'\r')
+            # Если данные уже лежат в буфере, read не отдает управление циклу событий. Уступаем его явно, чтобы
+            # одна большая загрузка не задерживала остальные.
+            await asyncio.sleep(0)
+        if tail:
+            yield line_number + 1, tail.rstrip(b'\r')
+
+    def _parse(self, line: bytes, line_number: int) -> Optional[Record]:
+        line = line.decode(self.parser.encoding, errors='replace').rstrip('\r\n')
+        if not line:
+            return None
+        return self.parser.parse_numbered_line(line, line_number)
+
+    async def __aiter__(self) -> AsyncIterator[Record]:
+        """
+        Разбирает записи по мере поступления строк, так же как IGCReader.
+        """
+        self.parser.i_record = None
+        self.parser.j_record = None
+        async for line_number, line in self.lines():
+            record = self._parse(line, line_number)
+            if record is not None:
+                yield record
+
+    def _submit(self, buffer: bytearray, first_line: int) -> asyncio.Task:
+        # I-запись фиксируется в момент отправки: следующие строки могут ее заменить.
+        i_record = str(self.parser.i_record) if self.parser.i_record is not None else None
+        return asyncio.ensure_future(self._decode(bytes(buffer), i_record, first_line))
+
+    async def _decode(self, buffer: bytes, i_record: Optional[str], first_line: int) -> FixBatch:
+        loop = asyncio.get_running_loop()
+        try:
+            fixes, extensions = await loop.run_in_executor(self.executor, decode_batch, buffer, i_record)
+        except (RecordError, RecordFieldError) as error:
+            raise type(error)('B-записи, начиная со строки {0}: {1}'.format(first_line, error)) from error
+        return FixBatch(fixes, extensions, first_line)
+
+    async def batches(self) -> AsyncIterator[Union[Record, FixBatch]]:
+        """
+        Разбирает поток, отдавая подряд идущие B-записи пачками FixBatch, декодированными в исполнителе. Остальные
+        записи разбираются сразу и отдаются по одной. Порядок записей сохраняется. Пока пачка декодируется, читается
+        следующая; набранная пачка отправляется в исполнитель до ожидания предыдущей, поэтому в исполнителе
+        одновременно находятся не больше двух пачек.
+        """
+        self.parser.i_record = None
+        self.parser.j_record = None
+        read_b = self.parser.record_types is None or BRecord.RECORD_TYPE.value in self.parser.record_types
+
+        pending: List[asyncio.Task] = []
+        buffer = bytearray()
+        count = first_line = 0
+        try:
+            async for line_number, line in self.lines():
+                if read_b and line[:1] in (b'B', b'b'):
+                    if not count:
+                        first_line = line_number
+                    buffer += line
+                    buffer += b'\n'
+                    count += 1
+                    if count < self.batch_size:
+                        continue
+                    pending.append(self._submit(buffer, first_line))
+                    buffer, count = bytearray(), 0
+                    if len(pending) > 1:
+                        yield await pending.pop(0)
+                    continue
+
+                if not line.strip():
+                    continue
+                if count:
+                    pending.append(self._submit(buffer, first_line))
+                    buffer, count = bytearray(), 0
+                while pending:
+                    yield await pending.pop(0)
+                record = self._parse(line, line_number)
+                if record is not None:
+                    yield record
+
+            if count:
+                pending.append(self._submit(buffer, first_line))
+            while pending:
+                yield await pending.pop(0)
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,209 @@
+from typing import Dict, NamedTuple, Optional, Tuple, Type, Union
+
+import numpy as np
+
+from igcrepair.reader.constants import (
+    B_RECORD_LENGTH,
+    B_RECORD_TIME,
+    B_RECORD_LATITUDE,
+    B_RECORD_LONGITUDE,
+    B_RECORD_VALIDITY,
+    B_RECORD_PRESSURE_ALTITUDE,
+    B_RECORD_GNSS_ALTITUDE,
+)
+from igcrepair.reader.fields import (
+    RecordField,
+    RecordLiteral,
+    TimeUTC,
+    Latitude,
+    Longitude,
+    Validity,
+    PressureAltitude,
+    GNSSAltitude,
+)
+from igcrepair.reader.utils import RecordError, RecordFieldError
+
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+_LF: int = ord('\n')
+_CR: int = ord('\r')
+_ZERO: int = ord('0')
+_MINUS: int = ord('-')
+# Установка 6-го бита переводит латинскую букву в нижний регистр, что позволяет сравнивать без учета регистра.
+_LOWER: int = 0x20
+
+
+class Fixes(NamedTuple):
+    """
+    Колонки декодированных B-записей. Элемент с индексом i каждой колонки относится к i-й строке буфера.
+    """
+
+    time: np.ndarray  # int32, секунды с начала суток UTC
+    latitude: np.ndarray  # float64, десятичные градусы
+    longitude: np.ndarray  # float64, десятичные градусы
+    validity: np.ndarray  # bool, True для "A"
+    pressure_altitude: np.ndarray  # int32
+    gnss_altitude: np.ndarray  # int32
+
+    @classmethod
+    def empty(cls) -> 'Fixes':
+        return cls(
+            time=np.empty(0, dtype=np.int32),
+            latitude=np.empty(0, dtype=np.float64),
+            longitude=np.empty(0, dtype=np.float64),
+            validity=np.empty(0, dtype=np.bool_),
+            pressure_altitude=np.empty(0, dtype=np.int32),
+            gnss_altitude=np.empty(0, dtype=np.int32),
+        )
+
+
+def split_lines(data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Находит начала и длины непустых строк буфера. Окончания строк LF и CRLF в длину не входят.
+    :param data: Буфер в виде массива uint8.
+    :return: Смещения начала строк и их длины.
+    """
+    if data.size == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    newlines = np.flatnonzero(data == _LF)
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [data.size]))
+
+    has_cr = ends > starts
+    has_cr[has_cr] = data[ends[has_cr] - 1] == _CR
+    ends -= has_cr
+
+    non_empty = ends > starts
+    return starts[non_empty], (ends - starts)[non_empty]
+
+
+def _to_int(columns: np.ndarray) -> np.ndarray:
+    """
+    Переводит колонки ASCII-цифр в целые числа.
+    :param columns: Матрица uint8 размера (n, k).
+    :return: Массив int64 длины n.
+    """
+    value = np.zeros(columns.shape[0], dtype=np.int64)
+    for i in range(columns.shape[1]):
+        value = value * 10 + (columns[:, i].astype(np.int64) - _ZERO)
+    return value
+
+
+def decode_b_records(buffer: Buffer) -> Fixes:
+    """
+    Декодирует все B-записи буфера за один векторизованный проход по фиксированным позициям полей. Значения совпадают
+    со значениями TimeUTC, Latitude, Longitude, Validity, PressureAltitude и GNSSAltitude, полученными через
+    from_string.
+    :param buffer: Строки B-записей, разделенные LF или CRLF.
+    :return: Колонки декодированных записей.
+    """
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    starts, lengths = split_lines(data)
+    return decode_lines(data, starts, lengths)
+
+
+def decode_lines(data: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> Fixes:
+    """
+    Декодирует B-записи, расположенные в буфере по заданным смещениям. Позволяет декодировать B-записи, чередующиеся
+    с записями других типов, без копирования строк.
+    :param data: Буфер в виде массива uint8.
+    :param starts: Смещения начала B-записей.
+    :param lengths: Длины B-записей без символов конца строки.
+    :return: Колонки декодированных записей.
+    """
+    if starts.size == 0:
+        return Fixes.empty()
+
+    return decode_rows(gather_rows(data, starts, lengths, B_RECORD_LENGTH))
+
+
+def gather_rows(data: np.ndarray, starts: np.ndarray, lengths: np.ndarray, width: int) -> np.ndarray:
+    """
+    Собирает первые width байтов каждой строки в матрицу.
+    :param data: Буфер в виде массива uint8.
+    :param starts: Смещения начала строк.
+    :param lengths: Длины строк без символов конца строки.
+    :param width: Количество байтов, которое должно быть в каждой строке.
+    :return: Матрица uint8 размера (n, width).
+    """
+    short = np.flatnonzero(lengths < width)
+    if short.size:
+        error = RecordError('Длина B-записи номер {0} меньше {1}.'.format(short[0] + 1, width))
+        error.row = int(short[0])
+        raise error
+    return data[starts[:, None] + np.arange(width)]
+
+
+def decode_rows(
+    rows: np.ndarray,
+    latitude_digits: Optional[slice] = None,
+    longitude_digits: Optional[slice] = None,
+) -> Fixes:
+    """
+    :param rows: Матрица uint8, строки которой начинаются с основной части B-записи.
+    :param latitude_digits: Положение дополнения LAD в строке, если его цифры нужно добавить к широте.
+    :param longitude_digits: Положение дополнения LOD.
+    :return: Колонки декодированных записей.
+    """
+    fixes, masks = decode_rows_with_masks(rows, latitude_digits, longitude_digits)
+    invalid = np.flatnonzero(~np.logical_and.reduce(list(masks.values())))
+    if invalid.size:
+        error = RecordFieldError('Неправильный формат B-записи номер {0}.'.format(invalid[0] + 1))
+        error.row = int(invalid[0])
+        raise error
+    return fixes
+
+
+def decode_rows_with_masks(
+    rows: np.ndarray,
+    latitude_digits: Optional[slice] = None,
+    longitude_digits: Optional[slice] = None,
+) -> Tuple[Fixes, Dict[Type[RecordField], np.ndarray]]:
+    """
+    Декодирует строки без проверки результата. Значения в некорректных строках не определены.
+    :param rows: Матрица uint8, строки которой начинаются с основной части B-записи.
+    :param latitude_digits: Положение дополнения LAD в строке (см. decode_rows).
+    :param longitude_digits: Положение дополнения LOD.
+    :return: Колонки декодированных записей и маски корректных значений для каждого поля.
+    """
+    if rows.shape[0] == 0:
+        return Fixes.empty(), {}
+
+    time, time_valid = TimeUTC.seconds_array(rows[:, B_RECORD_TIME])
+
+    latitude, latitude_valid = Latitude.dd_array(
+        rows[:, B_RECORD_LATITUDE], rows[:, latitude_digits] if latitude_digits is not None else None
+    )
+    longitude, longitude_valid = Longitude.dd_array(
+        rows[:, B_RECORD_LONGITUDE], rows[:, longitude_digits] if longitude_digits is not None else None
+    )
+
+    validity = rows[:, B_RECORD_VALIDITY.start] | _LOWER
+
+    pressure_altitude = rows[:, B_RECORD_PRESSURE_ALTITUDE]
+    pressure_sign = pressure_altitude[:, 0]
+    gnss_altitude = rows[:, B_RECORD_GNSS_ALTITUDE]
+
+    masks = {
+        RecordLiteral: (rows[:, 0] | _LOWER) == ord('b'),
+        TimeUTC: time_valid,
+        Latitude: latitude_valid,
+        Longitude: longitude_valid,
+        Validity: Validity.STRING_CLASSES.match_array(rows[:, B_RECORD_VALIDITY]),
+        PressureAltitude: PressureAltitude.STRING_CLASSES.match_array(pressure_altitude),
+        GNSSAltitude: GNSSAltitude.STRING_CLASSES.match_array(gnss_altitude),
+    }
+
+    fixes = Fixes(
+        time=time.astype(np.int32),
+        latitude=latitude,
+        longitude=longitude,
+        validity=validity == ord('a'),
+        pressure_altitude=np.where(
+            pressure_sign == _MINUS, -_to_int(pressure_altitude[:, 1:]), _to_int(pressure_altitude[:, 1:])
+        ).astype(np.int32),
+        gnss_altitude=_to_int(gnss_altitude).astype(np.int32),
+    )
+    return fixes, masks
@@ -0,0 +1,198 @@
+import functools
+import hashlib
+import inspect
+import mmap
+import os
+import re
+import shutil
+import tempfile
+from typing import List, Tuple, Union
+
+from igcrepair.reader import (
+    batch,
+    classifier,
+    constants,
+    extensions_columns,
+    extensions_fields,
+    fields,
+    layout,
+    mapped,
+    records,
+    utils,
+)
+from igcrepair.reader.mapped import MappedIGCFile
+from igcrepair.writer import columnar
+from igcrepair.writer.columnar import Track, read_track, write_track
+
+
+Path = Union[str, os.PathLike]
+
+# Увеличивается при изменении формата записей кэша, которое не видно по исходному коду декодеров.
+FORMAT_VERSION: int = 1
+# Размер кэша по умолчанию, байты.
+MAX_SIZE: int = 1 << 30
+ENTRY_SUFFIX: str = '.npz'
+# Префикс недописанных записей: такие файлы не учитываются и не удаляются другими процессами. Суффикс у них тот же,
+# что и у записей, так как по нему write_track выбирает формат.
+TEMPORARY_PREFIX: str = '.tmp-'
+# Каталоги версий называются VERSION_PREFIX + cache_version(). Кэш удаляет только такие каталоги, поэтому его можно
+# разместить в общем каталоге.
+VERSION_PREFIX: str = 'igcrepair-'
+VERSION_DIRECTORY_PATTERN: re.Pattern = re.compile(re.escape(VERSION_PREFIX) + r'[0-9a-f]{16}')
+# Модули, от которых зависит результат разбора и формат записей кэша.
+DECODE_MODULES = (
+    constants, utils, classifier, fields, extensions_fields, extensions_columns, records, batch, layout, mapped,
+    columnar,
+)
+
+
+@functools.lru_cache(maxsize=None)
+def cache_version() -> str:
+    """
+    Версия кэша: хэш исходного кода всех модулей, через которые проходит разбор (DECODE_MODULES). Любое их изменение,
+    в том числе констант положений полей и таблиц проверки формата, делает старые записи кэша недействительными.
+    :return:
+    """
+    digest = hashlib.blake2b(str(FORMAT_VERSION).encode(), digest_size=8)
+    for module in DECODE_MODULES:
+        digest.update(inspect.getsource(module).encode())
+    return digest.hexdigest()
+
+
+def file_hash(path: Path) -> str:
+    """
+    :param path: Путь к файлу. Файл читается через mmap.
+    :return: blake2b содержимого файла.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                digest.update(buffer)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """
+    Дисковый кэш разобранных IGC-файлов. Ключ - хэш содержимого файла, значение - колонки B-записей, дополнения и
+    I-запись (см. Track) в формате npz, который читается через mmap. Записи хранятся в подкаталоге текущей версии
+    (VERSION_PREFIX + cache_version), каталоги других версий удаляются при вытеснении. Когда размер кэша превышает
+    max_size, удаляются записи, которые дольше всего не использовались. Другие файлы и каталоги в directory кэш не
+    трогает.
+    """
+
+    def __init__(self, directory: Path, max_size: int = MAX_SIZE) -> None:
+        """
+        :param directory: Каталог кэша. Создается при необходимости.
+        :param max_size: Максимальный размер кэша, байты.
+        """
+        self.directory: str = os.fspath(directory)
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @property
+    def version_directory(self) -> str:
+        return os.path.join(self.directory, VERSION_PREFIX + cache_version())
+
+    def entry(self, key: str) -> str:
+        """
+        :param key: Хэш содержимого файла.
+        :return: Путь к записи кэша.
+        """
+        return os.path.join(self.version_directory, key + ENTRY_SUFFIX)
+
+    def load(self, path: Path) -> Track:
+        """
+        Возвращает разобранный файл из кэша, а при промахе разбирает его и сохраняет результат.
+        :param path: Путь к IGC-файлу.
+        :return:
+        """
+        entry = self.entry(file_hash(path))
+        if os.path.exists(entry):
+            self.hits += 1
+            # Время изменения служит временем последнего использования при вытеснении.
+            os.utime(entry)
+            return read_track(entry)
+
+        self.misses += 1
+        with MappedIGCFile(path) as file:
+            fixes, extensions = file.columns()
+            i_record = file.i_record
+        track = Track(fixes, extensions, str(i_record) if i_record is not None else None)
+        self._store(entry, track)
+        self.evict()
+        return track
+
+    def _store(self, entry: str, track: Track) -> None:
+        # Запись во временный файл и переименование: другой процесс не увидит недописанную запись.
+        directory = os.path.dirname(entry)
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(prefix=TEMPORARY_PREFIX, suffix=ENTRY_SUFFIX, dir=directory)
+        os.close(descriptor)
+        try:
+            write_track(temporary, track)
+            os.replace(temporary, entry)
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """
+        :return: Время последнего использования, размер и путь каждой записи текущей версии.
+        """
+        entries = []
+        if not os.path.isdir(self.version_directory):
+            return entries
+        for entry in os.scandir(self.version_directory):
+            if (
+                entry.is_file()
+                and entry.name.endswith(ENTRY_SUFFIX)
+                and not entry.name.startswith(TEMPORARY_PREFIX)
+            ):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    @property
+    def size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _version_directories(self) -> List[str]:
+        """
+        :return: Пути к каталогам всех версий кэша в directory.
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        return [
+            entry.path for entry in os.scandir(self.directory)
+            if entry.is_dir(follow_symlinks=False) and VERSION_DIRECTORY_PATTERN.fullmatch(entry.name)
+        ]
+
+    def evict(self) -> None:
+        """
+        Удаляет каталоги других версий кэша, затем самые давно использованные записи, пока размер кэша больше
+        max_size.
+        """
+        for path in self._version_directories():
+            if path != self.version_directory:
+                shutil.rmtree(path, ignore_errors=True)
+
+        entries = sorted(self._entries())
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, path in entries:
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+
+    def clear(self) -> None:
+        """
+        Удаляет каталоги всех версий кэша. Сам directory и посторонние файлы в нем остаются.
+        """
+        for path in self._version_directories():
+            shutil.rmtree(path, ignore_errors=True)
+        self.hits = self.misses = 0
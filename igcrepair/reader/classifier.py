@@ -0,0 +1,158 @@
+"""
+Табличная проверка формата полей. Выражение STRING_PATTERN поля (последовательность классов символов фиксированной
+длины, например [0-9]{7}[NS]{1}, или один повторяющийся класс, например [^\r\n]*) один раз переводится в таблицы из 256
+элементов: для каждого байта - допустим ли он в позиции. Векторная проверка сводится к выборке из таблицы по матрице
+байтов. Отдельные значения поля проверяют через STRING_PATTERN.fullmatch: на коротких полях скомпилированное выражение
+быстрее любой проверки на Python.
+
+Таблицы описывают только байты, поэтому символы вне ASCII допускаются лишь классами с отрицанием ([^...]) и только в
+повторяющейся части.
+"""
+import functools
+import re
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+
+_ESCAPES = {'r': '\r', 'n': '\n', 't': '\t'}
+_DIGITS = frozenset(b'0123456789')
+_QUANTIFIER: re.Pattern = re.compile(r'\{([0-9]+)\}|\*')
+
+
+def _unsupported(pattern: re.Pattern) -> ValueError:
+    return ValueError('Выражение {0} нельзя перевести в таблицу классов символов.'.format(pattern.pattern))
+
+
+def _members(pattern: re.Pattern, members: set, negative: bool = False) -> frozenset:
+    if pattern.flags & re.IGNORECASE:
+        letters = [chr(byte) for byte in members if chr(byte).isascii() and chr(byte).isalpha()]
+        members = members | {ord(letter.lower()) for letter in letters} | {ord(letter.upper()) for letter in letters}
+    if negative:
+        members = set(range(256)) - members
+    return frozenset(members)
+
+
+def _parse_char(pattern: re.Pattern, position: int) -> Tuple[set, int]:
+    """
+    :return: Байты одиночного символа или \\d и положение после него.
+    """
+    text = pattern.pattern
+    char = text[position]
+    if char == '\\':
+        position += 1
+        if position >= len(text):
+            raise _unsupported(pattern)
+        if text[position] == 'd':
+            return set(_DIGITS), position + 1
+        if text[position].isalnum() and text[position] not in _ESCAPES:
+            raise _unsupported(pattern)
+        char = _ESCAPES.get(text[position], text[position])
+    if ord(char) > 0x7F:
+        raise _unsupported(pattern)
+    return {ord(char)}, position + 1
+
+
+def _parse_class(pattern: re.Pattern, position: int) -> Tuple[frozenset, int]:
+    """
+    :param pattern:
+    :param position: Положение символа после "[".
+    :return: Байты класса и положение после "]".
+    """
+    text = pattern.pattern
+    negative = text.startswith('^', position)
+    position += negative
+    first = position
+    members = set()
+    while True:
+        if position >= len(text):
+            raise _unsupported(pattern)
+        if text[position] == ']' and position > first:
+            return _members(pattern, members, negative), position + 1
+        chars, position = _parse_char(pattern, position)
+        if text.startswith('-', position) and text[position + 1:position + 2] not in (']', ''):
+            last, position = _parse_char(pattern, position + 1)
+            if len(chars) != 1 or len(last) != 1:
+                raise _unsupported(pattern)
+            chars = set(range(min(chars), min(last) + 1))
+        members |= chars
+
+
+class FieldClassifier:
+    """
+    Векторная проверка значений поля по таблицам классов символов. Экземпляры следует получать через compile_classifier.
+    """
+
+    __slots__ = ('pattern', 'classes', 'repeat', 'width', 'lookup')
+
+    def __init__(self, pattern: re.Pattern) -> None:
+        """
+        :param pattern: Выражение из классов символов ([...], \\d или одиночных символов) с количеством {n} или без
+                        него. Последний класс может повторяться (*).
+        """
+        classes: List[frozenset] = []
+        repeat: Optional[frozenset] = None
+        text = pattern.pattern
+        position = 0
+        while position < len(text):
+            if repeat is not None:
+                raise _unsupported(pattern)
+            if text[position] == '[':
+                members, position = _parse_class(pattern, position + 1)
+            elif text[position] in '(){}*+?|.^$':
+                raise _unsupported(pattern)
+            else:
+                chars, position = _parse_char(pattern, position)
+                members = _members(pattern, chars)
+            quantifier = _QUANTIFIER.match(text, position)
+            if quantifier is None:
+                classes.append(members)
+            elif quantifier.group() == '*':
+                repeat = members
+            else:
+                classes.extend([members] * int(quantifier.group(1)))
+            position = quantifier.end() if quantifier is not None else position
+
+        self.pattern: re.Pattern = pattern
+        self.classes: Tuple[frozenset, ...] = tuple(classes)
+        self.repeat: Optional[frozenset] = repeat
+        self.width: int = len(classes)
+        # Матрица bool (width, 256): допустим ли байт в позиции. Для векторной проверки.
+        self.lookup: np.ndarray = np.zeros((self.width, 256), dtype=bool)
+        for i, members in enumerate(classes):
+            self.lookup[i, list(members)] = True
+
+    def __repr__(self) -> str:
+        return '{0}({1!r})'.format(self.__class__.__name__, self.pattern.pattern)
+
+    def match_array(self, columns: np.ndarray) -> np.ndarray:
+        """
+        То же, что re.fullmatch(pattern, value) is not None для каждого значения, для выражений из классов символов.
+        :param columns: Матрица uint8 (n, ширина) с байтами значений, например срез строк файла (см. gather_rows), или
+                        массив bytes фиксированной длины. Ширина должна совпадать с width, если нет повторяющегося
+                        класса; повторяющимся классом проверяются все байты после width.
+        :return: Маска значений, соответствующих выражению.
+        """
+        columns = np.asarray(columns)
+        if columns.dtype.kind == 'S':
+            columns = np.ascontiguousarray(columns).view(np.uint8).reshape(len(columns), columns.dtype.itemsize)
+        n_rows, width = columns.shape
+        if width != self.width and (self.repeat is None or width < self.width):
+            return np.zeros(n_rows, dtype=bool)
+        valid = np.ones(n_rows, dtype=bool)
+        for i in range(self.width):
+            valid &= self.lookup[i][columns[:, i]]
+        if self.repeat is not None and width > self.width:
+            allowed = np.zeros(256, dtype=bool)
+            allowed[list(self.repeat)] = True
+            valid &= allowed[columns[:, self.width:]].all(axis=1)
+        return valid
+
+
+@functools.lru_cache(maxsize=None)
+def compile_classifier(pattern: Union[str, re.Pattern]) -> FieldClassifier:
+    """
+    :param pattern: Выражение STRING_PATTERN поля.
+    :return: Таблицы классов символов, общие для всех полей с одинаковым выражением.
+    """
+    return FieldClassifier(re.compile(pattern) if isinstance(pattern, str) else pattern)
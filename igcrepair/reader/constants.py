@@ -20,6 +20,38 @@ EXTENSION_SUBTYPES: Set[str] = {
     # must not be used to change the pressure altitude recorded with each fix, which must remain with respect to the
     # ISA sea level datum of 1013.25 mb at all times
     'ATS',
+    # Engine noise level, 000 to 999
+    'ENL',
+    # Fix accuracy: estimated position error in metres, 000 to 999
+    'FXA',
+    # Ground speed in km/h and heading, true and magnetic
+    'GSP',
+    'HDT',
+    'HDM',
+    # Indicated and true airspeed in km/h
+    'IAS',
+    'TAS',
+    # Means of propulsion, forward of the pilot
+    'MOP',
+    # Outside air temperature in degrees Celsius
+    'OAT',
+    # Engine revolutions per minute
+    'RPM',
+    # Satellites in use
+    'SIU',
+    # Decimal seconds of UTC time
+    'TDS',
+    # Track, true and magnetic
+    'TRT',
+    'TRM',
+    # Uncompensated variometer and total energy vertical speed in metres per second
+    'VAR',
+    'VAT',
+    # Vertical fix accuracy in metres
+    'VXA',
+    # Wind direction and wind speed
+    'WDI',
+    'WSP',
     # ...
     # The last places of decimal minutes of latitude, where latitude is recorded to a greater precision than the three
     # decimal minutes that are in the main body of the B record. The fourth and any further decimal places of minutes
@@ -34,3 +66,18 @@ EXTENSION_SUBTYPES: Set[str] = {
     # the I record.
     'LOD',
 }
+
+
+# Fixed byte layout of the mandatory part of a B record: B HHMMSS DDMMmmmN DDDMMmmmE V PPPPP GGGGG. Extensions declared
+# in the I record start right after it, at byte 36 (1-based).
+B_RECORD_LENGTH: int = 35
+B_RECORD_TIME: slice = slice(1, 7)
+B_RECORD_LATITUDE: slice = slice(7, 15)
+B_RECORD_LONGITUDE: slice = slice(15, 24)
+B_RECORD_VALIDITY: slice = slice(24, 25)
+B_RECORD_PRESSURE_ALTITUDE: slice = slice(25, 30)
+B_RECORD_GNSS_ALTITUDE: slice = slice(30, 35)
+
+# Extensions holding the decimal places of minutes after the third one (see EXTENSION_SUBTYPES).
+LATITUDE_DIGITS: str = 'LAD'
+LONGITUDE_DIGITS: str = 'LOD'
@@ -0,0 +1,182 @@
+"""
+Векторное декодирование значений дополнений B-записей (см. EXTENSION_SUBTYPES) в типизированные колонки. Способ
+декодирования каждого типа дополнения задается в реестре EXTENSION_TYPES: новые типы добавляются через
+register_extension_type без изменения самого декодера.
+
+Значение дополнения - десятичное число, выровненное по ширине поля: цифры, необязательные знак "-" или "+" и десятичная
+точка, пробелы игнорируются. Если точки нет, последние decimals цифр считаются дробной частью (например, ATS 10132 -
+это 1013.2 гПа).
+"""
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from igcrepair.reader.utils import RecordFieldError
+
+
+_ZERO: int = ord('0')
+_MINUS: int = ord('-')
+_PLUS: int = ord('+')
+_POINT: int = ord('.')
+_SPACE: int = ord(' ')
+
+
+class ExtensionType(NamedTuple):
+    dtype: np.dtype
+    # Количество подразумеваемых знаков после запятой, если в значении нет точки. None - все цифры дробные.
+    decimals: Optional[int] = 0
+
+
+EXTENSION_TYPES: Dict[str, ExtensionType] = {
+    # Линейные ускорения, g, с десятыми.
+    'ACX': ExtensionType(np.dtype(np.float32), 1),
+    'ACY': ExtensionType(np.dtype(np.float32), 1),
+    'ACZ': ExtensionType(np.dtype(np.float32), 1),
+    # Угловые скорости, градусы в секунду.
+    'ANX': ExtensionType(np.dtype(np.int16)),
+    'ANY': ExtensionType(np.dtype(np.int16)),
+    'ANZ': ExtensionType(np.dtype(np.int16)),
+    # Углы тангажа и крена, градусы.
+    'AOP': ExtensionType(np.dtype(np.int16)),
+    'AOR': ExtensionType(np.dtype(np.int16)),
+    # Установка высотомера, гПа с десятыми.
+    'ATS': ExtensionType(np.dtype(np.float32), 1),
+    'ENL': ExtensionType(np.dtype(np.int16)),
+    'FXA': ExtensionType(np.dtype(np.int16)),
+    'VXA': ExtensionType(np.dtype(np.int16)),
+    # Скорости, км/ч.
+    'GSP': ExtensionType(np.dtype(np.int16)),
+    'IAS': ExtensionType(np.dtype(np.int16)),
+    'TAS': ExtensionType(np.dtype(np.int16)),
+    'WSP': ExtensionType(np.dtype(np.int16)),
+    # Направления, градусы.
+    'HDT': ExtensionType(np.dtype(np.int16)),
+    'HDM': ExtensionType(np.dtype(np.int16)),
+    'TRT': ExtensionType(np.dtype(np.int16)),
+    'TRM': ExtensionType(np.dtype(np.int16)),
+    'WDI': ExtensionType(np.dtype(np.int16)),
+    'MOP': ExtensionType(np.dtype(np.int16)),
+    # Температура, градусы Цельсия.
+    'OAT': ExtensionType(np.dtype(np.float32)),
+    'RPM': ExtensionType(np.dtype(np.int32)),
+    'SIU': ExtensionType(np.dtype(np.int16)),
+    # Доли секунды времени UTC: все цифры дробные.
+    'TDS': ExtensionType(np.dtype(np.float32), None),
+    # Вертикальные скорости, м/с с десятыми.
+    'VAR': ExtensionType(np.dtype(np.float32), 1),
+    'VAT': ExtensionType(np.dtype(np.float32), 1),
+}
+
+
+def register_extension_type(subtype: str, dtype: np.dtype, decimals: Optional[int] = 0) -> None:
+    """
+    Добавляет или заменяет способ декодирования дополнения.
+    :param subtype: Трехбуквенный код дополнения.
+    :param dtype: Тип колонки: целый или с плавающей точкой.
+    :param decimals: Количество подразумеваемых знаков после запятой (см. ExtensionType). У целых типов должно быть 0.
+    :return:
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind not in 'iuf':
+        raise ValueError('Тип колонки дополнения должен быть целым или с плавающей точкой. Передано {0}.'.format(dtype))
+    if dtype.kind in 'iu' and decimals != 0:
+        raise ValueError('У целых колонок дополнений не может быть дробной части.')
+    EXTENSION_TYPES[subtype.upper()] = ExtensionType(dtype, decimals)
+
+
+def _parse_numbers(columns: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    :param columns: Матрица uint8 (n, ширина поля).
+    :return: Целое из всех цифр со знаком, количество цифр после точки, наличие точки и маска корректных значений.
+    """
+    n_rows, width = columns.shape
+    value = np.zeros(n_rows, dtype=np.int64)
+    n_digits = np.zeros(n_rows, dtype=np.int64)
+    fraction = np.zeros(n_rows, dtype=np.int64)
+    n_points = np.zeros(n_rows, dtype=np.int64)
+    n_signs = np.zeros(n_rows, dtype=np.int64)
+    negative = np.zeros(n_rows, dtype=bool)
+    # Знак допускается только перед цифрами и точкой.
+    sign_late = np.zeros(n_rows, dtype=bool)
+    valid = np.ones(n_rows, dtype=bool)
+    for i in range(width):
+        column = columns[:, i]
+        digit = column - np.uint8(_ZERO)
+        is_digit = digit <= 9
+        is_point = column == _POINT
+        is_sign = (column == _MINUS) | (column == _PLUS)
+        value = np.where(is_digit, value * 10 + digit, value)
+        fraction += is_digit & (n_points > 0)
+        n_digits += is_digit
+        sign_late |= is_sign & ((n_digits > 0) | (n_points > 0))
+        n_points += is_point
+        n_signs += is_sign
+        negative |= column == _MINUS
+        valid &= is_digit | is_point | is_sign | (column == _SPACE)
+    valid &= (n_digits > 0) & (n_points <= 1) & (n_signs <= 1) & ~sign_late
+    return np.where(negative, -value, value), fraction, n_points > 0, valid
+
+
+def decode_extension_column(subtype: str, columns: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Декодирует значения одного дополнения без проверки результата.
+    :param subtype: Трехбуквенный код дополнения, зарегистрированный в EXTENSION_TYPES.
+    :param columns: Матрица uint8 (n, ширина поля) с байтами дополнения.
+    :return: Типизированная колонка и маска корректных значений. Значения в некорректных строках не определены.
+    """
+    extension_type = EXTENSION_TYPES[subtype.upper()]
+    value, fraction, has_point, valid = _parse_numbers(columns)
+    dtype = extension_type.dtype
+    if dtype.kind in 'iu':
+        bounds = np.iinfo(dtype)
+        valid &= ~has_point & (value >= bounds.min) & (value <= bounds.max)
+        return np.where(valid, value, 0).astype(dtype), valid
+    decimals = extension_type.decimals if extension_type.decimals is not None else columns.shape[1]
+    fraction = np.where(has_point, fraction, decimals)
+    return (value / 10. ** fraction).astype(dtype), valid
+
+
+def decode_extension_columns(
+    rows: np.ndarray,
+    subtypes: Tuple[str, ...],
+    slices: Tuple[slice, ...],
+) -> Dict[str, np.ndarray]:
+    """
+    Декодирует все зарегистрированные дополнения из матрицы строк B-записей (см. BRecordLayout.decode_lines).
+    Значения незарегистрированных дополнений возвращаются как есть - массивами bytes фиксированной длины.
+    :param rows: Матрица uint8 строк B-записей.
+    :param subtypes: Коды дополнений в порядке slices.
+    :param slices: Положения дополнений в строке.
+    :return: Код дополнения -> колонка.
+    """
+    extensions = {}
+    for subtype, field in zip(subtypes, slices):
+        columns = rows[:, field]
+        if subtype.upper() not in EXTENSION_TYPES:
+            extensions[subtype] = np.ascontiguousarray(columns).view('S{0}'.format(field.stop - field.start)).ravel()
+            continue
+        extensions[subtype], valid = decode_extension_column(subtype, columns)
+        invalid = np.flatnonzero(~valid)
+        if invalid.size:
+            error = RecordFieldError(
+                'Неправильное значение дополнения {0} в B-записи номер {1}: "{2}".'.format(
+                    subtype, invalid[0] + 1, columns[invalid[0]].tobytes().decode('ascii', 'replace')
+                )
+            )
+            error.row = int(invalid[0])
+            raise error
+    return extensions
+
+
+def decode_extensions(extensions: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    То же, что decode_extension_columns, но для уже вырезанных значений (массивов bytes фиксированной длины, см.
+    BRecordLayout.decode_lines и MappedIGCFile.columns).
+    """
+    decoded = {}
+    for subtype, values in extensions.items():
+        values = np.ascontiguousarray(values)
+        width = values.dtype.itemsize
+        rows = values.view(np.uint8).reshape(len(values), width)
+        decoded.update(decode_extension_columns(rows, (subtype,), (slice(0, width),)))
+    return decoded
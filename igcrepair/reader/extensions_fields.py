@@ -3,11 +3,13 @@ from abc import ABCMeta, abstractmethod
 from typing import Tuple
 
 from igcrepair.reader.constants import EXTENSION_SUBTYPES
-from igcrepair.reader.fields import IntRecordField, StringRecordField
+from igcrepair.reader.fields import InternedField, IntRecordField, StringRecordField
 from igcrepair.reader.utils import RecordFieldError, record2field
 
 
-class IntRecordExtensionField(IntRecordField, metaclass=ABCMeta):
+class IntRecordExtensionField(InternedField, IntRecordField, metaclass=ABCMeta):
+
+    __slots__ = ()
 
     BOUNDS: Tuple[int, int] = (0, 99)
     STRING_PATTERN: re.Pattern = re.compile(pattern=r'[0-9]{2}')
@@ -21,22 +23,30 @@ class IntRecordExtensionField(IntRecordField, metaclass=ABCMeta):
 
 
 class NumberOfExtensions(IntRecordExtensionField):
+    __slots__ = ()
+
     def __repr__(self) -> str:
         return 'NN'
 
 
 class StartByteNumber(IntRecordExtensionField):
 
+    __slots__ = ()
+
     def __repr__(self) -> str:
         return 'SS'
 
 
 class FinishByteNumber(IntRecordExtensionField):
+    __slots__ = ()
+
     def __repr__(self) -> str:
         return 'FF'
 
 
-class ExtensionSubtype(StringRecordField):
+class ExtensionSubtype(InternedField, StringRecordField):
+
+    __slots__ = ()
 
     STRING_PATTERN: re.Pattern = re.compile(r'[a-z0-9*]{3}', flags=re.IGNORECASE)
 
@@ -61,6 +71,8 @@ class ExtensionSubtype(StringRecordField):
 
 class Extension:
 
+    __slots__ = ('start', 'finish', 'subtype')
+
     def __init__(
         self,
         start: StartByteNumber,
@@ -75,6 +87,25 @@ class Extension:
         self.finish: FinishByteNumber = finish
         self.subtype: ExtensionSubtype = subtype
 
+    def __setattr__(self, name: str, value) -> None:
+        # Дополнения входят в кэшируемые I-записи и разделяются между файлами, поэтому неизменяемы.
+        if hasattr(self, name):
+            raise RecordFieldError('Дополнение нельзя изменить.')
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name: str) -> None:
+        raise RecordFieldError('Дополнение нельзя изменить.')
+
+    def __str__(self) -> str:
+        return f'{self.start}{self.finish}{self.subtype}'
+
+    @property
+    def field(self) -> slice:
+        """
+        Позиция дополнения в B-записи (номера байтов в I-записи начинаются с 1 и включают конечный байт).
+        """
+        return slice(self.start.value - 1, self.finish.value)
+
     @classmethod
     def from_string(cls, string: str) -> 'Extension':
         if type(string) is not str:
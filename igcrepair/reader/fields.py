@@ -1,15 +1,51 @@
 import datetime
 import re
 from abc import ABCMeta, abstractmethod
-from typing import Union, Tuple
+from typing import Dict, Iterable, NamedTuple, Optional, Set, Union, Tuple
 
+import numpy as np
 from typing_extensions import Self
 
+from .classifier import FieldClassifier, compile_classifier
 from .utils import RecordFieldError
 
 
+def round_array(values: np.ndarray, n_digits: int) -> np.ndarray:
+    """
+    Векторный round(value, n_digits), побитово совпадающий со встроенным. np.round умножает значения на 10 ** n_digits
+    и может ошибиться в направлении округления, если произведение почти ровно посередине между целыми. Такие значения
+    (их доли процента) округляются встроенным round.
+    :param values:
+    :param n_digits:
+    :return: Массив float64.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scale = 10. ** n_digits
+    scaled = values * scale
+    rounded = np.rint(scaled) / scale
+    fraction = np.abs(scaled - np.trunc(scaled))
+    suspect = np.flatnonzero(
+        (np.abs(fraction - 0.5) <= 4 * np.spacing(np.abs(scaled))) | ~(np.abs(scaled) < 2 ** 52)
+    )
+    for i in suspect:
+        rounded.flat[i] = round(float(values.flat[i]), n_digits)
+    return rounded
+
+
 class RecordField(metaclass=ABCMeta):
 
+    __slots__ = ()
+
+    # Таблицы классов символов, полученные из STRING_PATTERN класса при его создании (см. compile_classifier). Нужны для
+    # векторной проверки столбцов; отдельные строки проверяются скомпилированным STRING_PATTERN, это быстрее.
+    STRING_CLASSES: Optional[FieldClassifier] = None
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        pattern = cls.__dict__.get('STRING_PATTERN')
+        if isinstance(pattern, re.Pattern):
+            cls.STRING_CLASSES = compile_classifier(pattern)
+
     def __call__(self) -> str:
         return str(self)
 
@@ -31,8 +67,75 @@ class RecordField(metaclass=ABCMeta):
             raise RecordFieldError('Передаваемое значение должно быть типа <str>.')
 
 
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class InternedField(RecordField):
+    """
+    Поле с небольшим количеством различных значений (буква записи, признак достоверности, код дополнения и т.п.).
+    from_string возвращает общие экземпляры из ограниченного кэша класса, поэтому проверка формата выполняется один раз
+    на каждое различное значение, а не на каждую строку файла. Значение общих экземпляров из кэша изменить нельзя;
+    экземпляры, созданные конструктором, изменяются как обычно.
+
+    Примесь должна стоять в списке базовых классов перед IntRecordField или StringRecordField.
+    """
+
+    __slots__ = ()
+
+    # Максимальное количество значений в кэше класса. Значения сверх него не кэшируются.
+    CACHE_SIZE: int = 128
+
+    _interned: Dict[str, 'InternedField']
+    # id экземпляров в кэше. Отдельное множество, а не признак в слоте: примесь не может добавлять слоты к
+    # IntRecordField и StringRecordField.
+    _shared: Set[int]
+    _hits: int
+    _misses: int
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._interned = {}
+        cls._shared = set()
+        cls._hits = cls._misses = 0
+
+    def __setattr__(self, name: str, value) -> None:
+        if name == '_value' and id(self) in self._shared:
+            raise RecordFieldError('Значение поля {0} нельзя изменить.'.format(self.__class__.__name__))
+        super().__setattr__(name, value)
+
+    @classmethod
+    def from_string(cls, string: str) -> Self:
+        field = cls._interned.get(string) if type(string) is str else None
+        if field is not None:
+            cls._hits += 1
+            return field
+
+        cls._misses += 1
+        field = super().from_string(string)
+        if len(cls._interned) < cls.CACHE_SIZE:
+            cls._interned[string] = field
+            cls._shared.add(id(field))
+        return field
+
+    @classmethod
+    def cache_info(cls) -> CacheInfo:
+        return CacheInfo(cls._hits, cls._misses, cls.CACHE_SIZE, len(cls._interned))
+
+    @classmethod
+    def cache_clear(cls) -> None:
+        cls._interned.clear()
+        cls._shared.clear()
+        cls._hits = cls._misses = 0
+
+
 class IntRecordField(RecordField):
 
+    __slots__ = ('_value',)
+
     BOUNDS: Tuple[int, int]
     STRING_PATTERN: re.Pattern = NotImplemented
 
@@ -76,7 +179,7 @@ class IntRecordField(RecordField):
         """
         super().from_string(string)
 
-        if not re.fullmatch(pattern=cls.STRING_PATTERN, string=string):
+        if not cls.STRING_PATTERN.fullmatch(string):
             raise RecordFieldError(
                 'Формат поля {0} не соответствует формату {1}.'.format(cls.__class__.__name__, cls.STRING_PATTERN)
             )
@@ -87,6 +190,8 @@ class IntRecordField(RecordField):
 
 class StringRecordField(RecordField):
 
+    __slots__ = ('_value',)
+
     STRING_PATTERN: re.Pattern = NotImplemented
 
     def __init__(self, value: str) -> None:
@@ -108,7 +213,7 @@ class StringRecordField(RecordField):
     def value(self, value: str) -> None:
         if not (
             type(value) is str
-            and re.fullmatch(pattern=self.STRING_PATTERN, string=value)
+            and self.STRING_PATTERN.fullmatch(value)
         ):
             raise RecordFieldError(
                 'Формат поля {0} не соответствует формату {1}.'.format(self.__class__.__name__, self.STRING_PATTERN)
@@ -121,7 +226,9 @@ class StringRecordField(RecordField):
         return cls(value=string)
 
 
-class RecordLiteral(StringRecordField):
+class RecordLiteral(InternedField, StringRecordField):
+
+    __slots__ = ()
 
     STRING_PATTERN: re.Pattern = re.compile(pattern=r'[AGHIJCBEFKLD]{1}', flags=re.IGNORECASE)
 
@@ -129,7 +236,9 @@ class RecordLiteral(StringRecordField):
         return self.value
     
 
-class ManufacturerCode(StringRecordField):
+class ManufacturerCode(InternedField, StringRecordField):
+
+    __slots__ = ()
 
     STRING_PATTERN: re.Pattern = re.compile(pattern=r'[0-9A-Z]{3}', flags=re.IGNORECASE)
 
@@ -139,6 +248,8 @@ class ManufacturerCode(StringRecordField):
 
 class UniqueID(StringRecordField):
 
+    __slots__ = ()
+
     STRING_PATTERN: re.Pattern = re.compile(pattern=r'[0-9A-Z]{3}', flags=re.IGNORECASE)
 
     def __repr__(self) -> str:
@@ -147,6 +258,8 @@ class UniqueID(StringRecordField):
     
 class IDExtension(StringRecordField):
 
+    __slots__ = ()
+
     STRING_PATTERN: re.Pattern = re.compile(pattern=r'[0-9A-Z]*', flags=re.IGNORECASE)
 
     @property
@@ -157,7 +270,32 @@ class IDExtension(StringRecordField):
     def value(self, value) -> None:
         if not (
             type(value) is str
-            and re.fullmatch(pattern=self.STRING_PATTERN, string=value)
+            and self.STRING_PATTERN.fullmatch(value)
+        ):
+            raise RecordFieldError(
+                'Формат поля {0} не соответствует формату {1}.'.format(self.__class__.__name__, self.STRING_PATTERN)
+            )
+        self._value = value
+
+    def __repr__(self) -> str:
+        return 'TEXTSTRING'
+
+
+class TextString(StringRecordField):
+
+    __slots__ = ()
+
+    STRING_PATTERN: re.Pattern = re.compile(pattern=r'[^\r\n]*')
+
+    @property
+    def value(self) -> str:
+        return self._value
+
+    @value.setter
+    def value(self, value) -> None:
+        if not (
+            type(value) is str
+            and self.STRING_PATTERN.fullmatch(value)
         ):
             raise RecordFieldError(
                 'Формат поля {0} не соответствует формату {1}.'.format(self.__class__.__name__, self.STRING_PATTERN)
@@ -168,12 +306,37 @@ class IDExtension(StringRecordField):
         return 'TEXTSTRING'
 
 
-class Validity(StringRecordField):
+class DataSource(StringRecordField):
+    """
+    F for the flight recorder, O for an official observer, P for the pilot.
+    """
+
+    __slots__ = ()
+
+    STRING_PATTERN: re.Pattern = re.compile(pattern=r'[FOP]{1}', flags=re.IGNORECASE)
+
+    def __repr__(self) -> str:
+        return 'S'
+
+
+class ThreeLetterCode(StringRecordField):
+
+    __slots__ = ()
+
+    STRING_PATTERN: re.Pattern = re.compile(pattern=r'[0-9A-Z]{3}', flags=re.IGNORECASE)
+
+    def __repr__(self) -> str:
+        return 'TLC'
+
+
+class Validity(InternedField, StringRecordField):
     """
     Use A for a 3D fix and V for a 2D fix (no GPS altitude) or for no GPS data (pressure altitude data must continue
     to be recorded using times from the RTC).
     """
 
+    __slots__ = ()
+
     STRING_PATTERN: re.Pattern = re.compile(pattern=r'[AV]{1}', flags=re.IGNORECASE)
 
     def __repr__(self) -> str:
@@ -182,6 +345,8 @@ class Validity(StringRecordField):
 
 class TimeUTC(RecordField):
 
+    __slots__ = ('value',)
+
     TIME_FORMAT = '%H%M%S'
 
     def __init__(self, value: datetime.time) -> None:
@@ -192,31 +357,129 @@ class TimeUTC(RecordField):
         self.value: datetime.time = value
 
     def __str__(self) -> str:
-        return self.value.strftime(self.TIME_FORMAT)
+        return '{0:02d}{1:02d}{2:02d}'.format(self.value.hour, self.value.minute, self.value.second)
 
     def __repr__(self) -> str:
         return 'HHMMSS'
 
+    @property
+    def seconds(self) -> int:
+        """
+        :return: Секунды с начала суток.
+        """
+        return self.value.hour * 3600 + self.value.minute * 60 + self.value.second
+
     @classmethod
-    def from_string(cls, string: str) -> Self:
+    def _format_error(cls) -> RecordFieldError:
+        return RecordFieldError(
+            'Формат даты для поля {0} не соответствует формату {1}.'.format(cls.__name__, cls.TIME_FORMAT)
+        )
+
+    @classmethod
+    def seconds_from_string(cls, string: str) -> int:
+        """
+        Разбирает HHMMSS арифметически, без datetime.datetime.strptime.
+        :param string:
+        :return: Секунды с начала суток.
+        """
         super().from_string(string)
-        try:
+        if not (len(string) == 6 and string.isascii() and string.isdigit()):
+            raise cls._format_error()
+        hours, minutes_seconds = divmod(int(string), 10000)
+        minutes, seconds = divmod(minutes_seconds, 100)
+        if hours > 23 or minutes > 59 or seconds > 59:
+            raise cls._format_error()
+        return hours * 3600 + minutes * 60 + seconds
+
+    @staticmethod
+    def time_from_seconds(seconds: int) -> datetime.time:
+        """
+        :param seconds: Секунды с начала суток.
+        :return:
+        """
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        return datetime.time(hours, minutes, seconds)
+
+    @classmethod
+    def from_seconds(cls, seconds: int) -> Self:
+        """
+        :param seconds: Секунды с начала суток.
+        :return:
+        """
+        if not (type(seconds) is int and 0 <= seconds < 24 * 3600):
+            raise RecordFieldError('Количество секунд должно быть в промежутке [0; 86400). Указано {0}.'.format(seconds))
+        return cls(cls.time_from_seconds(seconds))
+
+    @classmethod
+    def from_string(cls, string: str) -> Self:
+        return cls(cls.time_from_seconds(cls.seconds_from_string(string)))
+
+    @staticmethod
+    def seconds_array(columns: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Векторная версия seconds_from_string.
+        :param columns: Матрица uint8 размера (n, 6) с символами HHMMSS.
+        :return: Секунды с начала суток (int64) и маска корректных строк.
+        """
+        digits = columns.astype(np.int64) - ord('0')
+        hours = digits[:, 0] * 10 + digits[:, 1]
+        minutes = digits[:, 2] * 10 + digits[:, 3]
+        seconds = digits[:, 4] * 10 + digits[:, 5]
+        valid = (
+            ((digits >= 0) & (digits <= 9)).all(axis=1)
+            & (hours < 24)
+            & (minutes < 60)
+            & (seconds < 60)
+        )
+        return hours * 3600 + minutes * 60 + seconds, valid
+
+    @classmethod
+    def seconds_from_bytes(cls, buffer: Union[bytes, bytearray, memoryview]) -> np.ndarray:
+        """
+        :param buffer: Подряд идущие значения HHMMSS без разделителей.
+        :return: Секунды с начала суток (int32).
+        """
+        data = np.frombuffer(buffer, dtype=np.uint8)
+        if data.size % 6:
+            raise cls._format_error()
+        seconds, valid = cls.seconds_array(data.reshape(-1, 6))
+        if not valid.all():
+            raise cls._format_error()
+        return seconds.astype(np.int32)
+
+    @classmethod
+    def seconds_from_strings(cls, strings: Iterable[str]) -> np.ndarray:
+        """
+        :param strings: Значения HHMMSS.
+        :return: Секунды с начала суток (int32).
+        """
+        strings = list(strings)
+        for string in strings:
+            super().from_string(string)
             if len(string) != 6:
-                raise ValueError
-            return cls(datetime.datetime.strptime(string, cls.TIME_FORMAT).time())
-        except ValueError:
-            raise RecordFieldError(
-                'Формат даты для поля {0} не соответствует формату {1}.'.format(cls.__class__.__name__, cls.TIME_FORMAT)
-            )
+                raise cls._format_error()
+        try:
+            buffer = ''.join(strings).encode('ascii')
+        except UnicodeEncodeError:
+            raise cls._format_error()
+        return cls.seconds_from_bytes(buffer)
 
 
 class Coordinates(RecordField, metaclass=ABCMeta):
 
+    __slots__ = ('n_digits', '_dd')
+
     BOUNDS: Tuple[int, int] = NotImplemented
     NEGATIVE_SIDE: str = NotImplemented
     POSITIVE_SIDE: str = NotImplemented
+    N_DIGITS: int = 10
+    # Количество цифр градусов в записи DDMMmmm.
+    N_DEGREES: int = NotImplemented
+    STRING_PATTERN: re.Pattern = NotImplemented
+    FORMAT_ERROR: str = NotImplemented
 
-    def __init__(self, dd: Union[int, float], n_digits: int = 10) -> None:
+    def __init__(self, dd: Union[int, float], n_digits: int = N_DIGITS) -> None:
         """
         :param dd:
         :param n_digits:
@@ -280,7 +543,7 @@ class Coordinates(RecordField, metaclass=ABCMeta):
     @property
     def degrees(self) -> int:
         value = abs(self.dd)
-        value = round(value)
+        value = int(value)
         return value
 
     @property
@@ -291,7 +554,7 @@ class Coordinates(RecordField, metaclass=ABCMeta):
 
     @property
     def minutes(self) -> int:
-        value = round(self.decimal_minutes)
+        value = int(self.decimal_minutes)
         return value
 
     @property
@@ -300,6 +563,19 @@ class Coordinates(RecordField, metaclass=ABCMeta):
         value = round(value, ndigits=self.n_digits)
         return value
 
+    @property
+    def thousandths_of_minutes(self) -> Tuple[int, int]:
+        """
+        Градусы и минуты в тысячных долях, как они записываются в IGC (DDMMmmm). При округлении до 60000 тысячных
+        переносим в градусы.
+        :return: Градусы, тысячные доли минут.
+        """
+        degrees = self.degrees
+        thousandths = round(self.decimal_minutes * 1000)
+        if thousandths == 60 * 1000:
+            degrees, thousandths = degrees + 1, 0
+        return degrees, thousandths
+
     @property
     def side(self) -> str:
         if self.dd < 0:
@@ -407,6 +683,240 @@ class Coordinates(RecordField, metaclass=ABCMeta):
             dd *= -1
         return cls(dd)
 
+    @classmethod
+    def dd_array(cls, columns: np.ndarray, extra: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Векторная версия from_string без проверок: некорректные строки отмечаются в маске.
+        :param columns: Матрица uint8 размера (n, N_DEGREES + 6) с символами DDMMmmmN.
+        :param extra: Матрица uint8 (n, k) с цифрами минут после тысячных из дополнения LAD или LOD.
+        :return: Десятичные градусы и маска корректных строк.
+        """
+        digits = columns[:, :-1].astype(np.int64) - ord('0')
+        side = columns[:, -1] | 0x20
+        negative = side == ord(cls.NEGATIVE_SIDE.lower())
+
+        degrees = np.zeros(columns.shape[0], dtype=np.int64)
+        for i in range(cls.N_DEGREES):
+            degrees = degrees * 10 + digits[:, i]
+        thousandths = np.zeros(columns.shape[0], dtype=np.int64)
+        for i in range(cls.N_DEGREES, cls.N_DEGREES + 5):
+            thousandths = thousandths * 10 + digits[:, i]
+        scale = 1000
+        digits_valid = ((digits >= 0) & (digits <= 9)).all(axis=1)
+        if extra is not None:
+            extra = extra.astype(np.int64) - ord('0')
+            for i in range(extra.shape[1]):
+                thousandths = thousandths * 10 + extra[:, i]
+            scale *= 10 ** extra.shape[1]
+            digits_valid &= ((extra >= 0) & (extra <= 9)).all(axis=1)
+        dd = degrees + (thousandths / scale) / 60
+
+        valid = (
+            digits_valid
+            & (negative | (side == ord(cls.POSITIVE_SIDE.lower())))
+            & (degrees <= cls.BOUNDS[1])
+            & (thousandths <= 60 * scale)
+            & (dd <= cls.BOUNDS[1])
+        )
+        return round_array(np.where(negative, -dd, dd), cls.N_DIGITS), valid
+
+    @classmethod
+    def from_string_array(cls, strings: Union[Iterable[str], np.ndarray]) -> np.ndarray:
+        """
+        Векторная версия from_string: значения совпадают с from_string(string).dd.
+        :param strings: Строки DDMMmmmN (str или bytes, в том числе массив NumPy).
+        :return: Десятичные градусы (float64).
+        """
+        width = cls.N_DEGREES + 6
+        strings = np.asarray(strings if isinstance(strings, np.ndarray) else list(strings))
+        if strings.size and strings.dtype.kind == 'U':
+            try:
+                strings = strings.astype('S{0}'.format(width + 1))
+            except UnicodeEncodeError:
+                raise RecordFieldError(cls.FORMAT_ERROR)
+        if strings.size and (strings.dtype.kind != 'S' or (np.char.str_len(strings) != width).any()):
+            raise RecordFieldError(cls.FORMAT_ERROR)
+
+        columns = np.frombuffer(strings.astype('S{0}'.format(width)).tobytes(), dtype=np.uint8).reshape(-1, width)
+        dd, valid = cls.dd_array(columns)
+        invalid = np.flatnonzero(~valid)
+        if invalid.size:
+            raise RecordFieldError('{0} Элемент {1}.'.format(cls.FORMAT_ERROR, invalid[0]))
+        return dd
+
+    @classmethod
+    def _dd_array(cls, dd: np.ndarray, n_digits: int) -> np.ndarray:
+        """
+        Повторяет проверку и округление сеттера dd.
+        """
+        dd = np.asarray(dd, dtype=np.float64)
+        if not ((dd >= cls.BOUNDS[0]) & (dd <= cls.BOUNDS[1])).all():
+            raise RecordFieldError(
+                'Значение decimal_degrees должно быть в промежутке от [{0}; {1}] градусов.'.format(*cls.BOUNDS)
+            )
+        return round_array(dd, n_digits)
+
+    @classmethod
+    def _side_array(cls, dd: np.ndarray) -> np.ndarray:
+        return np.where(dd < 0, cls.NEGATIVE_SIDE, cls.POSITIVE_SIDE)
+
+    @classmethod
+    def _negative_array(cls, side: Union[Iterable[str], np.ndarray]) -> np.ndarray:
+        side = np.char.upper(np.asarray(side if isinstance(side, np.ndarray) else list(side), dtype='U'))
+        negative = side == cls.NEGATIVE_SIDE
+        if not (negative | (side == cls.POSITIVE_SIDE)).all():
+            raise RecordFieldError('side должен быть {0} или {1}.'.format(cls.NEGATIVE_SIDE, cls.POSITIVE_SIDE))
+        return negative
+
+    @classmethod
+    def to_dmm_array(
+        cls,
+        dd: np.ndarray,
+        n_digits: int = N_DIGITS,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Векторная версия dmm.
+        :param dd: Десятичные градусы.
+        :param n_digits:
+        :return: Градусы (int64), минуты (float64) и стороны света (строки из одного символа).
+        """
+        dd = cls._dd_array(dd, n_digits)
+        absolute = np.abs(dd)
+        degrees = absolute.astype(np.int64)
+        decimal_minutes = round_array(60 * (absolute - degrees), n_digits)
+        return degrees, decimal_minutes, cls._side_array(dd)
+
+    @classmethod
+    def to_dms_array(
+        cls,
+        dd: np.ndarray,
+        n_digits: int = N_DIGITS,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Векторная версия dms.
+        :param dd: Десятичные градусы.
+        :param n_digits:
+        :return: Градусы (int64), минуты (int64), секунды (float64) и стороны света.
+        """
+        dd = cls._dd_array(dd, n_digits)
+        absolute = np.abs(dd)
+        degrees = absolute.astype(np.int64)
+        minutes = round_array(60 * (absolute - degrees), n_digits).astype(np.int64)
+        decimal_seconds = round_array(3600 * (absolute - degrees) - 60 * minutes, n_digits)
+        return degrees, minutes, decimal_seconds, cls._side_array(dd)
+
+    @classmethod
+    def to_thousandths_array(
+        cls,
+        dd: np.ndarray,
+        n_digits: int = N_DIGITS,
+        extra_digits: int = 0,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Векторная версия thousandths_of_minutes.
+        :param extra_digits: Количество знаков минут после тысячных (дополнения LAD и LOD).
+        :return: Градусы и тысячные доли минут (int64), при extra_digits > 0 - с extra_digits знаками после тысячных.
+        """
+        degrees, decimal_minutes, _ = cls.to_dmm_array(dd, n_digits)
+        scale = 1000 * 10 ** extra_digits
+        thousandths = np.rint(decimal_minutes * scale).astype(np.int64)
+        carry = thousandths == 60 * scale
+        return degrees + carry, np.where(carry, 0, thousandths)
+
+    @classmethod
+    def format_array(cls, dd: np.ndarray, n_digits: int = N_DIGITS) -> np.ndarray:
+        """
+        Векторная версия __str__.
+        :param dd: Десятичные градусы.
+        :param n_digits:
+        :return: Строки DDMMmmmN в виде массива bytes фиксированной длины.
+        """
+        dd = np.asarray(dd, dtype=np.float64)
+        degrees, thousandths = cls.to_thousandths_array(dd, n_digits)
+        return cls._format_columns(dd, degrees, thousandths, n_digits)
+
+    @classmethod
+    def format_precise_array(
+        cls,
+        dd: np.ndarray,
+        extra_digits: int,
+        n_digits: int = N_DIGITS,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Как format_array, но с extra_digits знаками минут после тысячных, которые записываются в дополнение LAD или
+        LOD. Основная часть тогда содержит отброшенные, а не округленные тысячные.
+        :return: Строки DDMMmmmN и строки из extra_digits цифр (массивы bytes фиксированной длины).
+        """
+        dd = np.asarray(dd, dtype=np.float64)
+        degrees, minutes = cls.to_thousandths_array(dd, n_digits, extra_digits)
+        thousandths, extra = np.divmod(minutes, 10 ** extra_digits)
+        columns = np.empty((dd.size, extra_digits), dtype=np.uint8)
+        for i in range(extra_digits):
+            columns[:, i] = extra // 10 ** (extra_digits - 1 - i) % 10 + ord('0')
+        return (
+            cls._format_columns(dd, degrees, thousandths, n_digits),
+            columns.view('S{0}'.format(extra_digits)).ravel() if extra_digits else np.full(dd.size, b''),
+        )
+
+    @classmethod
+    def _format_columns(cls, dd: np.ndarray, degrees: np.ndarray, thousandths: np.ndarray, n_digits: int) -> np.ndarray:
+        width = cls.N_DEGREES + 6
+        columns = np.empty((dd.size, width), dtype=np.uint8)
+        for i in range(cls.N_DEGREES):
+            columns[:, i] = degrees // 10 ** (cls.N_DEGREES - 1 - i) % 10 + ord('0')
+        for i in range(5):
+            columns[:, cls.N_DEGREES + i] = thousandths // 10 ** (4 - i) % 10 + ord('0')
+        columns[:, -1] = np.where(
+            round_array(dd, n_digits) < 0, ord(cls.NEGATIVE_SIDE), ord(cls.POSITIVE_SIDE)
+        )
+        return columns.view('S{0}'.format(width)).ravel()
+
+    @classmethod
+    def from_dmm_array(
+        cls,
+        degrees: np.ndarray,
+        decimal_minutes: np.ndarray,
+        side: Union[Iterable[str], np.ndarray],
+        n_digits: int = N_DIGITS,
+    ) -> np.ndarray:
+        """
+        Векторная версия from_dmm.
+        :return: Десятичные градусы (float64).
+        """
+        degrees = np.asarray(degrees, dtype=np.int64)
+        decimal_minutes = np.asarray(decimal_minutes, dtype=np.float64)
+        if not ((degrees >= 0) & (degrees <= cls.BOUNDS[1])).all():
+            raise RecordFieldError('degrees должен быть в промежутке [{0}; {1}].'.format(0, cls.BOUNDS[1]))
+        if not ((decimal_minutes >= 0) & (decimal_minutes <= 60)).all():
+            raise RecordFieldError('decimal_minutes должен быть в промежутке [{0}; {1}].'.format(0, 60))
+        dd = degrees + decimal_minutes / 60
+        return cls._dd_array(np.where(cls._negative_array(side), -dd, dd), n_digits)
+
+    @classmethod
+    def from_dms_array(
+        cls,
+        degrees: np.ndarray,
+        minutes: np.ndarray,
+        decimal_seconds: np.ndarray,
+        side: Union[Iterable[str], np.ndarray],
+        n_digits: int = N_DIGITS,
+    ) -> np.ndarray:
+        """
+        Векторная версия from_dms.
+        :return: Десятичные градусы (float64).
+        """
+        degrees = np.asarray(degrees, dtype=np.int64)
+        minutes = np.asarray(minutes, dtype=np.int64)
+        decimal_seconds = np.asarray(decimal_seconds, dtype=np.float64)
+        if not ((degrees >= 0) & (degrees <= cls.BOUNDS[1])).all():
+            raise RecordFieldError('degrees должен быть в промежутке [{0}; {1}].'.format(0, cls.BOUNDS[1]))
+        if not ((minutes >= 0) & (minutes <= 60)).all():
+            raise RecordFieldError('minutes должен быть в промежутке [{0}; {1}].'.format(0, 60))
+        if not ((decimal_seconds >= 0) & (decimal_seconds <= 60)).all():
+            raise RecordFieldError('decimal_seconds должен быть в промежутке [{0}; {1}].'.format(0, 60))
+        dd = degrees + minutes / 60 + decimal_seconds / 3600
+        return cls._dd_array(np.where(cls._negative_array(side), -dd, dd), n_digits)
+
     @classmethod
     @abstractmethod
     def from_string(cls, string: str) -> None:
@@ -419,14 +929,18 @@ class Coordinates(RecordField, metaclass=ABCMeta):
 
 class Latitude(Coordinates):
 
+    __slots__ = ()
+
     BOUNDS: Tuple[int, int] = (-90, 90)
     NEGATIVE_SIDE: str = 'S'
     POSITIVE_SIDE: str = 'N'
+    N_DEGREES: int = 2
+    STRING_PATTERN: re.Pattern = re.compile(pattern=r'[0-9]{7}[NS]{1}', flags=re.IGNORECASE)
+    FORMAT_ERROR: str = 'Неправильный формат широты.'
 
     def __str__(self) -> str:
-        degrees, decimal_minutes, side = self.dmm
-        decimal_minutes = int(decimal_minutes * 1000)
-        return '{0:02d}{1:05d}{2}'.format(degrees, decimal_minutes, side)
+        degrees, decimal_minutes = self.thousandths_of_minutes
+        return '{0:02d}{1:05d}{2}'.format(degrees, decimal_minutes, self.side)
 
     def __repr__(self) -> str:
         return 'DDMMmmmN/S'
@@ -442,10 +956,8 @@ class Latitude(Coordinates):
         :return:
         """
         super().from_string(string)
-        if not (
-            re.fullmatch(pattern=r'[0-9]{7}[NS]{1}', string=string, flags=re.IGNORECASE)
-        ):
-            raise RecordFieldError('Неправильный формат широты.')
+        if not cls.STRING_PATTERN.fullmatch(string):
+            raise RecordFieldError(cls.FORMAT_ERROR)
         degrees = int(string[slice(0, 2)])
         decimal_minutes = float(int(string[slice(2, 7)]) / 1000)
         side = string[7].upper()
@@ -454,14 +966,18 @@ class Latitude(Coordinates):
 
 class Longitude(Coordinates):
 
+    __slots__ = ()
+
     BOUNDS: Tuple[int, int] = (-180, 180)
     NEGATIVE_SIDE: str = 'W'
     POSITIVE_SIDE: str = 'E'
+    N_DEGREES: int = 3
+    STRING_PATTERN: re.Pattern = re.compile(pattern=r'[0-9]{8}[WE]{1}', flags=re.IGNORECASE)
+    FORMAT_ERROR: str = 'Неправильный формат долготы.'
 
     def __str__(self) -> str:
-        degrees, decimal_minutes, side = self.dmm
-        decimal_minutes = int(decimal_minutes * 1000)
-        return '{0:03d}{1:05d}{2}'.format(degrees, decimal_minutes, side)
+        degrees, decimal_minutes = self.thousandths_of_minutes
+        return '{0:03d}{1:05d}{2}'.format(degrees, decimal_minutes, self.side)
 
     def __repr__(self) -> str:
         return 'DDDMMmmmE/W'
@@ -477,10 +993,8 @@ class Longitude(Coordinates):
         :return:
         """
         super().from_string(string)
-        if not (
-                re.fullmatch(pattern=r'[0-9]{8}[WE]{1}', string=string, flags=re.IGNORECASE)
-        ):
-            raise RecordFieldError('Неправильный формат долготы.')
+        if not cls.STRING_PATTERN.fullmatch(string):
+            raise RecordFieldError(cls.FORMAT_ERROR)
         degrees = int(string[slice(0, 3)])
         decimal_minutes = float(int(string[slice(3, 8)]) / 1000)
         side = string[8].upper()
@@ -489,6 +1003,8 @@ class Longitude(Coordinates):
 
 class PressureAltitude(IntRecordField):
 
+    __slots__ = ()
+
     BOUNDS: Tuple[int, int] = (-9999, 9999)
     STRING_PATTERN: re.Pattern = re.compile(pattern=r'[0-]{1}[0-9]{4}')
 
@@ -501,6 +1017,8 @@ class PressureAltitude(IntRecordField):
 
 class GNSSAltitude(IntRecordField):
 
+    __slots__ = ()
+
     BOUNDS: Tuple[int, int] = (0, 99999)
     STRING_PATTERN: re.Pattern = re.compile(pattern=r'[0-9]{5}')
 
@@ -509,3 +1027,17 @@ class GNSSAltitude(IntRecordField):
 
     def __str__(self) -> str:
         return '{0:05d}'.format(self.value)
+
+
+class SatelliteID(IntRecordField):
+
+    __slots__ = ()
+
+    BOUNDS: Tuple[int, int] = (0, 99)
+    STRING_PATTERN: re.Pattern = re.compile(pattern=r'[0-9]{2}')
+
+    def __repr__(self) -> str:
+        return 'AA'
+
+    def __str__(self) -> str:
+        return '{0:02d}'.format(self.value)
@@ -0,0 +1,176 @@
+import functools
+import re
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from igcrepair.reader.batch import Fixes, decode_rows, gather_rows
+from igcrepair.reader.constants import B_RECORD_LENGTH, LATITUDE_DIGITS, LONGITUDE_DIGITS
+from igcrepair.reader.extensions_columns import decode_extension_columns
+from igcrepair.reader.fields import (
+    Coordinates,
+    TimeUTC,
+    Latitude,
+    Longitude,
+    Validity,
+    PressureAltitude,
+    GNSSAltitude,
+)
+from igcrepair.reader.records import IRecord, BRecord
+from igcrepair.reader.utils import RecordError, RecordFieldError
+
+
+# Основная часть B-записи одним выражением: время, широта, долгота, признак достоверности, высоты.
+B_RECORD_PATTERN: re.Pattern = re.compile(
+    r'[Bb]([0-9]{2})([0-9]{2})([0-9]{2})'
+    r'([0-9]{2})([0-9]{5})([NSns])'
+    r'([0-9]{3})([0-9]{5})([EWew])'
+    r'([AVav])'
+    r'([0-][0-9]{4})'
+    r'([0-9]{5})'
+)
+
+Fix = Tuple[Union[int, float, bool, str], ...]
+
+
+class BRecordLayout:
+    """
+    Декодер B-записей, специализированный под конкретную I-запись. Основная часть записи разбирается одним
+    регулярным выражением, дополнения вырезаются по заранее вычисленной таблице срезов, поэтому при декодировании нет
+    обращений к классам полей через record2field.
+
+    Экземпляры следует получать через compile_layout, который кэширует их по строке I-записи.
+    """
+
+    __slots__ = ('i_record', 'subtypes', 'slices', 'length', 'latitude_digits', 'longitude_digits')
+
+    def __init__(self, i_record: IRecord) -> None:
+        extensions = sorted(i_record.extensions, key=lambda extension: extension.start.value)
+        self.i_record: IRecord = i_record
+        self.subtypes: Tuple[str, ...] = tuple(extension.subtype.value for extension in extensions)
+        self.slices: Tuple[slice, ...] = tuple(extension.field for extension in extensions)
+        self.length: int = max([B_RECORD_LENGTH] + [extension.finish.value for extension in extensions])
+        # Положения дополнений с цифрами минут после тысячных или None, если их нет в I-записи.
+        slices = dict(zip((subtype.upper() for subtype in self.subtypes), self.slices))
+        self.latitude_digits: Optional[slice] = slices.get(LATITUDE_DIGITS)
+        self.longitude_digits: Optional[slice] = slices.get(LONGITUDE_DIGITS)
+
+    def __repr__(self) -> str:
+        return '{0}({1})'.format(self.__class__.__name__, self.i_record)
+
+    def decode(self, line: str) -> Fix:
+        """
+        Декодирует B-запись. Значения совпадают с получаемыми через BRecord.from_string.
+        :param line: Строка B-записи без символов конца строки.
+        :return: Секунды с начала суток, широта, долгота, признак достоверности (True для "A"), барометрическая и
+                 GNSS-высоты, затем значения дополнений в порядке subtypes.
+        """
+        # Длина проверяется первой, как в BRecord.from_string и gather_rows: обрезанная строка - ошибка длины.
+        if len(line) < self.length:
+            raise RecordError('Длина B-записи должна быть не меньше {0}. Передано {1}.'.format(self.length, len(line)))
+        match = B_RECORD_PATTERN.match(line)
+        if match is None:
+            raise RecordFieldError('Неправильный формат B-записи.')
+
+        (
+            hours, minutes, seconds,
+            latitude_degrees, latitude_minutes, latitude_side,
+            longitude_degrees, longitude_minutes, longitude_side,
+            validity, pressure_altitude, gnss_altitude,
+        ) = match.groups()
+
+        hours, minutes, seconds = int(hours), int(minutes), int(seconds)
+        if hours > 23 or minutes > 59 or seconds > 59:
+            raise RecordFieldError('Неправильное время B-записи.')
+
+        return (
+            hours * 3600 + minutes * 60 + seconds,
+            _coordinate(latitude_degrees, latitude_minutes, latitude_side, Latitude),
+            _coordinate(longitude_degrees, longitude_minutes, longitude_side, Longitude),
+            validity in 'Aa',
+            int(pressure_altitude),
+            int(gnss_altitude),
+            *(line[field] for field in self.slices),
+        )
+
+    def record(self, line: str) -> BRecord:
+        """
+        :param line: Строка B-записи без символов конца строки.
+        :return: B-запись, собранная из результата decode.
+        """
+        seconds, latitude, longitude, validity, pressure_altitude, gnss_altitude, *extensions = self.decode(line)
+        return BRecord(
+            TimeUTC.from_seconds(seconds),
+            Latitude(latitude),
+            Longitude(longitude),
+            Validity.from_string('A' if validity else 'V'),
+            PressureAltitude(pressure_altitude),
+            GNSSAltitude(gnss_altitude),
+            dict(zip(self.subtypes, extensions)),
+            self.i_record,
+            line[B_RECORD_LENGTH:],
+        )
+
+    def decode_lines(
+        self,
+        data: np.ndarray,
+        starts: np.ndarray,
+        lengths: np.ndarray,
+        precise: bool = False,
+        typed: bool = False,
+    ) -> Tuple[Fixes, Dict[str, np.ndarray]]:
+        """
+        Векторно декодирует основную часть B-записей и дополнения за один проход по матрице байтов.
+        :param data: Буфер в виде массива uint8.
+        :param starts: Смещения начала B-записей.
+        :param lengths: Длины B-записей без символов конца строки.
+        :param precise: Добавлять ли к минутам широты и долготы цифры дополнений LAD и LOD, если они есть в I-записи.
+        :param typed: Декодировать ли дополнения, зарегистрированные в EXTENSION_TYPES, в числовые колонки.
+        :return: Колонки основной части и значения дополнений: необработанные (массивы bytes фиксированной длины) или,
+                 если typed, числовые (см. decode_extension_columns).
+        """
+        rows = gather_rows(data, starts, lengths, self.length)
+        if typed:
+            extensions = decode_extension_columns(rows, self.subtypes, self.slices)
+        else:
+            extensions = {
+                subtype: np.ascontiguousarray(rows[:, field]).view('S{0}'.format(field.stop - field.start)).ravel()
+                for subtype, field in zip(self.subtypes, self.slices)
+            }
+        if precise:
+            return decode_rows(rows, self.latitude_digits, self.longitude_digits), extensions
+        return decode_rows(rows), extensions
+
+
+def _coordinate(degrees: str, thousandths: str, side: str, coordinates: type) -> float:
+    """
+    Повторяет арифметику Coordinates.from_dmm и округление Coordinates.dd без создания объектов.
+    """
+    degrees, thousandths = int(degrees), int(thousandths)
+    dd = degrees + (thousandths / 1000) / 60
+    if degrees > coordinates.BOUNDS[1] or thousandths > 60 * 1000 or dd > coordinates.BOUNDS[1]:
+        raise RecordFieldError('Значение {0} вне допустимого промежутка.'.format(coordinates.__name__))
+    if side in (coordinates.NEGATIVE_SIDE, coordinates.NEGATIVE_SIDE.lower()):
+        dd = -dd
+    return round(dd, Coordinates.N_DIGITS)
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_layout(string: str) -> BRecordLayout:
+    return BRecordLayout(IRecord.from_string(string))
+
+
+def compile_layout(i_record: Union[str, IRecord]) -> BRecordLayout:
+    """
+    Возвращает декодер B-записей для I-записи. Декодеры кэшируются по строке I-записи: у файлов одного соревнования
+    обычно всего несколько различных I-записей.
+    :param i_record: Строка I-записи или разобранная I-запись.
+    :return:
+    """
+    if isinstance(i_record, IRecord):
+        i_record = str(i_record)
+    return _compile_layout(i_record.rstrip('\r\n'))
+
+
+compile_layout.cache_info = _compile_layout.cache_info
+compile_layout.cache_clear = _compile_layout.cache_clear
@@ -0,0 +1,146 @@
+"""
+Ленивые записи: хранят исходную строку (str или memoryview над буфером файла) и разбирают поле классом поля через
+record2field только при первом чтении атрибута. Результат сохраняется в слот записи, повторное чтение стоит как у
+обычной записи. Ошибки формата поля возникают при его чтении, а не при создании записи.
+
+    for record in IGCReader(path, record_types='B', lazy=True):
+        if record.time.seconds > start:
+            ...
+"""
+from typing import Dict, Optional, Tuple
+
+from typing_extensions import Self
+
+from igcrepair.reader.constants import (
+    B_RECORD_LENGTH,
+    B_RECORD_TIME,
+    B_RECORD_LATITUDE,
+    B_RECORD_LONGITUDE,
+    B_RECORD_VALIDITY,
+    B_RECORD_PRESSURE_ALTITUDE,
+    B_RECORD_GNSS_ALTITUDE,
+)
+from igcrepair.reader.fields import (
+    TimeUTC,
+    Latitude,
+    Longitude,
+    Validity,
+    PressureAltitude,
+    GNSSAltitude,
+)
+from igcrepair.reader.records import IRecord, BRecord
+from igcrepair.reader.utils import RecordString, record2field, record2string
+
+
+# Атрибут B-записи -> класс поля и положение в строке.
+B_RECORD_FIELDS: Dict[str, Tuple[type, slice]] = {
+    'time': (TimeUTC, B_RECORD_TIME),
+    'latitude': (Latitude, B_RECORD_LATITUDE),
+    'longitude': (Longitude, B_RECORD_LONGITUDE),
+    'validity': (Validity, B_RECORD_VALIDITY),
+    'pressure_altitude': (PressureAltitude, B_RECORD_PRESSURE_ALTITUDE),
+    'gnss_altitude': (GNSSAltitude, B_RECORD_GNSS_ALTITUDE),
+}
+
+_B_LITERALS: str = 'Bb'
+
+
+class LazyBRecord(BRecord):
+    """
+    B-запись, поля которой разбираются при первом чтении. Незаполненный слот поднимает AttributeError, и только тогда
+    вызывается __getattr__, поэтому уже разобранные поля читаются напрямую из слотов. Присваивание поля заменяет его
+    без разбора.
+    """
+
+    __slots__ = ('_line', '_layout')
+
+    def __init__(self, line: RecordString, layout: Optional[IRecord] = None) -> None:
+        """
+        :param line: Строка B-записи без символов конца строки. Проверяется только в from_string.
+        :param layout: I-запись, описывающая дополнения (см. BRecord.from_string).
+        """
+        self._line: RecordString = line
+        self._layout: Optional[IRecord] = layout
+
+    def __getattr__(self, name: str):
+        if name in B_RECORD_FIELDS:
+            value = record2field(self._line, *B_RECORD_FIELDS[name])
+        elif name == 'extensions':
+            value = self._layout.values(self._line) if self._layout is not None else {}
+        elif name == 'layout':
+            value = self._layout
+        elif name == 'tail':
+            value = record2string(self._line, slice(B_RECORD_LENGTH, None))
+        else:
+            raise AttributeError(
+                "'{0}' object has no attribute '{1}'".format(self.__class__.__name__, name)
+            )
+        setattr(self, name, value)
+        return value
+
+    @property
+    def line(self) -> RecordString:
+        """
+        :return: Исходная строка записи.
+        """
+        return self._line
+
+    def decode(self) -> BRecord:
+        """
+        :return: Обычная B-запись со всеми полями. Ошибки формата всех полей возникают здесь.
+        """
+        return BRecord(
+            self.time,
+            self.latitude,
+            self.longitude,
+            self.validity,
+            self.pressure_altitude,
+            self.gnss_altitude,
+            self.extensions,
+            self.layout,
+            self.tail,
+        )
+
+    @classmethod
+    def from_string(cls, string: RecordString, layout: Optional[IRecord] = None) -> Self:
+        """
+        Проверяет только тип и длину записи, поля не разбираются.
+        :param string:
+        :param layout: I-запись, описывающая дополнения.
+        :return:
+        """
+        # Для строк проверка выполняется без разбора RecordLiteral, остальное (и сообщения об ошибках) - _check_string.
+        if not (type(string) is str and len(string) >= cls.MIN_LENGTH and string[0] in _B_LITERALS):
+            cls._check_string(string)
+        return cls(string, layout)
+
+
+class LazyIRecord(IRecord):
+    """
+    I-запись, дополнения которой разбираются при первом обращении к extensions. В отличие от IRecord.from_string,
+    экземпляры не кэшируются: строка записи хранится в самой записи.
+    """
+
+    __slots__ = ('_line',)
+
+    def __init__(self, line: RecordString) -> None:
+        object.__setattr__(self, '_line', line)
+
+    def __getattr__(self, name: str):
+        if name != 'extensions':
+            raise AttributeError(
+                "'{0}' object has no attribute '{1}'".format(self.__class__.__name__, name)
+            )
+        # IRecord.__setattr__ проверяет наличие атрибута через hasattr, что снова вызвало бы __getattr__.
+        value = tuple(self._parse_extensions(self._line))
+        object.__setattr__(self, name, value)
+        return value
+
+    @property
+    def line(self) -> RecordString:
+        return self._line
+
+    @classmethod
+    def from_string(cls, string: RecordString) -> Self:
+        cls._check_string(string)
+        return cls(string)
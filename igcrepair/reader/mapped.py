@@ -0,0 +1,232 @@
+import mmap
+import os
+from array import array
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+from igcrepair.reader.batch import Fixes, decode_lines
+from igcrepair.reader.layout import compile_layout
+from igcrepair.reader.records import Record, IRecord, JRecord, BRecord, KRecord
+from igcrepair.reader.stream import RECORDS
+from igcrepair.reader.utils import RecordError, RecordFieldError
+
+
+_LF: int = ord('\n')
+_CR: int = ord('\r')
+# Размер блока, в котором ищутся концы строк при построении индекса.
+_INDEX_CHUNK_SIZE: int = 1 << 24
+
+
+class MappedIGCFile:
+    """
+    Доступ к IGC-файлу через mmap. При открытии строится индекс смещений начала строк по типам записей (array('Q')),
+    после чего N-я запись любого типа возвращается за O(1) в виде memoryview без копирования файла в строки Python.
+    Записи декодируются только по запросу.
+
+    Полученные memoryview ссылаются на mmap, поэтому должны быть освобождены до закрытия файла.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]) -> None:
+        self.path: Union[str, os.PathLike] = path
+        self._file = open(path, 'rb')
+        self._size: int = os.fstat(self._file.fileno()).st_size
+        # mmap нельзя создать для пустого файла.
+        self._mmap: Optional[mmap.mmap] = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._size else None
+        )
+        self._view: memoryview = memoryview(self._mmap if self._mmap is not None else b'')
+        # Смещения всех символов LF файла: по ним векторно находятся концы и номера строк.
+        self._newlines: np.ndarray = np.empty(0, dtype=np.int64)
+        self.offsets: Dict[str, array] = self._build_index()
+        self._i_record: Optional[IRecord] = None
+        self._j_record: Optional[JRecord] = None
+
+    def __enter__(self) -> 'MappedIGCFile':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+    def _build_index(self) -> Dict[str, array]:
+        """
+        :return: Тип записи -> смещения начала строк этого типа.
+        """
+        offsets: Dict[str, array] = {}
+        if self._mmap is None:
+            return offsets
+
+        data = np.frombuffer(self._mmap, dtype=np.uint8)
+        newlines = [
+            np.flatnonzero(data[begin:begin + _INDEX_CHUNK_SIZE] == _LF) + begin
+            for begin in range(0, self._size, _INDEX_CHUNK_SIZE)
+        ]
+        self._newlines = np.concatenate([np.empty(0, dtype=np.int64)] + newlines).astype(np.int64)
+        starts = np.concatenate([np.zeros(1, dtype=np.int64), self._newlines + 1])
+        starts = starts[starts < self._size]
+        literals = data[starts]
+        non_empty = (literals != _LF) & (literals != _CR)
+        starts, literals = starts[non_empty], literals[non_empty]
+        literals = np.where((literals >= ord('a')) & (literals <= ord('z')), literals - 0x20, literals)
+
+        for literal in np.unique(literals):
+            offsets[chr(literal)] = array('Q', starts[literals == literal].astype(np.uint64).tobytes())
+        del data
+        return offsets
+
+    def count(self, record_type: str) -> int:
+        """
+        :param record_type: Буква типа записи.
+        :return: Количество записей этого типа в файле.
+        """
+        return len(self.offsets.get(record_type.upper(), ()))
+
+    def _end(self, start: int) -> int:
+        """
+        :param start: Смещение начала строки.
+        :return: Смещение конца строки без символов CR/LF.
+        """
+        end = self._mmap.find(b'\n', start)
+        if end == -1:
+            end = self._size
+        if end > start and self._mmap[end - 1] == _CR:
+            end -= 1
+        return end
+
+    def line(self, record_type: str, n: int) -> memoryview:
+        """
+        :param record_type: Буква типа записи.
+        :param n: Порядковый номер записи этого типа (отрицательные номера отсчитываются с конца).
+        :return: Строка записи без символов конца строки.
+        """
+        offsets = self.offsets.get(record_type.upper())
+        if offsets is None:
+            raise IndexError('В файле нет записей типа "{0}".'.format(record_type))
+        start = offsets[n]
+        return self._view[start:self._end(start)]
+
+    def lines(self, record_type: str, start: int = 0, stop: Optional[int] = None) -> Iterator[memoryview]:
+        """
+        :return: Строки записей типа record_type с номерами [start, stop).
+        """
+        for offset in self.offsets.get(record_type.upper(), array('Q'))[start:stop]:
+            yield self._view[offset:self._end(offset)]
+
+    @property
+    def i_record(self) -> Optional[IRecord]:
+        if self._i_record is None and self.count('I'):
+            self._i_record = IRecord.from_string(self.line('I', 0))
+        return self._i_record
+
+    @property
+    def j_record(self) -> Optional[JRecord]:
+        if self._j_record is None and self.count('J'):
+            self._j_record = JRecord.from_string(self.line('J', 0))
+        return self._j_record
+
+    def record(self, record_type: str, n: int) -> Record:
+        """
+        Декодирует N-ю запись типа record_type. Дополнения B- и K-записей разбираются по первой I- и J-записи файла.
+        :param record_type: Буква типа записи.
+        :param n: Порядковый номер записи этого типа.
+        :return:
+        """
+        record_type = record_type.upper()
+        record_class = RECORDS.get(record_type)
+        if record_class is None:
+            raise RecordError('Неизвестный тип записи "{0}".'.format(record_type))
+        line = self.line(record_type, n)
+        try:
+            if record_class is BRecord:
+                return BRecord.from_string(line, self.i_record)
+            if record_class is KRecord:
+                return KRecord.from_string(line, self.j_record)
+            return record_class.from_string(line)
+        finally:
+            line.release()
+
+    def fix(self, n: int) -> BRecord:
+        """
+        :param n: Порядковый номер B-записи.
+        :return:
+        """
+        return self.record('B', n)
+
+    def _b_lines(self, start: int, stop: Optional[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Концы строк находятся одним searchsorted по индексу символов LF, без поиска в mmap для каждой строки.
+        :return: Смещения начала и длины B-записей с номерами [start, stop).
+        """
+        offsets = self.offsets.get('B', array('Q'))[start:stop]
+        starts = np.frombuffer(offsets, dtype=np.uint64).astype(np.int64)
+        if starts.size == 0:
+            return starts, starts.copy()
+        ends = np.append(self._newlines, self._size)[np.searchsorted(self._newlines, starts)]
+        data = np.frombuffer(self._mmap, dtype=np.uint8)
+        has_cr = ends > starts
+        has_cr[has_cr] = data[ends[has_cr] - 1] == _CR
+        del data
+        return starts, ends - has_cr - starts
+
+    def _decode_error(self, error: Exception, starts: np.ndarray) -> Exception:
+        """
+        :return: Ошибка векторного декодирования с номером строки файла. Трассировка исходной ошибки сбрасывается: ее
+                 кадры ссылаются на массивы поверх mmap, из-за чего файл нельзя было бы закрыть.
+        """
+        error = error.with_traceback(None)
+        if error.row is None:
+            return error
+        line_number = int(np.searchsorted(self._newlines, starts[error.row])) + 1
+        line_error = type(error)('Строка {0}: {1}'.format(line_number, error))
+        line_error.row = error.row
+        if isinstance(error, RecordFieldError):
+            line_error.field = error.field
+        return line_error
+
+    def fixes(self, start: int = 0, stop: Optional[int] = None) -> Fixes:
+        """
+        Векторно декодирует B-записи с номерами [start, stop) прямо из mmap.
+        :return: Колонки декодированных записей.
+        """
+        starts, lengths = self._b_lines(start, stop)
+        if starts.size == 0:
+            return Fixes.empty()
+        data = np.frombuffer(self._mmap, dtype=np.uint8)
+        try:
+            return decode_lines(data, starts, lengths)
+        except (RecordError, RecordFieldError) as error:
+            raise self._decode_error(error, starts) from error
+        finally:
+            del data
+
+    def columns(
+        self,
+        start: int = 0,
+        stop: Optional[int] = None,
+        precise: bool = False,
+        typed: bool = False,
+    ) -> Tuple[Fixes, Dict[str, np.ndarray]]:
+        """
+        То же, что fixes, но вместе с дополнениями, объявленными в первой I-записи файла.
+        :param precise: Добавлять ли к координатам цифры дополнений LAD и LOD (см. BRecordLayout.decode_lines).
+        :param typed: Декодировать ли дополнения в числовые колонки (см. BRecordLayout.decode_lines).
+        :return: Колонки основной части и значения дополнений (см. BRecordLayout.decode_lines).
+        """
+        if self.i_record is None:
+            return self.fixes(start, stop), {}
+        layout = compile_layout(self.i_record)
+        starts, lengths = self._b_lines(start, stop)
+        # I-запись есть, значит файл не пустой и mmap создан.
+        data = np.frombuffer(self._mmap, dtype=np.uint8)
+        try:
+            return layout.decode_lines(data, starts, lengths, precise, typed)
+        except (RecordError, RecordFieldError) as error:
+            raise self._decode_error(error, starts) from error
+        finally:
+            del data
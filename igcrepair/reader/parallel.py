@@ -0,0 +1,127 @@
+"""
+Параллельный разбор множества IGC-файлов (например, всех треков соревновательного дня).
+
+    python -m igcrepair.reader.parallel tracks/ --workers 8
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from igcrepair.reader.batch import Fixes
+from igcrepair.reader.validation import validate_and_decode_file, validate_buffer
+
+
+Path = Union[str, os.PathLike]
+
+IGC_SUFFIX: str = '.igc'
+# Сколько порций приходится на один процесс при автоматическом выборе chunksize: меньше порций - меньше накладных
+# расходов на пересылку, больше - ровнее загрузка процессов при файлах разного размера.
+CHUNKS_PER_WORKER: int = 4
+
+
+class FileResult(NamedTuple):
+    """
+    Результат разбора одного файла. Содержит только строки и массивы NumPy, поэтому передается между процессами
+    несколькими непрерывными блоками, а не объектами полей и записей.
+    """
+
+    path: str
+    i_record: Optional[str]  # строка I-записи, по которой можно получить декодер через compile_layout
+    fixes: Fixes  # B-записи без ошибок в основной части
+    errors: np.ndarray  # таблица ошибок, см. validate_buffer
+    error: Optional[str] = None  # ошибка чтения файла
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.errors.size == 0
+
+
+def iter_igc_files(paths: Union[Path, Iterable[Path]]) -> List[str]:
+    """
+    :param paths: Файл, каталог или список файлов и каталогов. Каталоги просматриваются рекурсивно.
+    :return: Пути к IGC-файлам. Содержимое каталогов упорядочено по имени.
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+
+    files = []
+    for path in paths:
+        path = os.fspath(path)
+        if not os.path.isdir(path):
+            files.append(path)
+            continue
+        for root, directories, names in os.walk(path):
+            directories.sort()
+            files.extend(
+                os.path.join(root, name) for name in sorted(names) if name.lower().endswith(IGC_SUFFIX)
+            )
+    return files
+
+
+def ingest_file(path: Path) -> FileResult:
+    """
+    Проверяет и декодирует один файл. Не выбрасывает исключений: ошибки чтения файла возвращаются в поле error.
+    :param path: Путь к IGC-файлу.
+    :return:
+    """
+    path = os.fspath(path)
+    try:
+        errors, fixes, i_record = validate_and_decode_file(path)
+    except OSError as error:
+        return FileResult(path, None, Fixes.empty(), validate_buffer(b''), str(error))
+    return FileResult(path, str(i_record) if i_record is not None else None, fixes, errors)
+
+
+def ingest(
+    paths: Union[Path, Iterable[Path]],
+    max_workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+) -> Iterator[FileResult]:
+    """
+    Разбирает файлы в пуле процессов. Файлы раздаются процессам порциями по chunksize.
+    :param paths: Файл, каталог или список файлов и каталогов (см. iter_igc_files).
+    :param max_workers: Количество процессов. По умолчанию - количество процессоров. При 1 файлы разбираются в
+                        текущем процессе.
+    :param chunksize: Количество файлов в порции. По умолчанию файлы делятся на CHUNKS_PER_WORKER порций на процесс.
+    :return: Результаты в порядке файлов.
+    """
+    files = iter_igc_files(paths)
+    max_workers = max_workers or os.cpu_count() or 1
+    max_workers = min(max_workers, len(files))
+    if max_workers <= 1:
+        yield from map(ingest_file, files)
+        return
+
+    if chunksize is None:
+        chunksize = max(1, len(files) // (max_workers * CHUNKS_PER_WORKER))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        yield from executor.map(ingest_file, files, chunksize=chunksize)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='+', help='IGC-файлы или каталоги')
+    parser.add_argument('--workers', type=int, default=None, help='количество процессов')
+    parser.add_argument('--chunksize', type=int, default=None, help='количество файлов в порции')
+    parser.add_argument('--errors', action='store_true', help='выводить ошибки записей')
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for result in ingest(args.paths, max_workers=args.workers, chunksize=args.chunksize):
+        failed += not result.ok
+        if result.error is not None:
+            print('{0}\tошибка: {1}'.format(result.path, result.error))
+            continue
+        print('{0}\tточек: {1}\tошибок: {2}'.format(result.path, len(result.fixes.time), result.errors.size))
+        if args.errors:
+            for row in result.errors:
+                print('  строка {0}\t{1}\t{2}\t{3}'.format(*row))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,46 +1,495 @@
-from typing import Tuple, List
+import functools
+from abc import ABCMeta, abstractmethod
+from typing import Tuple, List, Dict, Optional
 
+from typing_extensions import Self
+
+from igcrepair.reader.constants import (
+    B_RECORD_LENGTH,
+    B_RECORD_TIME,
+    B_RECORD_LATITUDE,
+    B_RECORD_LONGITUDE,
+    B_RECORD_VALIDITY,
+    B_RECORD_PRESSURE_ALTITUDE,
+    B_RECORD_GNSS_ALTITUDE,
+)
 from igcrepair.reader.extensions_fields import (
     NumberOfExtensions,
     Extension,
 )
-from igcrepair.reader.fields import RecordLiteral
-from igcrepair.reader.utils import RecordError, record2field
+from igcrepair.reader.fields import (
+    RecordLiteral,
+    ManufacturerCode,
+    UniqueID,
+    TextString,
+    DataSource,
+    ThreeLetterCode,
+    Validity,
+    TimeUTC,
+    Latitude,
+    Longitude,
+    PressureAltitude,
+    GNSSAltitude,
+    SatelliteID,
+)
+from igcrepair.reader.utils import RecordError, RecordString, record2field, record2string
+
+
+class Record(metaclass=ABCMeta):
+
+    __slots__ = ()
+
+    RECORD_TYPE: RecordLiteral = NotImplemented
+    MIN_LENGTH: int = 1
+
+    @abstractmethod
+    def __str__(self) -> str:
+        ...
+
+    @classmethod
+    def _check_string(cls, string: RecordString) -> None:
+        """
+        Проверяет тип записи и минимальную длину строки. Кроме <str> допускаются байты (bytes, memoryview), поля из
+        которых декодируются по мере разбора.
+        :param string:
+        :return:
+        """
+        if not isinstance(string, (str, bytes, bytearray, memoryview)):
+            raise RecordError('Передаваемое значение должно быть типа <str>. Передан тип {0}'.format(type(string)))
+        if len(string) < cls.MIN_LENGTH:
+            raise RecordError(
+                'Длина записи "{0}" должна быть не меньше {1}. Передано {2}.'.format(
+                    cls.RECORD_TYPE.value, cls.MIN_LENGTH, len(string)
+                )
+            )
+        record_literal: RecordLiteral = record2field(string, RecordLiteral, 0)
+        if record_literal.value != cls.RECORD_TYPE.value:
+            raise RecordError(
+                'Неправильный тип записи. Должен быть "{0}", передан "{1}".'.format(
+                    cls.RECORD_TYPE.value, record_literal.value
+                )
+            )
+
+    @classmethod
+    @abstractmethod
+    def from_string(cls, string: RecordString) -> Self:
+        ...
+
+
+class ARecord(Record):
+    """
+    FR manufacturer and identification: A MMM NNN TEXTSTRING.
+    """
+
+    __slots__ = ('manufacturer', 'unique_id', 'id_extension')
+
+    RECORD_TYPE: RecordLiteral = RecordLiteral(value='A')
+    MIN_LENGTH: int = 7
+
+    def __init__(
+        self,
+        manufacturer: ManufacturerCode,
+        unique_id: UniqueID,
+        id_extension: TextString,
+    ) -> None:
+        self.manufacturer: ManufacturerCode = manufacturer
+        self.unique_id: UniqueID = unique_id
+        self.id_extension: TextString = id_extension
+
+    def __str__(self) -> str:
+        return f'{self.RECORD_TYPE}{self.manufacturer}{self.unique_id}{self.id_extension}'
+
+    @classmethod
+    def from_string(cls, string: RecordString) -> 'ARecord':
+        cls._check_string(string)
+        return cls(
+            record2field(string, ManufacturerCode, slice(1, 4)),
+            record2field(string, UniqueID, slice(4, 7)),
+            # Свободный текст: у реальных логгеров здесь бывают пробелы и знаки (ALXNGIIFLIGHT:1, AXSX001 SeeYou).
+            record2field(string, TextString, slice(7, None)),
+        )
+
+
+class HRecord(Record):
+    """
+    File header: H S TLC TEXTSTRING, например HFDTE160701.
+    """
 
+    __slots__ = ('source', 'subject', 'text')
 
-class IRecord:
+    RECORD_TYPE: RecordLiteral = RecordLiteral(value='H')
+    MIN_LENGTH: int = 5
+
+    def __init__(self, source: DataSource, subject: ThreeLetterCode, text: TextString) -> None:
+        self.source: DataSource = source
+        self.subject: ThreeLetterCode = subject
+        self.text: TextString = text
+
+    def __str__(self) -> str:
+        return f'{self.RECORD_TYPE}{self.source}{self.subject}{self.text}'
+
+    @classmethod
+    def from_string(cls, string: RecordString) -> 'HRecord':
+        cls._check_string(string)
+        return cls(
+            record2field(string, DataSource, 1),
+            record2field(string, ThreeLetterCode, slice(2, 5)),
+            record2field(string, TextString, slice(5, None)),
+        )
+
+
+# Сколько различных I- и J-записей хранится в кэше разобранных записей.
+I_RECORD_CACHE_SIZE: int = 256
+
+
+class IRecord(Record):
+    """
+    Неизменяемая запись: экземпляры, полученные через from_string, кэшируются по строке записи и разделяются между
+    файлами и потоками.
+    """
+
+    __slots__ = ('extensions',)
 
     RECORD_TYPE: RecordLiteral = RecordLiteral(value='I')
+    MIN_LENGTH: int = 3
 
     def __init__(self, *extensions: Extension) -> None:
         self.extensions: Tuple[Extension, ...] = extensions
 
+    def __setattr__(self, name: str, value) -> None:
+        if hasattr(self, name):
+            raise RecordError('Запись "{0}" нельзя изменить.'.format(self.RECORD_TYPE.value))
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name: str) -> None:
+        raise RecordError('Запись "{0}" нельзя изменить.'.format(self.RECORD_TYPE.value))
+
     def __len__(self) -> int:
         return len(self.extensions)
 
     def __str__(self) -> str:
-        string: str = (
+        return (
             f'{self.RECORD_TYPE}'
             f'{NumberOfExtensions(value=len(self))}'
-        )
-        for extension in self.extensions:
-            string += str(extension)
-        return string
+        ) + ''.join(map(str, self.extensions))
 
-    @classmethod
-    def from_string(cls, string: str) -> 'IRecord':
-        record_literal: RecordLiteral = record2field(string, RecordLiteral, 0)
-        if record_literal.value != cls.RECORD_TYPE.value:
-            raise RecordError(
-                'Неправильный тип записи. Должен быть "{0}", передан "{1}".'.format(
-                    cls.RECORD_TYPE.value, record_literal.value
+    def values(self, string: RecordString) -> Dict[str, str]:
+        """
+        Извлекает значения дополнений из B-записи (K-записи для J-записи) в порядке их расположения в строке.
+        :param string:
+        :return: Тип дополнения -> значение.
+        """
+        values: Dict[str, str] = {}
+        for extension in sorted(self.extensions, key=lambda e: e.start.value):
+            if extension.finish.value > len(string):
+                raise RecordError(
+                    'Дополнение {0} выходит за пределы записи длины {1}.'.format(extension.subtype, len(string))
                 )
-            )
+            values[extension.subtype.value] = record2string(string, extension.field)
+        return values
+
+    @classmethod
+    def from_string(cls, string: RecordString) -> Self:
+        """
+        У файлов одного логгера I-записи обычно совпадают побайтно, поэтому разобранные записи кэшируются по строке
+        (LRU на I_RECORD_CACHE_SIZE записей, общий для процесса). Статистика кэша - IRecord.cache_info().
+        :param string:
+        :return:
+        """
+        if isinstance(string, (bytes, bytearray, memoryview)):
+            string = record2string(string, slice(None))
+        if type(string) is not str:
+            return cls._from_string(string)
+        return _cached_i_record(cls, string)
+
+    @classmethod
+    def cache_info(cls) -> Tuple[int, int, int, int]:
+        return _cached_i_record.cache_info()
+
+    @classmethod
+    def cache_clear(cls) -> None:
+        _cached_i_record.cache_clear()
+
+    @classmethod
+    def _from_string(cls, string: RecordString) -> Self:
+        cls._check_string(string)
+        return cls(*cls._parse_extensions(string))
+
+    @staticmethod
+    def _parse_extensions(string: RecordString) -> List[Extension]:
         n_extensions: NumberOfExtensions = record2field(string, NumberOfExtensions, slice(1, 3))
         extensions: List[Extension] = []
         for i in range(n_extensions.value):
             start = 3 + 7 * i
             finish = start + 7
             extensions.append(record2field(string, Extension, slice(start, finish)))
+        return extensions
+
+
+@functools.lru_cache(maxsize=I_RECORD_CACHE_SIZE)
+def _cached_i_record(cls: type, string: str) -> IRecord:
+    return cls._from_string(string)
+
+
+class JRecord(IRecord):
+    """
+    Extensions to the K record. Формат совпадает с I-записью.
+    """
+
+    __slots__ = ()
+
+    RECORD_TYPE: RecordLiteral = RecordLiteral(value='J')
+
+
+def place_extensions(tail: str, offset: int, extensions: Dict[str, str], layout: Optional[IRecord]) -> str:
+    """
+    Вписывает значения дополнений в часть строки после основной по их положениям в I- или J-записи. Остальные байты
+    tail сохраняются, недостающие до конца дополнения заполняются пробелами. Значения дополнений, которых нет в
+    layout, дописываются в конец.
+    :param tail: Исходная часть строки после основной.
+    :param offset: Длина основной части записи.
+    :param extensions: Тип дополнения -> значение.
+    :param layout:
+    :return:
+    """
+    placed = set()
+    if layout is not None:
+        for extension in sorted(layout.extensions, key=lambda e: e.start.value, reverse=True):
+            subtype = extension.subtype.value
+            start, finish = extension.start.value - 1 - offset, extension.finish.value - offset
+            if subtype not in extensions or start < 0 or subtype in placed:
+                continue
+            tail = tail.ljust(finish)
+            tail = tail[:start] + extensions[subtype] + tail[finish:]
+            placed.add(subtype)
+    return tail + ''.join(value for subtype, value in extensions.items() if subtype not in placed)
+
+
+class BRecord(Record):
+    """
+    Fix: B HHMMSS DDMMmmmN DDDMMmmmE V PPPPP GGGGG CR LF, далее дополнения, объявленные в I-записи.
+    """
+
+    __slots__ = (
+        'time', 'latitude', 'longitude', 'validity', 'pressure_altitude', 'gnss_altitude', 'extensions', 'layout',
+        'tail',
+    )
+
+    RECORD_TYPE: RecordLiteral = RecordLiteral(value='B')
+    MIN_LENGTH: int = B_RECORD_LENGTH
+
+    def __init__(
+        self,
+        time: TimeUTC,
+        latitude: Latitude,
+        longitude: Longitude,
+        validity: Validity,
+        pressure_altitude: PressureAltitude,
+        gnss_altitude: GNSSAltitude,
+        extensions: Optional[Dict[str, str]] = None,
+        layout: Optional[IRecord] = None,
+        tail: str = '',
+    ) -> None:
+        """
+        :param extensions: Значения дополнений.
+        :param layout: I-запись, по которой значения дополнений размещаются в строке.
+        :param tail: Исходная часть строки после основной. Байты, не описанные ни одним дополнением (промежутки между
+                     дополнениями и после них), записываются обратно как есть.
+        """
+        self.time: TimeUTC = time
+        self.latitude: Latitude = latitude
+        self.longitude: Longitude = longitude
+        self.validity: Validity = validity
+        self.pressure_altitude: PressureAltitude = pressure_altitude
+        self.gnss_altitude: GNSSAltitude = gnss_altitude
+        self.extensions: Dict[str, str] = extensions or {}
+        self.layout: Optional[IRecord] = layout
+        self.tail: str = tail
+
+    def __str__(self) -> str:
+        return (
+            f'{self.RECORD_TYPE}{self.time}{self.latitude}{self.longitude}{self.validity}'
+            f'{self.pressure_altitude}{self.gnss_altitude}'
+        ) + place_extensions(self.tail, B_RECORD_LENGTH, self.extensions, self.layout)
+
+    @classmethod
+    def from_string(cls, string: RecordString, layout: Optional[IRecord] = None) -> 'BRecord':
+        """
+        :param string:
+        :param layout: I-запись, описывающая дополнения. Если не передана, дополнения не читаются.
+        :return:
+        """
+        cls._check_string(string)
+        return cls(
+            record2field(string, TimeUTC, B_RECORD_TIME),
+            record2field(string, Latitude, B_RECORD_LATITUDE),
+            record2field(string, Longitude, B_RECORD_LONGITUDE),
+            record2field(string, Validity, B_RECORD_VALIDITY),
+            record2field(string, PressureAltitude, B_RECORD_PRESSURE_ALTITUDE),
+            record2field(string, GNSSAltitude, B_RECORD_GNSS_ALTITUDE),
+            layout.values(string) if layout is not None else None,
+            layout,
+            record2string(string, slice(B_RECORD_LENGTH, None)),
+        )
+
+
+class KRecord(Record):
+    """
+    Extension data: K HHMMSS, далее дополнения, объявленные в J-записи.
+    """
+
+    __slots__ = ('time', 'extensions', 'layout', 'tail')
+
+    RECORD_TYPE: RecordLiteral = RecordLiteral(value='K')
+    MIN_LENGTH: int = 7
+
+    def __init__(
+        self,
+        time: TimeUTC,
+        extensions: Optional[Dict[str, str]] = None,
+        layout: Optional[JRecord] = None,
+        tail: str = '',
+    ) -> None:
+        """
+        :param layout: J-запись, по которой значения дополнений размещаются в строке.
+        :param tail: Исходная часть строки после времени (см. BRecord).
+        """
+        self.time: TimeUTC = time
+        self.extensions: Dict[str, str] = extensions or {}
+        self.layout: Optional[JRecord] = layout
+        self.tail: str = tail
+
+    def __str__(self) -> str:
+        return f'{self.RECORD_TYPE}{self.time}' + place_extensions(
+            self.tail, self.MIN_LENGTH, self.extensions, self.layout
+        )
+
+    @classmethod
+    def from_string(cls, string: RecordString, layout: Optional[JRecord] = None) -> 'KRecord':
+        """
+        :param string:
+        :param layout: J-запись, описывающая дополнения. Если не передана, дополнения не читаются.
+        :return:
+        """
+        cls._check_string(string)
+        return cls(
+            record2field(string, TimeUTC, slice(1, 7)),
+            layout.values(string) if layout is not None else None,
+            layout,
+            record2string(string, slice(cls.MIN_LENGTH, None)),
+        )
+
+
+class ERecord(Record):
+    """
+    Event: E HHMMSS TLC TEXTSTRING.
+    """
+
+    __slots__ = ('time', 'subject', 'text')
+
+    RECORD_TYPE: RecordLiteral = RecordLiteral(value='E')
+    MIN_LENGTH: int = 10
+
+    def __init__(self, time: TimeUTC, subject: ThreeLetterCode, text: TextString) -> None:
+        self.time: TimeUTC = time
+        self.subject: ThreeLetterCode = subject
+        self.text: TextString = text
+
+    def __str__(self) -> str:
+        return f'{self.RECORD_TYPE}{self.time}{self.subject}{self.text}'
+
+    @classmethod
+    def from_string(cls, string: RecordString) -> 'ERecord':
+        cls._check_string(string)
+        return cls(
+            record2field(string, TimeUTC, slice(1, 7)),
+            record2field(string, ThreeLetterCode, slice(7, 10)),
+            record2field(string, TextString, slice(10, None)),
+        )
+
+
+class FRecord(Record):
+    """
+    Satellite constellation: F HHMMSS AA BB CC ...
+    """
+
+    __slots__ = ('time', 'satellites')
+
+    RECORD_TYPE: RecordLiteral = RecordLiteral(value='F')
+    MIN_LENGTH: int = 7
+
+    def __init__(self, time: TimeUTC, *satellites: SatelliteID) -> None:
+        self.time: TimeUTC = time
+        self.satellites: Tuple[SatelliteID, ...] = satellites
+
+    def __str__(self) -> str:
+        return f'{self.RECORD_TYPE}{self.time}' + ''.join(str(satellite) for satellite in self.satellites)
+
+    @classmethod
+    def from_string(cls, string: RecordString) -> 'FRecord':
+        cls._check_string(string)
+        if (len(string) - 7) % 2:
+            raise RecordError('Номера спутников в F-записи должны состоять из двух символов.')
+        return cls(
+            record2field(string, TimeUTC, slice(1, 7)),
+            *(record2field(string, SatelliteID, slice(i, i + 2)) for i in range(7, len(string), 2)),
+        )
+
+
+class TextRecord(Record, metaclass=ABCMeta):
+    """
+    Запись, содержимое которой хранится как текст без разбора на поля.
+    """
+
+    __slots__ = ('text',)
+
+    def __init__(self, text: TextString) -> None:
+        self.text: TextString = text
+
+    def __str__(self) -> str:
+        return f'{self.RECORD_TYPE}{self.text}'
+
+    @classmethod
+    def from_string(cls, string: RecordString) -> Self:
+        cls._check_string(string)
+        return cls(record2field(string, TextString, slice(1, None)))
+
+
+class CRecord(TextRecord):
+    """
+    Task/declaration.
+    """
+
+    __slots__ = ()
+
+    RECORD_TYPE: RecordLiteral = RecordLiteral(value='C')
+
+
+class DRecord(TextRecord):
+    """
+    Differential GPS.
+    """
+
+    __slots__ = ()
+
+    RECORD_TYPE: RecordLiteral = RecordLiteral(value='D')
+
+
+class GRecord(TextRecord):
+    """
+    Security record.
+    """
+
+    __slots__ = ()
+
+    RECORD_TYPE: RecordLiteral = RecordLiteral(value='G')
+
+
+class LRecord(TextRecord):
+    """
+    Logbook/comments.
+    """
+
+    __slots__ = ()
 
-        return cls(*extensions)
+    RECORD_TYPE: RecordLiteral = RecordLiteral(value='L')
@@ -0,0 +1,133 @@
+import os
+from typing import Dict, Iterator, Optional, Type, Union, IO, Iterable
+
+from igcrepair.reader.fields import RecordLiteral
+from igcrepair.reader.lazy import LazyBRecord
+from igcrepair.reader.records import (
+    Record,
+    ARecord,
+    HRecord,
+    IRecord,
+    JRecord,
+    BRecord,
+    KRecord,
+    ERecord,
+    FRecord,
+    CRecord,
+    DRecord,
+    GRecord,
+    LRecord,
+)
+from igcrepair.reader.utils import RecordError, RecordFieldError, record2field
+
+
+Source = Union[str, os.PathLike, IO]
+
+RECORDS: Dict[str, Type[Record]] = {
+    record.RECORD_TYPE.value: record
+    for record in (ARecord, HRecord, IRecord, JRecord, BRecord, KRecord, ERecord, FRecord, CRecord, DRecord, GRecord,
+                   LRecord)
+}
+
+
+class IGCReader:
+    """
+    Потоковое чтение IGC-файла. Файл читается построчно, записи разбираются лениво при итерации, поэтому память не
+    зависит от размера файла.
+    """
+
+    def __init__(
+        self,
+        source: Source,
+        record_types: Optional[Iterable[str]] = None,
+        encoding: str = 'utf-8',
+        lazy: bool = False,
+    ) -> None:
+        """
+        :param source: Путь к файлу или открытый файловый объект (текстовый или бинарный).
+        :param record_types: Типы записей, которые нужно разбирать. Остальные строки пропускаются без разбора.
+                             По умолчанию разбираются все записи.
+        :param encoding: Кодировка для бинарных источников.
+        :param lazy: Возвращать ли B-записи как LazyBRecord: поля разбираются при первом чтении атрибута.
+        """
+        self.source: Source = source
+        self.record_types: Optional[frozenset] = (
+            frozenset(record_type.upper() for record_type in record_types) if record_types is not None else None
+        )
+        self.encoding: str = encoding
+        self.lazy: bool = lazy
+        self.i_record: Optional[IRecord] = None
+        self.j_record: Optional[JRecord] = None
+
+    def __iter__(self) -> Iterator[Record]:
+        if isinstance(self.source, (str, os.PathLike)):
+            with open(self.source, 'rb') as file:
+                yield from self.read(file)
+        else:
+            yield from self.read(self.source)
+
+    def read(self, lines: Iterable[Union[str, bytes]]) -> Iterator[Record]:
+        """
+        :param lines: Строки IGC-файла.
+        :return: Разобранные записи в порядке следования в файле.
+        """
+        self.i_record = None
+        self.j_record = None
+        for line_number, line in enumerate(lines, start=1):
+            if isinstance(line, bytes):
+                line = line.decode(self.encoding, errors='replace')
+            line = line.rstrip('\r\n')
+            if not line:
+                continue
+            record = self.parse_numbered_line(line, line_number)
+            if record is not None:
+                yield record
+
+    def parse_numbered_line(self, line: str, line_number: int) -> Optional[Record]:
+        """
+        То же, что parse_line, но в сообщение об ошибке добавляется номер строки.
+        :param line: Строка без символов конца строки.
+        :param line_number: Номер строки в файле, начиная с 1.
+        :return:
+        """
+        try:
+            return self.parse_line(line)
+        except (RecordError, RecordFieldError) as error:
+            line_error = type(error)('Строка {0}: {1}'.format(line_number, error))
+            if isinstance(error, RecordFieldError):
+                line_error.field = error.field
+            raise line_error from error
+
+    def parse_line(self, line: str) -> Optional[Record]:
+        """
+        Разбирает строку в запись соответствующего типа. I- и J-записи запоминаются для разбора дополнений следующих
+        B- и K-записей.
+        :param line: Строка без символов конца строки.
+        :return: Запись или None, если ее тип не входит в record_types.
+        """
+        record_type = record2field(line, RecordLiteral, 0).value
+        # I и J нужно разбирать всегда: от них зависит разбор B и K.
+        if (
+            self.record_types is not None
+            and record_type not in self.record_types
+            and record_type not in (IRecord.RECORD_TYPE.value, JRecord.RECORD_TYPE.value)
+        ):
+            return None
+
+        record_class = RECORDS[record_type]
+        if record_class is BRecord:
+            record = (LazyBRecord if self.lazy else BRecord).from_string(line, self.i_record)
+        elif record_class is KRecord:
+            record = KRecord.from_string(line, self.j_record)
+        else:
+            record = record_class.from_string(line)
+
+        if isinstance(record, JRecord):
+            self.j_record = record
+        elif isinstance(record, IRecord):
+            self.i_record = record
+
+        if self.record_types is not None and record_type not in self.record_types:
+            return None
+        return record
+
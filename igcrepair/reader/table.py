@@ -0,0 +1,143 @@
+import os
+from array import array
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Union
+
+import numpy as np
+
+from igcrepair.reader.batch import Buffer, Fixes, decode_b_records
+from igcrepair.reader.fields import (
+    TimeUTC,
+    Latitude,
+    Longitude,
+    Validity,
+    PressureAltitude,
+    GNSSAltitude,
+)
+from igcrepair.reader.mapped import MappedIGCFile
+from igcrepair.reader.records import BRecord
+
+if TYPE_CHECKING:
+    from igcrepair.reader.cache import ParseCache
+    from igcrepair.repair.spatial import SpatialIndex
+
+
+class FixTable:
+    """
+    Трек, хранимый в параллельных типизированных массивах (см. Fixes). Объекты полей и B-записей создаются только при
+    обращении к конкретной точке, поэтому на точку приходится около 30 байт вместо нескольких сотен.
+    """
+
+    __slots__ = ('fixes', '_spatial_index')
+
+    def __init__(self, fixes: Fixes) -> None:
+        self.fixes: Fixes = fixes
+        self._spatial_index: Optional['SpatialIndex'] = None
+
+    def __len__(self) -> int:
+        return len(self.fixes.time)
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[BRecord, 'FixTable']:
+        if isinstance(item, slice):
+            return FixTable(Fixes(*(column[item] for column in self.fixes)))
+        return self.record(item)
+
+    def __iter__(self) -> Iterator[BRecord]:
+        for i in range(len(self)):
+            yield self.record(i)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self.fixes)
+
+    @property
+    def spatial_index(self) -> 'SpatialIndex':
+        """
+        Пространственный индекс точек (см. SpatialIndex), строится при первом обращении.
+        """
+        if self._spatial_index is None:
+            from igcrepair.repair.spatial import SpatialIndex
+
+            self._spatial_index = SpatialIndex.from_fixes(self.fixes)
+        return self._spatial_index
+
+    def time(self, i: int) -> TimeUTC:
+        return TimeUTC.from_seconds(int(self.fixes.time[i]))
+
+    def latitude(self, i: int) -> Latitude:
+        return Latitude(float(self.fixes.latitude[i]))
+
+    def longitude(self, i: int) -> Longitude:
+        return Longitude(float(self.fixes.longitude[i]))
+
+    def validity(self, i: int) -> Validity:
+        return Validity.from_string('A' if self.fixes.validity[i] else 'V')
+
+    def pressure_altitude(self, i: int) -> PressureAltitude:
+        return PressureAltitude(int(self.fixes.pressure_altitude[i]))
+
+    def gnss_altitude(self, i: int) -> GNSSAltitude:
+        return GNSSAltitude(int(self.fixes.gnss_altitude[i]))
+
+    def record(self, i: int) -> BRecord:
+        """
+        :param i: Номер точки.
+        :return: B-запись, собранная из значений колонок (без дополнений).
+        """
+        return BRecord(
+            self.time(i),
+            self.latitude(i),
+            self.longitude(i),
+            self.validity(i),
+            self.pressure_altitude(i),
+            self.gnss_altitude(i),
+        )
+
+    @classmethod
+    def from_buffer(cls, buffer: Buffer) -> 'FixTable':
+        """
+        :param buffer: Строки B-записей (см. decode_b_records).
+        :return:
+        """
+        return cls(decode_b_records(buffer))
+
+    @classmethod
+    def from_file(cls, path: Union[str, os.PathLike], cache: Optional['ParseCache'] = None) -> 'FixTable':
+        """
+        :param path: Путь к IGC-файлу. B-записи декодируются векторно прямо из mmap.
+        :param cache: Дисковый кэш разобранных файлов. Если файл с тем же содержимым уже разбирался, колонки читаются
+                      из кэша без разбора текста.
+        :return:
+        """
+        if cache is not None:
+            return cls(cache.load(path).fixes)
+        with MappedIGCFile(path) as file:
+            return cls(file.fixes())
+
+    @classmethod
+    def from_records(cls, records: Iterable[BRecord]) -> 'FixTable':
+        """
+        Собирает таблицу из B-записей, например из IGCReader. Значения сразу складываются в типизированные массивы,
+        поэтому объекты записей не накапливаются в памяти.
+        :param records:
+        :return:
+        """
+        time, latitude, longitude = array('i'), array('d'), array('d')
+        validity, pressure_altitude, gnss_altitude = array('b'), array('i'), array('i')
+        for record in records:
+            time.append(record.time.seconds)
+            latitude.append(record.latitude.dd)
+            longitude.append(record.longitude.dd)
+            validity.append(record.validity.value == 'A')
+            pressure_altitude.append(record.pressure_altitude.value)
+            gnss_altitude.append(record.gnss_altitude.value)
+
+        return cls(
+            Fixes(
+                time=np.frombuffer(time, dtype=np.int32).copy(),
+                latitude=np.frombuffer(latitude, dtype=np.float64).copy(),
+                longitude=np.frombuffer(longitude, dtype=np.float64).copy(),
+                validity=np.frombuffer(validity, dtype=np.int8).astype(np.bool_),
+                pressure_altitude=np.frombuffer(pressure_altitude, dtype=np.int32).copy(),
+                gnss_altitude=np.frombuffer(gnss_altitude, dtype=np.int32).copy(),
+            )
+        )
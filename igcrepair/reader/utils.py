@@ -1,25 +1,56 @@
 import operator
 from functools import reduce
-from typing import Union
+from typing import Optional, Union
+
+
+Bytes = Union[bytes, bytearray, memoryview]
+RecordString = Union[str, Bytes]
 
 
 class RecordError(ValueError):
-    ...
+
+    # Номер (с 0) строки в векторно декодируемом наборе B-записей, в которой найдена ошибка. По нему вызывающий код,
+    # знающий смещения строк, может найти номер строки файла.
+    row: Optional[int] = None
 
 
 class RecordFieldError(ValueError):
-    ...
+
+    # Имя класса поля, при разборе которого возникла ошибка. Заполняется в record2field.
+    field: Optional[str] = None
+    # См. RecordError.row.
+    row: Optional[int] = None
 
 
-def record2field(record: str, obj, *idx: Union[int, slice], **kwargs):
+def record2string(record: RecordString, *idx: Union[int, slice]) -> str:
     """
+    Вырезает значение поля из записи. Запись может быть строкой или байтами (например, memoryview над mmap), в
+    последнем случае декодируется только вырезанная часть.
     :param record:
-    :param obj:
+    :param idx:
     :return:
     """
+    if isinstance(record, (bytes, bytearray, memoryview)):
+        idx = tuple(slice(i, i + 1 or None) if isinstance(i, int) else i for i in idx)
+        return b''.join(bytes(record[i]) for i in idx).decode('utf-8', errors='replace')
+
     field_value = operator.itemgetter(*idx)(record)
 
     if isinstance(field_value, tuple):
         field_value = reduce(operator.add, field_value)
 
-    return obj.from_string(field_value, **kwargs)
+    return field_value
+
+
+def record2field(record: RecordString, obj, *idx: Union[int, slice], **kwargs):
+    """
+    :param record:
+    :param obj:
+    :return:
+    """
+    try:
+        return obj.from_string(record2string(record, *idx), **kwargs)
+    except RecordFieldError as error:
+        if error.field is None:
+            error.field = getattr(obj, '__name__', None)
+        raise
@@ -0,0 +1,170 @@
+import mmap
+import os
+from typing import Dict, List, Optional, Tuple, Type, Union
+
+import numpy as np
+
+from igcrepair.reader.batch import Buffer, Fixes, decode_rows_with_masks, split_lines
+from igcrepair.reader.constants import B_RECORD_LENGTH
+from igcrepair.reader.fields import (
+    RecordField,
+    RecordLiteral,
+    TimeUTC,
+    Latitude,
+    Longitude,
+    Validity,
+    PressureAltitude,
+    GNSSAltitude,
+)
+from igcrepair.reader.records import IRecord, BRecord
+from igcrepair.reader.stream import IGCReader, RECORDS
+from igcrepair.reader.utils import RecordError, RecordFieldError
+
+
+_LF: int = ord('\n')
+
+# Причины ошибок векторной проверки B-записей. Там, где это возможно, совпадают с сообщениями классов полей.
+B_RECORD_REASONS: Dict[Type[RecordField], str] = {
+    RecordLiteral: 'Формат поля RecordLiteral не соответствует формату {0}.'.format(RecordLiteral.STRING_PATTERN),
+    TimeUTC: 'Формат даты для поля TimeUTC не соответствует формату {0}.'.format(TimeUTC.TIME_FORMAT),
+    Latitude: 'Неправильный формат широты или значение вне промежутка.',
+    Longitude: 'Неправильный формат долготы или значение вне промежутка.',
+    Validity: 'Формат поля Validity не соответствует формату {0}.'.format(Validity.STRING_PATTERN),
+    PressureAltitude: 'Формат поля PressureAltitude не соответствует формату {0}.'.format(
+        PressureAltitude.STRING_PATTERN
+    ),
+    GNSSAltitude: 'Формат поля GNSSAltitude не соответствует формату {0}.'.format(GNSSAltitude.STRING_PATTERN),
+}
+
+
+class _Errors:
+    """
+    Накопитель ошибок блоками: номера строк хранятся массивом, остальные колонки одинаковы для всего блока.
+    """
+
+    def __init__(self) -> None:
+        self.chunks: List[Tuple[np.ndarray, str, str, str]] = []
+
+    def add(self, lines: Union[np.ndarray, int], record_type: str, field: str, reason: str) -> None:
+        lines = np.atleast_1d(np.asarray(lines, dtype=np.int64))
+        if lines.size:
+            self.chunks.append((lines, record_type, field, reason))
+
+    def table(self) -> np.ndarray:
+        field_length = max([1] + [len(field) for _, _, field, _ in self.chunks])
+        reason_length = max([1] + [len(reason) for _, _, _, reason in self.chunks])
+        table = np.empty(
+            sum(lines.size for lines, _, _, _ in self.chunks),
+            dtype=[
+                ('line', np.int64),
+                ('record_type', 'U1'),
+                ('field', 'U{0}'.format(field_length)),
+                ('reason', 'U{0}'.format(reason_length)),
+            ],
+        )
+        position = 0
+        for lines, record_type, field, reason in self.chunks:
+            rows = table[position:position + lines.size]
+            rows['line'] = lines
+            rows['record_type'] = record_type
+            rows['field'] = field
+            rows['reason'] = reason
+            position += lines.size
+        return table[np.argsort(table['line'], kind='stable')]
+
+
+def validate_buffer(buffer: Buffer) -> np.ndarray:
+    """
+    Проверяет все записи файла, не выбрасывая исключений. B-записи проверяются векторно по тем же правилам, что и
+    классы полей; остальные записи (их в файле немного) разбираются построчно.
+    :param buffer: Содержимое IGC-файла.
+    :return: Структурированный массив ошибок с колонками line (номер строки, начиная с 1), record_type, field
+             (имя класса поля или записи) и reason, отсортированный по номеру строки. Пустой, если ошибок нет.
+    """
+    return validate_and_decode(buffer)[0]
+
+
+def validate_and_decode(buffer: Buffer) -> Tuple[np.ndarray, Fixes, Optional[IRecord]]:
+    """
+    Проверяет файл и за тот же проход декодирует B-записи.
+    :param buffer: Содержимое IGC-файла.
+    :return: Таблица ошибок (см. validate_buffer), колонки B-записей без ошибок в основной части и последняя
+             корректная I-запись файла.
+    """
+    errors = _Errors()
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    starts, lengths = split_lines(data)
+    line_numbers = np.searchsorted(np.flatnonzero(data == _LF), starts) + 1
+    literals = data[starts]
+    literals = np.where((literals >= ord('a')) & (literals <= ord('z')), literals - 0x20, literals)
+    is_b = literals == ord('B')
+
+    reader = IGCReader(())
+    # I-записи в порядке файла и номера строк, с которых они действуют: дополнения B-записи проверяются по
+    # последней корректной I-записи перед ней.
+    i_records: List[IRecord] = []
+    i_record_starts: List[int] = []
+    for index in np.flatnonzero(~is_b):
+        line = bytes(data[starts[index]:starts[index] + lengths[index]]).decode('utf-8', errors='replace')
+        try:
+            reader.parse_line(line)
+            if reader.i_record is not None and (not i_records or reader.i_record is not i_records[-1]):
+                i_records.append(reader.i_record)
+                i_record_starts.append(index)
+        except RecordFieldError as error:
+            errors.add(line_numbers[index], line[0], error.field or '', str(error))
+        except RecordError as error:
+            record_class = RECORDS.get(line[0].upper())
+            errors.add(line_numbers[index], line[0], record_class.__name__ if record_class else '', str(error))
+
+    b_index = np.flatnonzero(is_b)
+    short = lengths[b_index] < B_RECORD_LENGTH
+    errors.add(
+        line_numbers[b_index[short]],
+        BRecord.RECORD_TYPE.value,
+        BRecord.__name__,
+        'Длина записи "B" должна быть не меньше {0}.'.format(B_RECORD_LENGTH),
+    )
+
+    b_index = b_index[~short]
+    rows = data[starts[b_index][:, None] + np.arange(B_RECORD_LENGTH)]
+    fixes, masks = decode_rows_with_masks(rows)
+    for field, mask in masks.items():
+        errors.add(line_numbers[b_index[~mask]], BRecord.RECORD_TYPE.value, field.__name__, B_RECORD_REASONS[field])
+    if masks:
+        valid = np.logical_and.reduce(list(masks.values()))
+        fixes = Fixes(*(column[valid] for column in fixes))
+
+    layouts = np.searchsorted(i_record_starts, b_index) - 1
+    for layout, i_record in enumerate(i_records):
+        layout_index = b_index[layouts == layout]
+        for extension in i_record.extensions:
+            outside = lengths[layout_index] < extension.finish.value
+            errors.add(
+                line_numbers[layout_index[outside]],
+                BRecord.RECORD_TYPE.value,
+                'Extension',
+                'Дополнение {0} выходит за пределы записи.'.format(extension.subtype),
+            )
+
+    return errors.table(), fixes, reader.i_record
+
+
+def validate_file(path: Union[str, os.PathLike]) -> np.ndarray:
+    """
+    :param path: Путь к IGC-файлу. Файл читается через mmap.
+    :return: См. validate_buffer.
+    """
+    return validate_and_decode_file(path)[0]
+
+
+def validate_and_decode_file(path: Union[str, os.PathLike]) -> Tuple[np.ndarray, Fixes, Optional[IRecord]]:
+    """
+    :param path: Путь к IGC-файлу. Файл читается через mmap.
+    :return: См. validate_and_decode.
+    """
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return validate_and_decode(b'')
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return validate_and_decode(buffer)
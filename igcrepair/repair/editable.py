@@ -0,0 +1,338 @@
+"""
+Редактируемый трек поверх исходного буфера IGC-файла. Изменения полей отмечают только свои строки, при сохранении
+заново сериализуются и проверяются только они, поэтому несколько правок файла из десятков тысяч точек стоят O(правок),
+а не O(файла).
+"""
+import functools
+import os
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from igcrepair.reader.batch import split_lines
+from igcrepair.reader.fields import RecordField
+from igcrepair.reader.lazy import B_RECORD_FIELDS
+from igcrepair.reader.records import IRecord, BRecord
+from igcrepair.reader.utils import RecordError, RecordFieldError
+
+
+Path = Union[str, os.PathLike]
+
+_B = (ord('B'), ord('b'))
+_I = (ord('I'), ord('i'))
+
+
+def _slots(cls: type) -> Iterator[str]:
+    for klass in cls.__mro__:
+        slots = getattr(klass, '__slots__', ())
+        yield from (slots,) if isinstance(slots, str) else slots
+
+
+@functools.lru_cache(maxsize=None)
+def _tracked_class(cls: type) -> type:
+    """
+    Подкласс поля, который после любого присваивания атрибута (в том числе через проверяющие сеттеры value и dd)
+    отмечает свою строку в треке. Имя класса сохраняется, чтобы не менялись сообщения об ошибках.
+    """
+    def __setattr__(self, name: str, value) -> None:
+        cls.__setattr__(self, name, value)
+        # До привязки к треку (в __init__) слот _track не заполнен.
+        track = getattr(self, '_track', None)
+        if track is not None:
+            track.mark(self._line)
+
+    return type(cls)(cls.__name__, (cls,), {
+        '__slots__': ('_track', '_line'),
+        '__setattr__': __setattr__,
+        '__qualname__': cls.__qualname__,
+        '__module__': cls.__module__,
+    })
+
+
+def _track_field(field, track: 'EditableTrack', line: int):
+    """
+    :return: Копия поля, привязанная к строке трека. Общие экземпляры InternedField тоже копируются: копия не хранится
+             в кэше класса, поэтому ее значение можно изменить сеттером.
+    """
+    if not isinstance(field, RecordField):
+        return field
+    tracked_class = _tracked_class(type(field))
+    tracked = tracked_class.__new__(tracked_class)
+    for slot in _slots(type(field)):
+        if hasattr(field, slot):
+            object.__setattr__(tracked, slot, getattr(field, slot))
+    object.__setattr__(tracked, '_track', track)
+    object.__setattr__(tracked, '_line', line)
+    return tracked
+
+
+def _extension_required(subtype: str) -> RecordFieldError:
+    error = RecordFieldError('Дополнение {0} описано в I-записи, его нельзя удалить из B-записи.'.format(subtype))
+    error.field = subtype
+    return error
+
+
+class _TrackedExtensions(dict):
+    """
+    Значения дополнений B-записи. Присваивание значения отмечает строку в треке. Удалить дополнение нельзя: его
+    место в строке описывает I-запись.
+    """
+
+    __slots__ = ('_track', '_line')
+
+    def __init__(self, values: Dict[str, str], track: 'EditableTrack', line: int) -> None:
+        super().__init__(values)
+        self._track: 'EditableTrack' = track
+        self._line: int = line
+
+    def __setitem__(self, key: str, value: str) -> None:
+        super().__setitem__(key, value)
+        self._track.mark(self._line)
+
+    def __delitem__(self, key: str) -> None:
+        raise _extension_required(key)
+
+    def pop(self, key: str, *default):
+        raise _extension_required(key)
+
+    def popitem(self):
+        if not self:
+            return super().popitem()
+        raise _extension_required(next(reversed(self)))
+
+    def clear(self) -> None:
+        if self:
+            raise _extension_required(next(iter(self)))
+
+
+class _TrackedBRecord(BRecord):
+    """
+    B-запись трека. Присваивание поля целиком отмечает строку; присвоенное поле копируется и тоже отслеживается.
+    """
+
+    __slots__ = ('_track', '_line')
+
+    def __setattr__(self, name: str, value) -> None:
+        track = getattr(self, '_track', None)
+        if track is None or name.startswith('_'):
+            super().__setattr__(name, value)
+            return
+        if isinstance(value, dict):
+            value = _TrackedExtensions(value, track, self._line)
+        else:
+            value = _track_field(value, track, self._line)
+        super().__setattr__(name, value)
+        track.mark(self._line)
+
+    @classmethod
+    def tracked(cls, record: BRecord, track: 'EditableTrack', line: int) -> '_TrackedBRecord':
+        tracked = cls.__new__(cls)
+        for slot in BRecord.__slots__:
+            value = getattr(record, slot)
+            if slot == 'extensions':
+                value = _TrackedExtensions(value, track, line)
+            else:
+                value = _track_field(value, track, line)
+            object.__setattr__(tracked, slot, value)
+        object.__setattr__(tracked, '_track', track)
+        object.__setattr__(tracked, '_line', line)
+        return tracked
+
+
+class EditableTrack:
+    """
+    B-записи IGC-файла, доступные для изменения. Записи разбираются только при обращении (track[i]) и изменяются
+    через обычные поля и их сеттеры:
+
+        track = EditableTrack.open(path)
+        track[10].latitude.dd = 54.1
+        track[11].pressure_altitude.value = 350
+        track.save()
+
+    Измененные строки заново сериализуются, проверяются разбором и вписываются в исходный буфер. Если длина строк не
+    изменилась, при сохранении в исходный файл перезаписываются только они.
+    """
+
+    def __init__(self, data: Union[bytes, bytearray], path: Optional[Path] = None, encoding: str = 'utf-8') -> None:
+        """
+        :param data: Содержимое IGC-файла.
+        :param path: Путь к файлу, в который по умолчанию сохраняются изменения. Первое сохранение записывает файл
+                     целиком: data может не совпадать с его содержимым.
+        :param encoding: Кодировка записей.
+        """
+        self.data: bytearray = bytearray(data)
+        self.path: Optional[Path] = path
+        self.encoding: str = encoding
+
+        buffer = np.frombuffer(self.data, dtype=np.uint8)
+        starts, lengths = split_lines(buffer)
+        literals = buffer[starts]
+        del buffer
+        i_lines = np.flatnonzero(np.isin(literals, _I))
+        self.i_record: Optional[IRecord] = (
+            IRecord.from_string(self._line(starts[i_lines[0]], lengths[i_lines[0]])) if i_lines.size else None
+        )
+        is_b = np.isin(literals, _B)
+        self.starts: np.ndarray = starts[is_b]
+        self.lengths: np.ndarray = lengths[is_b]
+
+        self._records: Dict[int, _TrackedBRecord] = {}
+        self._dirty: set = set()
+        # Совпадает ли data с содержимым файла path: только тогда файл можно исправлять на месте. Переданный буфер
+        # может отличаться от файла, это гарантирует только open.
+        self._synced: bool = False
+
+    @classmethod
+    def open(cls, path: Path, encoding: str = 'utf-8') -> 'EditableTrack':
+        with open(path, 'rb') as file:
+            track = cls(file.read(), path, encoding)
+        track._synced = True
+        return track
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, i: int) -> BRecord:
+        """
+        :param i: Номер B-записи.
+        :return: B-запись, изменения которой отмечают ее строку. Для одного номера возвращается один и тот же объект.
+        """
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('Номер B-записи {0} вне трека длины {1}.'.format(i, len(self)))
+        record = self._records.get(i)
+        if record is None:
+            line = self._line(self.starts[i], self.lengths[i])
+            try:
+                parsed = BRecord.from_string(line, self.i_record)
+            except (RecordError, RecordFieldError) as error:
+                raise self._line_error(error, i) from error
+            record = self._records[i] = _TrackedBRecord.tracked(parsed, self, i)
+        return record
+
+    def _line(self, start: int, length: int) -> str:
+        return self.data[start:start + length].decode(self.encoding, errors='replace')
+
+    def _line_error(self, error: Exception, i: int) -> Exception:
+        line_number = self.data.count(b'\n', 0, int(self.starts[i])) + 1
+        line_error = type(error)('Строка {0}: {1}'.format(line_number, error))
+        if isinstance(error, RecordFieldError):
+            line_error.field = error.field
+        return line_error
+
+    def mark(self, i: int) -> None:
+        """
+        Отмечает B-запись как измененную. Поля записей, полученных через track[i], делают это сами; явный вызов нужен,
+        только если запись изменена в обход полей.
+        """
+        self._dirty.add(i)
+
+    @property
+    def dirty(self) -> List[int]:
+        return sorted(self._dirty)
+
+    def dirty_ranges(self) -> List[Tuple[int, int]]:
+        """
+        :return: Полуоткрытые промежутки [start, stop) номеров измененных B-записей.
+        """
+        ranges: List[Tuple[int, int]] = []
+        for i in self.dirty:
+            if ranges and ranges[-1][1] == i:
+                ranges[-1] = (ranges[-1][0], i + 1)
+            else:
+                ranges.append((i, i + 1))
+        return ranges
+
+    def _serialize(self, i: int) -> bytes:
+        """
+        Вписывает в исходную строку только поля, значения которых отличаются от разобранных из нее, и проверяет
+        результат разбором, как при чтении файла. Остальные байты строки, в том числе не описанные в I-записи,
+        сохраняются как есть.
+        """
+        record = self._records[i]
+        start, length = int(self.starts[i]), int(self.lengths[i])
+        line = bytearray(self.data[start:start + length])
+        try:
+            original = BRecord.from_string(line.decode(self.encoding, errors='replace'), self.i_record)
+            splices = [
+                (field, str(getattr(record, name)), str(getattr(original, name)))
+                for name, (_, field) in B_RECORD_FIELDS.items()
+            ]
+            positions = {
+                extension.subtype.value: extension.field
+                for extension in (self.i_record.extensions if self.i_record is not None else ())
+            }
+            # Дополнения, не описанные в I-записи, дописываются в конец строки, как в BRecord.__str__.
+            appended = ''
+            # Словарь дополнений можно заменить целиком, в том числе без части описанных.
+            missing = sorted(positions.keys() - record.extensions.keys())
+            if missing:
+                raise _extension_required(missing[0])
+            for subtype, value in record.extensions.items():
+                if subtype in positions:
+                    splices.append((positions[subtype], value, original.extensions.get(subtype)))
+                else:
+                    appended += value
+            # С конца строки, чтобы изменение длины дополнения не сдвигало положения предыдущих полей.
+            for field, value, previous in sorted(splices, key=lambda splice: splice[0].start, reverse=True):
+                if value != previous:
+                    line[field] = value.encode(self.encoding)
+            line += appended.encode(self.encoding)
+            BRecord.from_string(line.decode(self.encoding, errors='replace'), self.i_record)
+        except (RecordError, RecordFieldError) as error:
+            raise self._line_error(error, i) from error
+        return bytes(line)
+
+    def patch(self) -> List[Tuple[int, int, bytes]]:
+        """
+        Вписывает измененные строки в буфер data и снимает отметки.
+        :return: Исходное смещение, исходная длина и новое содержимое каждой измененной строки.
+        """
+        dirty = [i for i in self.dirty if i in self._records]
+        patches = [(int(self.starts[i]), int(self.lengths[i]), self._serialize(i)) for i in dirty]
+        if all(length == len(line) for _, length, line in patches):
+            for start, length, line in patches:
+                self.data[start:start + length] = line
+        else:
+            # Длина части строк изменилась: буфер собирается заново, смещения следующих строк сдвигаются.
+            pieces, position = [], 0
+            for start, length, line in patches:
+                pieces += [self.data[position:start], line]
+                position = start + length
+            pieces.append(self.data[position:])
+            self.data = bytearray().join(pieces)
+            self._synced = False
+
+            shifts = np.zeros(len(self), dtype=np.int64)
+            for i, (_, length, line) in zip(dirty, patches):
+                shifts[i] = len(line) - length
+                self.lengths[i] = len(line)
+            self.starts += np.concatenate(([0], np.cumsum(shifts)[:-1]))
+        if patches:
+            self._synced = False
+        self._dirty.clear()
+        return patches
+
+    def save(self, path: Optional[Path] = None) -> None:
+        """
+        :param path: Путь к результату. По умолчанию - исходный файл. Если он не менялся с открытия или прошлого
+                     сохранения, а длина измененных строк осталась прежней, в нем перезаписываются только эти строки,
+                     иначе файл записывается целиком.
+        """
+        if path is None:
+            path = self.path
+        if path is None:
+            raise ValueError('Не указан путь для сохранения трека.')
+        in_place = self._synced and self.path is not None and os.fspath(path) == os.fspath(self.path)
+        patches = self.patch()
+        if in_place and all(length == len(line) for _, length, line in patches):
+            with open(path, 'r+b') as file:
+                for start, _, line in patches:
+                    file.seek(start)
+                    file.write(line)
+        else:
+            with open(path, 'wb') as file:
+                file.write(self.data)
+        if self.path is not None and os.fspath(path) == os.fspath(self.path):
+            self._synced = True
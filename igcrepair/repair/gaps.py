@@ -0,0 +1,256 @@
+"""
+Восстановление пропусков в B-записях. Во время потери GPS регистратор продолжает писать точки с признаком V, часто
+повторяя последние широту и долготу (см. Validity), а иногда перестает писать точки совсем. Такие участки находятся
+векторно по колонкам Fixes и заполняются интерполяцией между ближайшими достоверными точками.
+"""
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from igcrepair.reader.batch import Fixes
+from igcrepair.reader.fields import Coordinates, PressureAltitude, GNSSAltitude, round_array
+from igcrepair.repair.geo import distance, wrap_longitude
+
+
+LINEAR: str = 'linear'
+# Кубический эрмитов сплайн с касательными по соседним опорным точкам.
+SPLINE: str = 'spline'
+METHODS: Tuple[str, ...] = (LINEAR, SPLINE)
+
+# Участки длиннее, секунды, не заполняются: прямая или сплайн на таком промежутке не похожи на траекторию.
+MAX_GAP: int = 600
+SECONDS_PER_DAY: int = 24 * 3600
+
+SEGMENT_DTYPE: np.dtype = np.dtype([
+    ('start', np.int64),  # номер первой измененной или вставленной точки в результате
+    ('stop', np.int64),  # номер точки после последней
+    ('time', np.int32),  # время опорной точки перед участком, секунды с начала суток UTC
+    ('duration', np.int64),  # время между опорными точками, секунды
+    ('invalid', np.int64),  # точек с признаком V
+    ('repeated', np.int64),  # точек с признаком A, повторяющих координаты предыдущей
+    ('inserted', np.int64),  # вставлено точек в пропуски по времени
+    ('max_shift', np.float64),  # наибольшее смещение существующей точки, метры
+    ('filled', np.bool_),  # False, если участок длиннее max_gap и оставлен без изменений
+])
+
+
+class GapRepair(NamedTuple):
+    """
+    Результат repair_gaps.
+    """
+
+    fixes: Fixes
+    extensions: Dict[str, np.ndarray]  # дополнения; вставленные точки повторяют значения предыдущей
+    source: np.ndarray  # номер исходной точки для каждой точки результата, -1 для вставленных
+    segments: np.ndarray  # отчет по участкам, см. SEGMENT_DTYPE
+
+
+def estimate_interval(time: np.ndarray) -> int:
+    """
+    :param time: Секунды с начала суток.
+    :return: Медианный положительный шаг записи точек, секунды.
+    """
+    steps = np.diff(np.asarray(time, dtype=np.int64)) % SECONDS_PER_DAY
+    steps = steps[steps > 0]
+    return max(int(np.median(steps)), 1) if steps.size else 1
+
+
+def find_bad_fixes(fixes: Fixes, repeated: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    :param fixes:
+    :param repeated: Считать ли недостоверными точки, повторяющие координаты предыдущей.
+    :return: Маски точек с признаком V и точек с повторенными координатами.
+    """
+    invalid = ~np.asarray(fixes.validity, dtype=bool)
+    same = np.zeros(len(invalid), dtype=bool)
+    if repeated and len(invalid) > 1:
+        same[1:] = (fixes.latitude[1:] == fixes.latitude[:-1]) & (fixes.longitude[1:] == fixes.longitude[:-1])
+    return invalid, same
+
+
+def _interpolate(x: np.ndarray, x_anchors: np.ndarray, y_anchors: np.ndarray, method: str) -> np.ndarray:
+    """
+    :param x: Точки, лежащие между первой и последней опорными.
+    :param x_anchors: Возрастающие абсциссы опорных точек.
+    :param y_anchors:
+    :param method: LINEAR или SPLINE.
+    :return:
+    """
+    if method == LINEAR or len(x_anchors) < 3:
+        return np.interp(x, x_anchors, y_anchors)
+
+    x_anchors = x_anchors.astype(np.float64)
+    intervals = np.diff(x_anchors)
+    secants = np.diff(y_anchors) / intervals
+    # Производная параболы через три соседние опорные точки: точна для квадратичных участков при любом шаге.
+    slopes = np.empty(len(x_anchors))
+    slopes[1:-1] = (intervals[1:] * secants[:-1] + intervals[:-1] * secants[1:]) / (intervals[:-1] + intervals[1:])
+    slopes[0], slopes[-1] = secants[0], secants[-1]
+
+    k = np.clip(np.searchsorted(x_anchors, x, side='right') - 1, 0, len(x_anchors) - 2)
+    h = x_anchors[k + 1] - x_anchors[k]
+    t = (x - x_anchors[k]) / h
+    t2, t3 = t * t, t * t * t
+    return (
+        (2 * t3 - 3 * t2 + 1) * y_anchors[k]
+        + (t3 - 2 * t2 + t) * h * slopes[k]
+        + (-2 * t3 + 3 * t2) * y_anchors[k + 1]
+        + (t3 - t2) * h * slopes[k + 1]
+    )
+
+
+def repair_gaps(
+    fixes: Fixes,
+    extensions: Optional[Dict[str, np.ndarray]] = None,
+    method: str = LINEAR,
+    interval: Optional[int] = None,
+    max_gap: int = MAX_GAP,
+    repeated: bool = True,
+) -> GapRepair:
+    """
+    Заполняет участки из точек с признаком V или повторенными координатами и пропуски по времени. Широта и долгота
+    интерполируются по времени между достоверными точками до и после участка. Барометрическая высота во время потери
+    GPS продолжает записываться, поэтому GNSS-высота восстанавливается как барометрическая плюс интерполированная
+    разность высот опорных точек. У вставленных точек барометрическая высота тоже интерполируется, признак
+    достоверности - V. Участки в начале и в конце трека, у которых нет опорной точки с одной из сторон, не изменяются.
+
+    Время должно строго возрастать; один переход через полночь допускается.
+    :param fixes: Колонки B-записей.
+    :param extensions: Необработанные значения дополнений (см. BRecordLayout.decode_lines).
+    :param method: LINEAR или SPLINE.
+    :param interval: Шаг записи точек, секунды. По умолчанию оценивается по треку (estimate_interval). Промежутки между
+                     соседними точками больше шага заполняются вставленными точками с этим шагом.
+    :param max_gap: Участки, у которых время между опорными точками больше, секунды, не заполняются.
+    :param repeated: Считать ли недостоверными точки, повторяющие координаты предыдущей.
+    :return:
+    """
+    if method not in METHODS:
+        raise ValueError('Неизвестный способ интерполяции "{0}". Допустимы {1}.'.format(method, ', '.join(METHODS)))
+    extensions = extensions or {}
+    if interval is None:
+        interval = estimate_interval(fixes.time)
+
+    n_fixes = len(fixes.time)
+    if not n_fixes:
+        return GapRepair(fixes, dict(extensions), np.empty(0, dtype=np.int64), np.zeros(0, dtype=SEGMENT_DTYPE))
+    steps = np.diff(np.asarray(fixes.time, dtype=np.int64)) % SECONDS_PER_DAY
+    elapsed = np.concatenate(([0], np.cumsum(steps)))
+    invalid, same = find_bad_fixes(fixes, repeated)
+    bad = invalid | same
+    good = np.flatnonzero(~bad)
+
+    # Участок - промежуток между соседними достоверными точками a и b, внутри которого есть недостоверные точки или
+    # пропуск по времени.
+    a, b = good[:-1], good[1:]
+    is_gap = steps > interval
+    gaps_before = np.concatenate(([0], np.cumsum(is_gap)))
+    has_segment = (b - a > 1) | (gaps_before[b] > gaps_before[a])
+    a, b = a[has_segment], b[has_segment]
+    duration = elapsed[b] - elapsed[a]
+    filled = duration <= max_gap
+
+    # Точка или пропуск после нее принадлежат участку, если лежат между его опорными точками: a <= j < b.
+    index = np.arange(n_fixes)
+    owner = np.searchsorted(a, index, side='right') - 1
+    member = owner >= 0
+    member[member] = index[member] < b[owner[member]]
+    in_filled = member.copy()
+    in_filled[member] = filled[owner[member]]
+    repaired = bad & in_filled
+    gap_filled = is_gap & in_filled[:-1]
+
+    # Вставленные точки: по n_inserted после точки j с шагом interval.
+    n_inserted = np.where(gap_filled, (steps - 1) // interval, 0)
+    total = int(n_inserted.sum())
+    inserted_before = np.concatenate(([0], np.cumsum(n_inserted)))
+    position = index + inserted_before[:n_fixes]
+    size = n_fixes + total
+
+    source = np.full(size, -1, dtype=np.int64)
+    source[position] = index
+    new_rows = np.flatnonzero(source < 0)
+    after = np.repeat(index[:-1], n_inserted)
+    step_number = np.arange(total) - np.repeat(inserted_before[:-1], n_inserted) + 1
+    x = np.empty(size, dtype=np.int64)
+    x[position] = elapsed
+    x[new_rows] = elapsed[after] + step_number * interval
+
+    time = (int(fixes.time[0]) + x) % SECONDS_PER_DAY
+    latitude = np.empty(size)
+    longitude = np.empty(size)
+    latitude[position] = fixes.latitude
+    longitude[position] = fixes.longitude
+    validity = np.zeros(size, dtype=bool)
+    validity[position] = fixes.validity
+    pressure_altitude = np.empty(size, dtype=np.int32)
+    pressure_altitude[position] = fixes.pressure_altitude
+    gnss_altitude = np.empty(size, dtype=np.int32)
+    gnss_altitude[position] = fixes.gnss_altitude
+
+    targets = np.sort(np.concatenate((position[repaired], new_rows)))
+    if targets.size:
+        x_anchors = elapsed[good].astype(np.float64)
+        x_targets = x[targets].astype(np.float64)
+        latitude[targets] = round_array(
+            _interpolate(x_targets, x_anchors, fixes.latitude[good], method), Coordinates.N_DIGITS
+        )
+        longitude[targets] = round_array(
+            wrap_longitude(_interpolate(x_targets, x_anchors, np.unwrap(fixes.longitude[good], period=360.), method)),
+            Coordinates.N_DIGITS,
+        )
+        pressure_altitude[new_rows] = np.clip(
+            np.rint(_interpolate(x[new_rows].astype(np.float64), x_anchors, fixes.pressure_altitude[good], method)),
+            *PressureAltitude.BOUNDS,
+        )
+        offset = fixes.gnss_altitude[good].astype(np.float64) - fixes.pressure_altitude[good]
+        gnss_altitude[targets] = np.clip(
+            np.rint(pressure_altitude[targets] + _interpolate(x_targets, x_anchors, offset, method)),
+            *GNSSAltitude.BOUNDS,
+        )
+
+    result = Fixes(time.astype(np.int32), latitude, longitude, validity, pressure_altitude, gnss_altitude)
+    carried = source.copy()
+    carried[new_rows] = after
+    return GapRepair(
+        fixes=result,
+        extensions={subtype: np.asarray(values)[carried] for subtype, values in extensions.items()},
+        source=source,
+        segments=_segments(fixes, result, a, b, position, duration, filled, invalid & member, same & member, repaired),
+    )
+
+
+def _segments(
+    fixes: Fixes,
+    result: Fixes,
+    a: np.ndarray,
+    b: np.ndarray,
+    position: np.ndarray,
+    duration: np.ndarray,
+    filled: np.ndarray,
+    invalid: np.ndarray,
+    same: np.ndarray,
+    repaired: np.ndarray,
+) -> np.ndarray:
+    segments = np.zeros(len(a), dtype=SEGMENT_DTYPE)
+    if not len(a):
+        return segments
+    segments['start'] = position[a] + 1
+    segments['stop'] = position[b]
+    segments['time'] = fixes.time[a]
+    segments['duration'] = duration
+    segments['filled'] = filled
+    segments['inserted'] = (position[b] - position[a]) - (b - a)
+
+    invalid_before = np.concatenate(([0], np.cumsum(invalid)))
+    same_before = np.concatenate(([0], np.cumsum(same & ~invalid)))
+    segments['invalid'] = invalid_before[b] - invalid_before[a]
+    segments['repeated'] = same_before[b] - same_before[a]
+
+    shift = np.zeros(len(fixes.time))
+    moved = position[repaired]
+    shift[repaired] = distance(
+        fixes.latitude[repaired], fixes.longitude[repaired], result.latitude[moved], result.longitude[moved]
+    )
+    # reduceat берет максимум по [a[i], a[i + 1]): у точек между участками смещение нулевое.
+    segments['max_shift'] = np.maximum.reduceat(shift, a)
+    return segments
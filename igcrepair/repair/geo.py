@@ -0,0 +1,34 @@
+import numpy as np
+
+
+# Средний радиус Земли, метры.
+EARTH_RADIUS: float = 6_371_000.
+
+
+def distance(
+    latitude_1: np.ndarray,
+    longitude_1: np.ndarray,
+    latitude_2: np.ndarray,
+    longitude_2: np.ndarray,
+) -> np.ndarray:
+    """
+    Расстояние по большому кругу (формула гаверсинусов).
+    :param latitude_1: Десятичные градусы.
+    :param longitude_1:
+    :param latitude_2:
+    :param longitude_2:
+    :return: Метры.
+    """
+    phi_1, phi_2 = np.radians(latitude_1), np.radians(latitude_2)
+    d_phi = phi_2 - phi_1
+    d_lambda = np.radians(np.subtract(longitude_2, longitude_1))
+    a = np.sin(d_phi / 2) ** 2 + np.cos(phi_1) * np.cos(phi_2) * np.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.clip(a, 0., 1.)))
+
+
+def wrap_longitude(longitude: np.ndarray) -> np.ndarray:
+    """
+    :param longitude: Долгота, возможно развернутая через np.unwrap.
+    :return: Долгота в промежутке [-180; 180).
+    """
+    return (np.asarray(longitude) + 180.) % 360. - 180.
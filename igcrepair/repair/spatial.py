@@ -0,0 +1,265 @@
+"""
+Пространственный индекс точек трека для запросов "какие точки лежат в радиусе R от точки", "какие точки лежат в
+прямоугольнике" и "какая точка ближе всего". Точки раскладываются по ячейкам равноугольной сетки; номера точек хранятся
+отсортированными по номеру ячейки, поэтому ячейки одного ряда сетки - непрерывный участок, который находится двоичным
+поиском. Кандидаты из ячеек затем проверяются точно.
+
+Индекс можно наполнять по мере чтения файла (append, extend): новые точки сначала попадают в неотсортированный хвост,
+который проверяется перебором и сливается с отсортированной частью, когда становится больше ее доли.
+"""
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+from igcrepair.reader.batch import Fixes
+from igcrepair.repair.geo import EARTH_RADIUS, distance
+
+
+# Размер ячейки по умолчанию, градусы (около 1 км по широте).
+CELL: float = 0.01
+# Хвост сливается с отсортированной частью, когда становится больше MERGE_FRACTION от нее, но не раньше MIN_TAIL точек.
+MERGE_FRACTION: float = 0.25
+MIN_TAIL: int = 1024
+INITIAL_CAPACITY: int = 1024
+
+
+class SpatialIndex:
+    """
+    Сеточный индекс по колонкам широты и долготы и индекс по времени. Запросы возвращают возрастающие номера точек в
+    порядке добавления.
+    """
+
+    __slots__ = ('cell', 'n_rows', 'n_columns', '_latitude', '_longitude', '_time', '_keys', '_size', '_n_sorted',
+                 '_order', '_sorted_keys', '_time_order', '_sorted_time')
+
+    def __init__(self, cell: float = CELL) -> None:
+        """
+        :param cell: Размер ячейки сетки, градусы. Чем ближе он к радиусу типичного запроса, тем меньше кандидатов.
+        """
+        if not 0 < cell <= 180:
+            raise ValueError('Размер ячейки должен быть в промежутке (0; 180]. Передано {0}.'.format(cell))
+        self.cell: float = cell
+        self.n_rows: int = math.ceil(180 / cell) + 1
+        self.n_columns: int = math.ceil(360 / cell)
+        self._latitude: np.ndarray = np.empty(INITIAL_CAPACITY)
+        self._longitude: np.ndarray = np.empty(INITIAL_CAPACITY)
+        self._time: np.ndarray = np.empty(INITIAL_CAPACITY, dtype=np.int64)
+        self._keys: np.ndarray = np.empty(INITIAL_CAPACITY, dtype=np.int64)
+        self._size: int = 0
+        # Первые _n_sorted точек отсортированы по ячейкам: _order - их номера, _sorted_keys - ячейки.
+        self._n_sorted: int = 0
+        self._order: np.ndarray = np.empty(0, dtype=np.int64)
+        self._sorted_keys: np.ndarray = np.empty(0, dtype=np.int64)
+        # Номера точек, упорядоченные по времени; None, пока не понадобятся после добавления точек.
+        self._time_order: Optional[np.ndarray] = np.empty(0, dtype=np.int64)
+        self._sorted_time: np.ndarray = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def latitude(self) -> np.ndarray:
+        return self._latitude[:self._size]
+
+    @property
+    def longitude(self) -> np.ndarray:
+        return self._longitude[:self._size]
+
+    @property
+    def time(self) -> np.ndarray:
+        return self._time[:self._size]
+
+    @classmethod
+    def from_fixes(cls, fixes: Fixes, time: Optional[np.ndarray] = None, cell: float = CELL) -> 'SpatialIndex':
+        """
+        :param fixes: Колонки B-записей.
+        :param time: Время точек для индекса по времени, например TimeNormalization.epoch. По умолчанию - fixes.time
+                     (секунды с начала суток, поэтому для полета через полночь лучше передать монотонное время).
+        :param cell: Размер ячейки сетки, градусы.
+        :return:
+        """
+        index = cls(cell)
+        index.extend(fixes.latitude, fixes.longitude, fixes.time if time is None else time)
+        if index._n_sorted < len(index):
+            index._merge()
+        return index
+
+    def _rows(self, latitude: np.ndarray) -> np.ndarray:
+        return np.floor((np.asarray(latitude) + 90.) / self.cell).astype(np.int64)
+
+    def _columns(self, longitude: np.ndarray) -> np.ndarray:
+        return np.floor((np.asarray(longitude) + 180.) / self.cell).astype(np.int64) % self.n_columns
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self._keys)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ('_latitude', '_longitude', '_time', '_keys'):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def extend(self, latitude: np.ndarray, longitude: np.ndarray, time: np.ndarray) -> None:
+        """
+        Добавляет точки в конец индекса.
+        :param latitude: Десятичные градусы.
+        :param longitude:
+        :param time: Время точек, целые секунды.
+        :return:
+        """
+        latitude = np.asarray(latitude, dtype=np.float64)
+        n_fixes = len(latitude)
+        if not n_fixes:
+            return
+        stop = self._size + n_fixes
+        self._reserve(stop)
+        self._latitude[self._size:stop] = latitude
+        self._longitude[self._size:stop] = longitude
+        self._time[self._size:stop] = time
+        self._keys[self._size:stop] = self._rows(latitude) * self.n_columns + self._columns(longitude)
+        self._size = stop
+        self._time_order = None
+        if self._size - self._n_sorted > max(MIN_TAIL, MERGE_FRACTION * self._n_sorted):
+            self._merge()
+
+    def append(self, latitude: float, longitude: float, time: int) -> None:
+        """
+        Добавляет одну точку, например при потоковом чтении.
+        """
+        if self._size == len(self._keys):
+            self._reserve(self._size + 1)
+        i = self._size
+        self._latitude[i] = latitude
+        self._longitude[i] = longitude
+        self._time[i] = time
+        row = math.floor((latitude + 90.) / self.cell)
+        self._keys[i] = row * self.n_columns + math.floor((longitude + 180.) / self.cell) % self.n_columns
+        self._size = i + 1
+        self._time_order = None
+        if self._size - self._n_sorted > max(MIN_TAIL, MERGE_FRACTION * self._n_sorted):
+            self._merge()
+
+    def _merge(self) -> None:
+        keys = self._keys[:self._size]
+        self._order = np.argsort(keys, kind='stable')
+        self._sorted_keys = keys[self._order]
+        self._n_sorted = self._size
+
+    def _candidates(self, row_start: int, row_stop: int, column_ranges: Tuple[Tuple[int, int], ...]) -> np.ndarray:
+        """
+        :param row_start: Первый ряд сетки.
+        :param row_stop: Ряд после последнего.
+        :param column_ranges: Промежутки столбцов [start; stop) в каждом ряду.
+        :return: Номера точек из ячеек и все точки хвоста в ячейках этих рядов.
+        """
+        row_start, row_stop = max(row_start, 0), min(row_stop, self.n_rows)
+        rows = np.arange(row_start, row_stop, dtype=np.int64) * self.n_columns
+        parts = []
+        for start, stop in column_ranges:
+            lower = np.searchsorted(self._sorted_keys, rows + start, side='left')
+            upper = np.searchsorted(self._sorted_keys, rows + stop, side='left')
+            parts.extend(self._order[a:b] for a, b in zip(lower.tolist(), upper.tolist()) if b > a)
+        if self._size > self._n_sorted:
+            tail = self._keys[self._n_sorted:self._size]
+            near = (tail >= row_start * self.n_columns) & (tail < row_stop * self.n_columns)
+            parts.append(np.flatnonzero(near) + self._n_sorted)
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def _column_ranges(self, west: float, east: float) -> Tuple[Tuple[int, int], ...]:
+        """
+        :return: Промежутки столбцов, покрывающие долготы от west до east на восток (через антимеридиан, если
+                 west > east).
+        """
+        start, stop = int(self._columns(west)), int(self._columns(east)) + 1
+        if west <= east:
+            return ((start, stop),)
+        # Если west и east попали в один столбец, промежутки пересекались бы и точки столбца вернулись бы дважды.
+        return (start, self.n_columns), (0, min(stop, start))
+
+    def within(self, latitude: float, longitude: float, radius: float) -> np.ndarray:
+        """
+        :param latitude: Центр, десятичные градусы.
+        :param longitude:
+        :param radius: Радиус, метры.
+        :return: Номера точек не дальше radius от центра.
+        """
+        d_latitude = math.degrees(radius / EARTH_RADIUS)
+        south, north = latitude - d_latitude, latitude + d_latitude
+        if south <= -90 or north >= 90 or d_latitude >= 90:
+            column_ranges = ((0, self.n_columns),)
+        else:
+            # Наибольшее отклонение по долготе - на самой удаленной от экватора широте круга.
+            d_longitude = math.degrees(
+                math.asin(min(1., math.sin(radius / EARTH_RADIUS) / math.cos(math.radians(latitude))))
+            )
+            if d_longitude >= 180:
+                column_ranges = ((0, self.n_columns),)
+            else:
+                column_ranges = self._column_ranges(
+                    (longitude - d_longitude + 180.) % 360. - 180., (longitude + d_longitude + 180.) % 360. - 180.
+                )
+        candidates = self._candidates(
+            int(self._rows(max(south, -90.))), int(self._rows(min(north, 90.))) + 1, column_ranges
+        )
+        candidates = candidates[
+            distance(latitude, longitude, self._latitude[candidates], self._longitude[candidates]) <= radius
+        ]
+        return np.sort(candidates)
+
+    def bbox(self, south: float, west: float, north: float, east: float) -> np.ndarray:
+        """
+        :param south: Границы прямоугольника, десятичные градусы, включительно. Если west > east, прямоугольник
+                      пересекает антимеридиан.
+        :return: Номера точек внутри прямоугольника.
+        """
+        candidates = self._candidates(
+            int(self._rows(south)), int(self._rows(north)) + 1, self._column_ranges(west, east)
+        )
+        latitude, longitude = self._latitude[candidates], self._longitude[candidates]
+        inside = (latitude >= south) & (latitude <= north)
+        if west <= east:
+            inside &= (longitude >= west) & (longitude <= east)
+        else:
+            inside &= (longitude >= west) | (longitude <= east)
+        return np.sort(candidates[inside])
+
+    def nearest(self, latitude: float, longitude: float) -> Tuple[int, float]:
+        """
+        :param latitude: Десятичные градусы.
+        :param longitude:
+        :return: Номер ближайшей точки (из равноудаленных - с меньшим номером) и расстояние до нее, метры.
+        """
+        if not self._size:
+            raise ValueError('Индекс не содержит точек.')
+        # Радиус поиска удваивается, пока в круг не попадет хотя бы одна точка.
+        radius = math.radians(self.cell) * EARTH_RADIUS
+        while radius < math.pi * EARTH_RADIUS:
+            found = self.within(latitude, longitude, radius)
+            if found.size:
+                break
+            radius *= 2
+        else:
+            found = np.arange(self._size)
+        distances = distance(latitude, longitude, self._latitude[found], self._longitude[found])
+        i = int(np.argmin(distances))
+        return int(found[i]), float(distances[i])
+
+    def during(self, start: int, stop: int) -> np.ndarray:
+        """
+        :param start: Время, как в extend.
+        :param stop:
+        :return: Номера точек со временем в [start; stop) в порядке времени.
+        """
+        if self._time_order is None:
+            time = self.time
+            if np.all(time[1:] >= time[:-1]):
+                self._time_order = np.arange(self._size)
+            else:
+                self._time_order = np.argsort(time, kind='stable')
+            self._sorted_time = time[self._time_order]
+        lower, upper = np.searchsorted(self._sorted_time, (start, stop), side='left')
+        return self._time_order[lower:upper]
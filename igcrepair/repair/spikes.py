@@ -0,0 +1,260 @@
+"""
+Поиск и исправление выбросов: коротких (до max_length точек) скачков координат или высот, которые неисправный
+регистратор вставляет в нормальный трек. Участок s..s+L-1 считается выбросом по величине, если скачок в него из точки
+s-1 и скачок из него в точку s+L превышают предел (скорость для координат, вертикальная скорость для высот), а переход
+напрямую из s-1 в s+L - нет. Исправленное значение - линейная интерполяция по времени между s-1 и s+L.
+
+Есть два режима с одинаковым результатом: векторный filter_spikes для колонок Fixes и генератор filter_spikes_stream,
+который хранит только окно из 2 * max_length + 2 точек и подходит для файлов любого размера.
+"""
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, Iterator, NamedTuple, Tuple
+
+import numpy as np
+
+from igcrepair.reader.batch import Fixes
+from igcrepair.reader.fields import Coordinates, round_array
+from igcrepair.reader.layout import Fix
+from igcrepair.repair.geo import distance, wrap_longitude
+
+
+# Признаки выбросов, объединяемые через |.
+POSITION: int = 1
+PRESSURE_ALTITUDE: int = 2
+GNSS_ALTITUDE: int = 4
+
+# Предел скорости, м/с: с запасом выше максимальной скорости планера.
+MAX_SPEED: float = 150.
+# Предел вертикальной скорости, м/с.
+MAX_CLIMB: float = 30.
+# Наибольшая длина выброса, точки.
+MAX_LENGTH: int = 1
+SECONDS_PER_DAY: int = 24 * 3600
+
+# Номера колонок Fixes (и элементов Fix), которые проверяет каждый признак.
+_COLUMNS: Dict[int, Tuple[int, ...]] = {
+    POSITION: (1, 2),
+    PRESSURE_ALTITUDE: (4,),
+    GNSS_ALTITUDE: (5,),
+}
+
+
+class SpikeFilter(NamedTuple):
+    """
+    Результат filter_spikes.
+    """
+
+    fixes: Fixes  # исправленные колонки (исходные, если correct=False)
+    flags: np.ndarray  # uint8, признаки выбросов каждой точки
+
+
+def _exceeds(flag: int, max_speed: float, max_climb: float) -> Callable:
+    """
+    :return: Функция (dt, значения точки a, значения точки b) -> превышен ли предел. Работает и с массивами, и с
+             отдельными числами, поэтому оба режима сравнивают одинаково.
+    """
+    if flag == POSITION:
+        return lambda dt, latitude_a, longitude_a, latitude_b, longitude_b: (
+            distance(latitude_a, longitude_a, latitude_b, longitude_b) > max_speed * dt
+        )
+    return lambda dt, altitude_a, altitude_b: np.abs(altitude_b - altitude_a) > max_climb * dt
+
+
+def _fraction(time_left, time, time_right):
+    elapsed = (time - time_left) % SECONDS_PER_DAY
+    span = (time_right - time_left) % SECONDS_PER_DAY
+    if isinstance(span, np.ndarray):
+        return np.where(span > 0, elapsed / np.maximum(span, 1), 0.)
+    return elapsed / span if span else 0.
+
+
+def _interpolate_linear(left, right, fraction):
+    return left + (right - left) * fraction
+
+
+def _interpolate_longitude(left, right, fraction):
+    return wrap_longitude(left + ((right - left + 180.) % 360. - 180.) * fraction)
+
+
+def _check_arguments(max_length: int) -> None:
+    if max_length < 1:
+        raise ValueError('max_length должен быть не меньше 1. Передано {0}.'.format(max_length))
+
+
+def find_spikes(
+    fixes: Fixes,
+    max_speed: float = MAX_SPEED,
+    max_climb: float = MAX_CLIMB,
+    max_length: int = MAX_LENGTH,
+) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+    """
+    :return: Признак -> номера опорных точек слева и справа для каждой точки (-1, если точка не выброс). Если точка
+             входит в несколько выбросов, берется самый короткий, а из равных по длине - начинающийся раньше.
+    """
+    _check_arguments(max_length)
+    n_fixes = len(fixes.time)
+    time = np.asarray(fixes.time, dtype=np.int64)
+    index = np.arange(n_fixes)
+    anchors = {}
+    for flag, columns in _COLUMNS.items():
+        values = [np.asarray(fixes[column]) for column in columns]
+        exceeds = _exceeds(flag, max_speed, max_climb)
+
+        def check(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+            return exceeds((time[b] - time[a]) % SECONDS_PER_DAY, *(v[a] for v in values), *(v[b] for v in values))
+
+        left = np.full(n_fixes, -1, dtype=np.int64)
+        right = np.full(n_fixes, -1, dtype=np.int64)
+        # jumps[k]: превышен ли предел при переходе из k - 1 в k.
+        jumps = np.zeros(n_fixes, dtype=bool)
+        if n_fixes > 1:
+            jumps[1:] = check(index[:-1], index[1:])
+        for length in range(1, max_length + 1):
+            starts = index[1:max(n_fixes - length, 1)]
+            starts = starts[jumps[starts] & jumps[starts + length]]
+            starts = starts[~check(starts - 1, starts + length)]
+            if not starts.size:
+                continue
+            first = np.full(n_fixes, n_fixes, dtype=np.int64)
+            for offset in range(length):
+                first[starts + offset] = np.minimum(first[starts + offset], starts)
+            new = (first < n_fixes) & (left < 0)
+            left[new] = first[new] - 1
+            right[new] = first[new] + length
+        anchors[flag] = (left, right)
+    return anchors
+
+
+def filter_spikes(
+    fixes: Fixes,
+    max_speed: float = MAX_SPEED,
+    max_climb: float = MAX_CLIMB,
+    max_length: int = MAX_LENGTH,
+    correct: bool = True,
+) -> SpikeFilter:
+    """
+    Векторный режим: все колонки трека проверяются за один проход.
+    :param fixes: Колонки B-записей.
+    :param max_speed: Предел горизонтальной скорости, м/с.
+    :param max_climb: Предел вертикальной скорости, м/с.
+    :param max_length: Наибольшая длина выброса, точки.
+    :param correct: Исправлять ли выбросы. Если False, только отмечаются.
+    :return:
+    """
+    flags = np.zeros(len(fixes.time), dtype=np.uint8)
+    columns = [np.array(column) for column in fixes] if correct else list(fixes)
+    time = np.asarray(fixes.time, dtype=np.int64)
+    for flag, (left, right) in find_spikes(fixes, max_speed, max_climb, max_length).items():
+        spikes = np.flatnonzero(left >= 0)
+        flags[spikes] |= flag
+        if not correct or not spikes.size:
+            continue
+        left, right = left[spikes], right[spikes]
+        fraction = _fraction(time[left], time[spikes], time[right])
+        if flag == POSITION:
+            latitude, longitude = fixes.latitude, fixes.longitude
+            columns[1][spikes] = round_array(
+                _interpolate_linear(latitude[left], latitude[right], fraction), Coordinates.N_DIGITS
+            )
+            columns[2][spikes] = round_array(
+                _interpolate_longitude(longitude[left], longitude[right], fraction), Coordinates.N_DIGITS
+            )
+        else:
+            (column,) = _COLUMNS[flag]
+            altitude = fixes[column]
+            columns[column][spikes] = np.rint(_interpolate_linear(altitude[left], altitude[right], fraction))
+    return SpikeFilter(Fixes(*columns), flags)
+
+
+def filter_spikes_stream(
+    fixes: Iterable[Fix],
+    max_speed: float = MAX_SPEED,
+    max_climb: float = MAX_CLIMB,
+    max_length: int = MAX_LENGTH,
+    correct: bool = True,
+) -> Iterator[Tuple[Fix, int]]:
+    """
+    Потоковый режим с тем же результатом, что и filter_spikes. Точка отдается с задержкой в max_length точек, когда
+    все выбросы, которые могут ее содержать, уже проверены.
+    :param fixes: Точки в виде кортежей BRecordLayout.decode: секунды, широта, долгота, признак достоверности,
+                  барометрическая и GNSS-высоты, затем любые значения (например, дополнения).
+    :param max_speed: Предел горизонтальной скорости, м/с.
+    :param max_climb: Предел вертикальной скорости, м/с.
+    :param max_length: Наибольшая длина выброса, точки.
+    :param correct: Исправлять ли выбросы. Если False, точки отдаются без изменений.
+    :return: Точка и признаки выбросов.
+    """
+    _check_arguments(max_length)
+    checks = [(flag, columns, _exceeds(flag, max_speed, max_climb)) for flag, columns in _COLUMNS.items()]
+
+    def check(a: Fix, b: Fix, columns: Tuple[int, ...], exceeds: Callable) -> bool:
+        return bool(exceeds((b[0] - a[0]) % SECONDS_PER_DAY, *(a[c] for c in columns), *(b[c] for c in columns)))
+
+    # Окно: исходные точки, признаки превышения при переходе из предыдущей точки и лучший выброс (длина, начало) по
+    # каждому признаку. first - номер первой точки окна.
+    window: Deque[Fix] = deque()
+    jumps: Deque[int] = deque()
+    best: Deque[Dict[int, Tuple[int, int]]] = deque()
+    first = 0
+
+    def emit(j: int) -> Tuple[Fix, int]:
+        fix = window[j - first]
+        spikes = best[j - first]
+        flags = 0
+        for flag in spikes:
+            flags |= flag
+        if not correct or not spikes:
+            return fix, flags
+        fix = list(fix)
+        for flag, (length, start) in spikes.items():
+            left, right = window[start - 1 - first], window[start + length - first]
+            fraction = _fraction(left[0], fix[0], right[0])
+            if flag == POSITION:
+                fix[1] = round(float(_interpolate_linear(left[1], right[1], fraction)), Coordinates.N_DIGITS)
+                fix[2] = round(float(_interpolate_longitude(left[2], right[2], fraction)), Coordinates.N_DIGITS)
+            else:
+                (column,) = _COLUMNS[flag]
+                fix[column] = round(_interpolate_linear(left[column], right[column], fraction))
+        return tuple(fix), flags
+
+    emitted = 0
+    m = -1
+    for m, fix in enumerate(fixes):
+        jump = 0
+        if window:
+            for flag, columns, exceeds in checks:
+                if check(window[-1], fix, columns, exceeds):
+                    jump |= flag
+        window.append(fix)
+        jumps.append(jump)
+        best.append({})
+
+        # Выбросы, которые заканчиваются на точке m - 1.
+        for length in range(1, max_length + 1):
+            start = m - length
+            if start < 1:
+                break
+            for flag, columns, exceeds in checks:
+                if (
+                    jumps[start - first] & flag
+                    and jump & flag
+                    and not check(window[start - 1 - first], fix, columns, exceeds)
+                ):
+                    for k in range(start, m):
+                        current = best[k - first].get(flag)
+                        if current is None or (length, start) < current:
+                            best[k - first][flag] = (length, start)
+
+        while emitted <= m - max_length:
+            yield emit(emitted)
+            emitted += 1
+            # Для следующих точек нужны исходные значения не раньше emitted - max_length - 1.
+            while first < emitted - max_length - 1:
+                window.popleft()
+                jumps.popleft()
+                best.popleft()
+                first += 1
+
+    while emitted <= m:
+        yield emit(emitted)
+        emitted += 1
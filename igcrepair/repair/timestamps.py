@@ -0,0 +1,184 @@
+"""
+Нормализация времени B-записей. TimeUTC хранит только время суток, поэтому полет через полночь UTC или регистратор,
+повторяющий или возвращающий время назад, не упорядочить по этой колонке. Здесь колонка секунд с начала суток
+переводится в монотонные секунды Unix (int64) по дате из заголовка HFDTE, по которым можно искать двоичным поиском.
+"""
+import datetime
+import re
+from typing import Dict, Iterable, NamedTuple, Optional
+
+import numpy as np
+
+from igcrepair.reader.batch import Fixes
+from igcrepair.reader.fields import Coordinates, round_array
+from igcrepair.reader.records import Record, HRecord
+from igcrepair.reader.utils import RecordFieldError
+from igcrepair.repair.geo import wrap_longitude
+
+
+SECONDS_PER_DAY: int = 24 * 3600
+# Уменьшение времени суток больше чем на столько секунд считается переходом через полночь, меньшее - ошибкой
+# регистратора.
+ROLLOVER_THRESHOLD: int = SECONDS_PER_DAY // 2
+DATE_SUBJECT: str = 'DTE'
+# HFDTEDDMMYY или, в новых версиях спецификации, HFDTEDATE:DDMMYY,NN.
+DATE_PATTERN: re.Pattern = re.compile(r'(?:DATE:)?([0-9]{2})([0-9]{2})([0-9]{2})', flags=re.IGNORECASE)
+# Двузначные годы меньше этого относятся к XXI веку: формат IGC появился в 1990-х.
+CENTURY_PIVOT: int = 80
+
+_EPOCH: datetime.date = datetime.date(1970, 1, 1)
+
+
+def parse_date(text: str) -> datetime.date:
+    """
+    :param text: Текст H-записи DTE, например "160701" или "DATE:160701,01".
+    :return: Дата полета.
+    """
+    match = DATE_PATTERN.match(text)
+    if match is None:
+        raise RecordFieldError('Формат даты "{0}" не соответствует формату {1}.'.format(text, DATE_PATTERN.pattern))
+    day, month, year = (int(group) for group in match.groups())
+    year += 2000 if year < CENTURY_PIVOT else 1900
+    try:
+        return datetime.date(year, month, day)
+    except ValueError as error:
+        raise RecordFieldError('Неправильная дата "{0}": {1}.'.format(text, error)) from error
+
+
+def find_flight_date(records: Iterable[Record]) -> Optional[datetime.date]:
+    """
+    :param records: Записи файла, например из IGCReader(path, record_types='H').
+    :return: Дата из первой H-записи DTE или None, если ее нет.
+    """
+    for record in records:
+        if isinstance(record, HRecord) and record.subject.value.upper() == DATE_SUBJECT:
+            return parse_date(record.text.value)
+    return None
+
+
+def date_to_epoch(date: datetime.date) -> int:
+    """
+    :return: Секунды Unix начала суток UTC.
+    """
+    return (date - _EPOCH).days * SECONDS_PER_DAY
+
+
+def to_epoch(time: np.ndarray, date: datetime.date, threshold: int = ROLLOVER_THRESHOLD) -> np.ndarray:
+    """
+    :param time: Секунды с начала суток UTC в порядке записи.
+    :param date: Дата первой точки (HFDTE).
+    :param threshold: Уменьшение времени больше этого значения считается переходом через полночь, увеличение больше
+                      SECONDS_PER_DAY - threshold - возвратом назад через полночь.
+    :return: Секунды Unix (int64). Возвраты времени назад сохраняются.
+    """
+    time = np.asarray(time, dtype=np.int64)
+    if not len(time):
+        return time.copy()
+    # Шаг между соседними точками приводится к [-threshold, SECONDS_PER_DAY - threshold).
+    steps = (np.diff(time) + threshold) % SECONDS_PER_DAY - threshold
+    epoch = np.empty(len(time), dtype=np.int64)
+    epoch[0] = date_to_epoch(date) + time[0]
+    np.cumsum(steps, out=epoch[1:])
+    epoch[1:] += epoch[0]
+    return epoch
+
+
+def time_range(epoch: np.ndarray, start: int, stop: int) -> slice:
+    """
+    :param epoch: Монотонные секунды Unix, например TimeNormalization.epoch.
+    :return: Срез точек со временем в [start, stop), найденный двоичным поиском.
+    """
+    return slice(int(np.searchsorted(epoch, start, side='left')), int(np.searchsorted(epoch, stop, side='left')))
+
+
+class TimeNormalization(NamedTuple):
+    """
+    Результат normalize_time.
+    """
+
+    epoch: np.ndarray  # int64, строго возрастающие секунды Unix
+    fixes: Fixes  # колонки точек, time - секунды с начала суток UTC
+    extensions: Dict[str, np.ndarray]  # дополнения; при передискретизации - значения предыдущей исходной точки
+    source: np.ndarray  # номер исходной точки (при передискретизации - предыдущей) для каждой точки результата
+    rollovers: int  # переходов через полночь между первой и последней точками
+    duplicates: int  # удалено точек с повторенным временем
+    backwards: int  # удалено точек со временем меньше предыдущего
+
+
+def _resample(
+    epoch: np.ndarray,
+    fixes: Fixes,
+    interval: int,
+) -> tuple:
+    """
+    :return: Сетка времени с шагом interval от первой точки, номера предыдущих точек и значения колонок на сетке:
+             линейная интерполяция координат и высот, признак достоверности предыдущей точки.
+    """
+    grid = np.arange(epoch[0], epoch[-1] + 1, interval, dtype=np.int64)
+    previous = np.searchsorted(epoch, grid, side='right') - 1
+    following = np.minimum(previous + 1, len(epoch) - 1)
+    span = epoch[following] - epoch[previous]
+    fraction = np.where(span > 0, (grid - epoch[previous]) / np.maximum(span, 1), 0.)
+
+    def linear(column: np.ndarray) -> np.ndarray:
+        return column[previous] + (column[following] - column[previous]) * fraction
+
+    longitude = fixes.longitude
+    d_longitude = (longitude[following] - longitude[previous] + 180.) % 360. - 180.
+    columns = Fixes(
+        time=(grid % SECONDS_PER_DAY).astype(np.int32),
+        latitude=round_array(linear(fixes.latitude), Coordinates.N_DIGITS),
+        longitude=round_array(wrap_longitude(longitude[previous] + d_longitude * fraction), Coordinates.N_DIGITS),
+        validity=fixes.validity[previous],
+        pressure_altitude=np.rint(linear(fixes.pressure_altitude)).astype(np.int32),
+        gnss_altitude=np.rint(linear(fixes.gnss_altitude)).astype(np.int32),
+    )
+    return grid, previous, columns
+
+
+def normalize_time(
+    fixes: Fixes,
+    date: datetime.date,
+    extensions: Optional[Dict[str, np.ndarray]] = None,
+    interval: Optional[int] = None,
+    threshold: int = ROLLOVER_THRESHOLD,
+) -> TimeNormalization:
+    """
+    Переводит время в секунды Unix с учетом переходов через полночь, удаляет точки, время которых не больше времени
+    одной из предыдущих (повторы и возвраты назад), и при необходимости передискретизирует трек с постоянным шагом.
+    :param fixes: Колонки B-записей.
+    :param date: Дата первой точки (см. find_flight_date).
+    :param extensions: Необработанные значения дополнений (см. BRecordLayout.decode_lines).
+    :param interval: Шаг передискретизации, секунды. Если не указан, точки не передискретизируются.
+    :param threshold: Уменьшение времени суток больше этого значения считается переходом через полночь.
+    :return:
+    """
+    if interval is not None and interval < 1:
+        raise ValueError('interval должен быть не меньше 1. Передано {0}.'.format(interval))
+    extensions = extensions or {}
+    epoch = to_epoch(fixes.time, date, threshold)
+    keep = np.ones(len(epoch), dtype=bool)
+    rollovers = duplicates = backwards = 0
+    if len(epoch) > 1:
+        rollovers = int((epoch[-1] - fixes.time[-1] - epoch[0] + fixes.time[0]) // SECONDS_PER_DAY)
+        latest = np.maximum.accumulate(epoch)[:-1]
+        keep[1:] = epoch[1:] > latest
+        duplicates = int(np.count_nonzero(epoch[1:] == latest))
+        backwards = int(np.count_nonzero(epoch[1:] < latest))
+    source = np.flatnonzero(keep)
+    epoch = epoch[source]
+    fixes = Fixes(*(np.asarray(column)[source] for column in fixes))
+
+    if interval is not None and len(epoch):
+        epoch, previous, fixes = _resample(epoch, fixes, interval)
+        source = source[previous]
+
+    return TimeNormalization(
+        epoch=epoch,
+        fixes=fixes,
+        extensions={subtype: np.asarray(values)[source] for subtype, values in extensions.items()},
+        source=source,
+        rollovers=rollovers,
+        duplicates=duplicates,
+        backwards=backwards,
+    )
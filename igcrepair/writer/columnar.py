@@ -0,0 +1,192 @@
+"""
+Сохранение декодированных B-записей в колоночном двоичном формате. Такой файл читается через mmap без разбора текста.
+
+Форматы выбираются по расширению файла:
+    .arrow, .feather - Apache Arrow IPC (нужен pyarrow), читается через mmap без копирования;
+    .parquet - Apache Parquet (нужен pyarrow), сжатый, для аналитики;
+    .npz - архив NumPy без сжатия, работает без дополнительных зависимостей, тоже читается через mmap.
+"""
+import io
+import mmap
+import os
+import struct
+import zipfile
+from typing import Dict, NamedTuple, Optional, Union
+
+import numpy as np
+
+from igcrepair.reader.batch import Fixes
+from igcrepair.reader.mapped import MappedIGCFile
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+Path = Union[str, os.PathLike]
+
+ARROW: str = 'arrow'
+PARQUET: str = 'parquet'
+NPZ: str = 'npz'
+FORMATS: Dict[str, str] = {
+    '.arrow': ARROW,
+    '.feather': ARROW,
+    '.parquet': PARQUET,
+    '.npz': NPZ,
+}
+# Ключ, под которым хранится строка I-записи: в метаданных схемы Arrow или как отдельный массив в npz. Имена
+# дополнений состоят из заглавных букв и цифр, поэтому с ним не пересекаются.
+I_RECORD_KEY: str = 'i_record'
+
+# Размер локального заголовка zip до имени файла; длины имени и дополнительного поля лежат в его конце.
+_ZIP_LOCAL_HEADER: struct.Struct = struct.Struct('<26xHH')
+
+
+class Track(NamedTuple):
+    """
+    Колонки трека: основная часть B-записей, необработанные значения дополнений (массивы bytes фиксированной длины,
+    см. BRecordLayout.decode_lines) и строка I-записи, по которой они вырезаны.
+    """
+
+    fixes: Fixes
+    extensions: Dict[str, np.ndarray]
+    i_record: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.fixes.time)
+
+
+def default_suffix() -> str:
+    """
+    :return: Расширение формата по умолчанию: Arrow IPC, если установлен pyarrow, иначе npz.
+    """
+    return '.arrow' if pyarrow is not None else '.npz'
+
+
+def _format(path: Path) -> str:
+    suffix = os.path.splitext(os.fspath(path))[1].lower()
+    if suffix not in FORMATS:
+        raise ValueError('Неизвестный формат файла "{0}". Допустимы {1}.'.format(suffix, ', '.join(FORMATS)))
+    file_format = FORMATS[suffix]
+    if file_format != NPZ and pyarrow is None:
+        raise ImportError('Для формата {0} нужен пакет pyarrow. Используйте .npz.'.format(file_format))
+    return file_format
+
+
+def _to_arrow(track: Track) -> 'pyarrow.Table':
+    arrays = [pyarrow.array(column) for column in track.fixes]
+    names = list(Fixes._fields)
+    for subtype, values in track.extensions.items():
+        width = values.dtype.itemsize
+        arrays.append(
+            pyarrow.FixedSizeBinaryArray.from_buffers(
+                pyarrow.binary(width), len(values), [None, pyarrow.py_buffer(np.ascontiguousarray(values))]
+            )
+        )
+        names.append(subtype)
+    metadata = {I_RECORD_KEY: track.i_record} if track.i_record is not None else None
+    return pyarrow.table(arrays, names=names, metadata=metadata)
+
+
+def _from_arrow(table: 'pyarrow.Table') -> Track:
+    columns = {}
+    for name, column in zip(table.column_names, table.columns):
+        array = column.combine_chunks()
+        if pyarrow.types.is_fixed_size_binary(array.type):
+            width = array.type.byte_width
+            columns[name] = np.frombuffer(
+                array.buffers()[1], dtype='S{0}'.format(width), count=len(array), offset=array.offset * width
+            )
+        else:
+            columns[name] = array.to_numpy(zero_copy_only=False)
+    metadata = table.schema.metadata or {}
+    i_record = metadata.get(I_RECORD_KEY.encode())
+    return _track(columns, i_record.decode() if i_record is not None else None)
+
+
+def _track(columns: Dict[str, np.ndarray], i_record: Optional[str]) -> Track:
+    fixes = Fixes(*(columns.pop(name) for name in Fixes._fields))
+    return Track(fixes, columns, i_record)
+
+
+def _load_npz(path: Path) -> Dict[str, np.ndarray]:
+    """
+    Открывает npz без сжатия через mmap: массивы ссылаются прямо на данные внутри архива.
+    """
+    with open(path, 'rb') as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    arrays = {}
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                with np.load(path) as data:
+                    return {name: data[name] for name in data.files}
+            name_length, extra_length = _ZIP_LOCAL_HEADER.unpack_from(buffer, info.header_offset)
+            start = info.header_offset + _ZIP_LOCAL_HEADER.size + name_length + extra_length
+            header = io.BytesIO(buffer[start:start + min(info.file_size, 1 << 16)])
+            version = np.lib.format.read_magic(header)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(header)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(header)
+            array = np.frombuffer(buffer, dtype=dtype, count=int(np.prod(shape)), offset=start + header.tell())
+            arrays[info.filename[:-len('.npy')]] = array.reshape(shape, order='F' if fortran_order else 'C')
+    return arrays
+
+
+def write_track(path: Path, track: Track) -> None:
+    """
+    :param path: Путь к файлу. Формат определяется по расширению (см. FORMATS).
+    :param track:
+    :return:
+    """
+    file_format = _format(path)
+    if file_format == NPZ:
+        columns = dict(zip(Fixes._fields, track.fixes), **track.extensions)
+        if track.i_record is not None:
+            columns[I_RECORD_KEY] = np.array(track.i_record)
+        np.savez(path, **columns)
+        return
+
+    table = _to_arrow(track)
+    if file_format == PARQUET:
+        pyarrow.parquet.write_table(table, path)
+        return
+    with pyarrow.OSFile(os.fspath(path), 'wb') as sink, pyarrow.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def read_track(path: Path) -> Track:
+    """
+    Читает трек, сохраненный write_track. Файлы Arrow IPC и npz отображаются в память, поэтому колонки не копируются
+    и доступны только для чтения.
+    :param path:
+    :return:
+    """
+    file_format = _format(path)
+    if file_format == NPZ:
+        columns = _load_npz(path)
+        i_record = columns.pop(I_RECORD_KEY, None)
+        return _track(columns, str(i_record) if i_record is not None else None)
+    if file_format == PARQUET:
+        return _from_arrow(pyarrow.parquet.read_table(path, memory_map=True))
+    return _from_arrow(pyarrow.ipc.open_file(pyarrow.memory_map(os.fspath(path))).read_all())
+
+
+def export_file(path: Path, destination: Optional[Path] = None) -> str:
+    """
+    Декодирует B-записи IGC-файла вместе с дополнениями из первой I-записи и сохраняет их в колоночном формате.
+    :param path: Путь к IGC-файлу.
+    :param destination: Путь к результату. По умолчанию - рядом с IGC-файлом с расширением default_suffix().
+    :return: Путь к результату.
+    """
+    if destination is None:
+        destination = os.path.splitext(os.fspath(path))[0] + default_suffix()
+    with MappedIGCFile(path) as file:
+        fixes, extensions = file.columns()
+        i_record = file.i_record
+    write_track(destination, Track(fixes, extensions, str(i_record) if i_record is not None else None))
+    return os.fspath(destination)
@@ -0,0 +1,211 @@
+"""
+Запись IGC-файлов. B-записи собираются векторно из колонок (см. Fixes) в одну матрицу байтов и записываются одним
+вызовом write, остальные записи - через свой __str__.
+"""
+import io
+import os
+from typing import BinaryIO, Dict, Iterable, Optional, Union
+
+import numpy as np
+
+from igcrepair.reader.batch import Fixes
+from igcrepair.reader.constants import (
+    B_RECORD_LENGTH,
+    B_RECORD_TIME,
+    B_RECORD_LATITUDE,
+    B_RECORD_LONGITUDE,
+    B_RECORD_VALIDITY,
+    B_RECORD_PRESSURE_ALTITUDE,
+    B_RECORD_GNSS_ALTITUDE,
+)
+from igcrepair.reader.fields import Latitude, Longitude, PressureAltitude, GNSSAltitude
+from igcrepair.reader.layout import compile_layout
+from igcrepair.reader.records import Record, IRecord, JRecord, BRecord
+from igcrepair.reader.utils import RecordError, RecordFieldError
+
+
+Path = Union[str, os.PathLike]
+
+# Окончание строки по спецификации IGC.
+NEWLINE: bytes = b'\r\n'
+# Заполнитель байтов B-записи, не описанных ни одним дополнением I-записи.
+FILLER: int = ord(' ')
+
+
+def _put_digits(columns: np.ndarray, values: np.ndarray) -> None:
+    """
+    Записывает последние десятичные цифры модулей чисел, дополненные нулями слева.
+    :param columns: Матрица uint8 (количество чисел, количество цифр), обычно срез строк записей.
+    :param values: Целые числа.
+    """
+    values = np.abs(values)
+    for i in range(columns.shape[1] - 1, -1, -1):
+        values, digits = np.divmod(values, 10)
+        columns[:, i] = digits
+        columns[:, i] += ord('0')
+
+
+def _put_altitude(columns: np.ndarray, values: np.ndarray, field: type) -> None:
+    """
+    Векторная версия __str__ высот: '{0:05d}', знак минуса занимает первую позицию.
+    """
+    if not ((values >= field.BOUNDS[0]) & (values <= field.BOUNDS[1])).all():
+        raise RecordFieldError(
+            'Значения поля {0} должны быть в промежутке [{1}, {2}].'.format(field.__name__, *field.BOUNDS)
+        )
+    _put_digits(columns, values)
+    columns[values < 0, 0] = ord('-')
+
+
+def _bytes(strings: np.ndarray) -> np.ndarray:
+    return strings.view(np.uint8).reshape(len(strings), strings.dtype.itemsize)
+
+
+def _put_coordinates(rows: np.ndarray, values: np.ndarray, field: type, core: slice, digits: Optional[slice]) -> None:
+    """
+    Записывает координаты в основную часть записи и, если задано положение digits, цифры минут после тысячных в
+    дополнение LAD или LOD.
+    """
+    if digits is None:
+        rows[:, core] = _bytes(field.format_array(values))
+        return
+    strings, extra = field.format_precise_array(values, digits.stop - digits.start)
+    rows[:, core] = _bytes(strings)
+    if extra.dtype.itemsize:
+        rows[:, digits] = _bytes(extra)
+
+
+def format_b_records(
+    fixes: Fixes,
+    extensions: Optional[Dict[str, np.ndarray]] = None,
+    i_record: Optional[IRecord] = None,
+    newline: bytes = NEWLINE,
+    precise: bool = False,
+) -> bytes:
+    """
+    Векторная версия BRecord.__str__ для всех точек сразу.
+    :param fixes: Колонки основной части B-записей.
+    :param extensions: Необработанные значения дополнений: массивы bytes шириной, равной длине поля в I-записи
+                       (см. BRecordLayout.decode_lines).
+    :param i_record: I-запись, по которой дополнения размещаются в записи. Без нее дополнения не записываются.
+    :param newline: Окончание строки после каждой записи.
+    :param precise: Записывать ли цифры минут после тысячных в дополнения LAD и LOD, если они есть в I-записи. Их
+                    значения тогда берутся из колонок координат, а не из extensions (см.
+                    Coordinates.format_precise_array).
+    :return: Строки B-записей.
+    """
+    time = np.asarray(fixes.time)
+    n_fixes = len(time)
+    if not ((time >= 0) & (time < 24 * 3600)).all():
+        raise RecordFieldError('Время B-записи должно быть в промежутке [0, 86400) секунд.')
+
+    layout = compile_layout(i_record) if i_record is not None else None
+    length = layout.length if layout is not None else B_RECORD_LENGTH
+
+    rows = np.full((n_fixes, length + len(newline)), FILLER, dtype=np.uint8)
+    rows[:, 0] = ord(BRecord.RECORD_TYPE.value)
+    time_columns = rows[:, B_RECORD_TIME]
+    _put_digits(time_columns[:, 0:2], time // 3600)
+    _put_digits(time_columns[:, 2:4], time // 60 % 60)
+    _put_digits(time_columns[:, 4:6], time % 60)
+    latitude_digits = layout.latitude_digits if precise and layout is not None else None
+    longitude_digits = layout.longitude_digits if precise and layout is not None else None
+    _put_coordinates(rows, fixes.latitude, Latitude, B_RECORD_LATITUDE, latitude_digits)
+    _put_coordinates(rows, fixes.longitude, Longitude, B_RECORD_LONGITUDE, longitude_digits)
+    rows[:, B_RECORD_VALIDITY.start] = np.where(fixes.validity, ord('A'), ord('V'))
+    _put_altitude(rows[:, B_RECORD_PRESSURE_ALTITUDE], np.asarray(fixes.pressure_altitude), PressureAltitude)
+    _put_altitude(rows[:, B_RECORD_GNSS_ALTITUDE], np.asarray(fixes.gnss_altitude), GNSSAltitude)
+
+    if layout is not None:
+        extensions = extensions or {}
+        for subtype, field in zip(layout.subtypes, layout.slices):
+            if field is latitude_digits or field is longitude_digits:
+                continue
+            if subtype not in extensions:
+                raise RecordError('Нет значений дополнения {0}.'.format(subtype))
+            values = np.ascontiguousarray(extensions[subtype])
+            width = field.stop - field.start
+            if values.dtype.kind != 'S' or values.dtype.itemsize != width or len(values) != n_fixes:
+                raise RecordError(
+                    'Значения дополнения {0} должны быть массивом bytes длины {1} ширины {2}.'.format(
+                        subtype, n_fixes, width
+                    )
+                )
+            rows[:, field] = _bytes(values)
+
+    rows[:, length:] = np.frombuffer(newline, dtype=np.uint8)
+    return rows.tobytes()
+
+
+class IGCWriter:
+    """
+    Запись IGC-файла. Записи пишутся в порядке вызовов; I-запись, переданная в write_record, задает размещение
+    дополнений в следующих B-записях, записанных через write_fixes.
+
+        with IGCWriter(path) as writer:
+            writer.write_records(header)
+            writer.write_fixes(fixes, extensions)
+            writer.write_record(g_record)
+    """
+
+    def __init__(
+        self,
+        destination: Union[Path, BinaryIO],
+        encoding: str = 'utf-8',
+        newline: bytes = NEWLINE,
+        buffer_size: int = io.DEFAULT_BUFFER_SIZE,
+    ) -> None:
+        """
+        :param destination: Путь к файлу или открытый двоичный файл. Переданный файл не закрывается.
+        :param encoding: Кодировка записей, кроме B.
+        :param newline: Окончание строки.
+        :param buffer_size: Размер буфера файла, открытого по пути.
+        """
+        if isinstance(destination, (str, os.PathLike)):
+            self.file: BinaryIO = open(destination, 'wb', buffering=buffer_size)
+            self._close: bool = True
+        else:
+            self.file = destination
+            self._close = False
+        self.encoding: str = encoding
+        self.newline: bytes = newline
+        self.i_record: Optional[IRecord] = None
+
+    def __enter__(self) -> 'IGCWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._close:
+            self.file.close()
+        else:
+            self.file.flush()
+
+    def _line(self, record: Record) -> bytes:
+        if isinstance(record, IRecord) and not isinstance(record, JRecord):
+            self.i_record = record
+        return str(record).encode(self.encoding) + self.newline
+
+    def write_record(self, record: Record) -> None:
+        self.file.write(self._line(record))
+
+    def write_records(self, records: Iterable[Record]) -> None:
+        self.file.write(b''.join(map(self._line, records)))
+
+    def write_fixes(
+        self,
+        fixes: Fixes,
+        extensions: Optional[Dict[str, np.ndarray]] = None,
+        i_record: Optional[IRecord] = None,
+        precise: bool = False,
+    ) -> None:
+        """
+        :param fixes: Колонки основной части B-записей.
+        :param extensions: Необработанные значения дополнений (см. format_b_records).
+        :param i_record: I-запись, по которой размещаются дополнения. По умолчанию - последняя записанная.
+        :param precise: Записывать ли цифры дополнений LAD и LOD из колонок координат (см. format_b_records).
+        """
+        i_record = i_record if i_record is not None else self.i_record
+        self.file.write(format_b_records(fixes, extensions, i_record, self.newline, precise))
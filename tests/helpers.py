@@ -0,0 +1,19 @@
+import numpy as np
+
+from igcrepair.reader.batch import Fixes
+
+
+def fixes(time, latitude=None, longitude=None, validity=None, pressure_altitude=None, gnss_altitude=None) -> Fixes:
+    """
+    Столбцы точек из списков в порядке Fixes. Не заданные столбцы заполняются: широта - номером точки, долгота - нулями,
+    все точки действительны, высоты растут на 10 м за точку (GNSS на 40 м выше).
+    """
+    n_fixes = len(time)
+    return Fixes(
+        np.array(time, dtype=np.int32),
+        np.array(latitude if latitude is not None else np.arange(n_fixes), dtype=np.float64),
+        np.array(longitude if longitude is not None else np.zeros(n_fixes), dtype=np.float64),
+        np.array(validity if validity is not None else np.ones(n_fixes), dtype=bool),
+        np.array(pressure_altitude if pressure_altitude is not None else np.arange(n_fixes) * 10, dtype=np.int32),
+        np.array(gnss_altitude if gnss_altitude is not None else np.arange(n_fixes) * 10 + 40, dtype=np.int32),
+    )
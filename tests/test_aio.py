@@ -0,0 +1,160 @@
+import asyncio
+import os
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import numpy as np
+from parameterized import parameterized
+
+from benchmarks.synthetic import synthetic_flight
+from igcrepair.reader.aio import AsyncIGCReader, FixBatch, decode_batch
+from igcrepair.reader.records import BRecord
+from igcrepair.reader.stream import IGCReader
+from igcrepair.reader.table import FixTable
+from igcrepair.reader.utils import RecordError
+
+
+SAMPLE = os.path.join(os.path.dirname(__file__), 'data', 'sample.igc')
+
+
+def feed(data: bytes, piece: int = 7) -> asyncio.StreamReader:
+    """
+    Поток, в который данные поступают маленькими кусками, как из сокета.
+    """
+    stream = asyncio.StreamReader()
+
+    async def writer() -> None:
+        for i in range(0, len(data), piece):
+            stream.feed_data(data[i:i + piece])
+            await asyncio.sleep(0)
+        stream.feed_eof()
+
+    asyncio.ensure_future(writer())
+    return stream
+
+
+async def collect(iterator) -> list:
+    return [item async for item in iterator]
+
+
+class TestAsyncIGCReader(unittest.TestCase):
+
+    def setUp(self) -> None:
+        with open(SAMPLE, 'rb') as file:
+            self.data = file.read()
+
+    def run_async(self, coroutine):
+        return asyncio.run(coroutine)
+
+    @parameterized.expand([(1, ), (7, ), (1 << 16, )])
+    def test_records(self, piece: int) -> None:
+        async def read() -> list:
+            return await collect(AsyncIGCReader(feed(self.data, piece)))
+
+        self.assertEqual(
+            [str(record) for record in self.run_async(read())], [str(record) for record in IGCReader(SAMPLE)]
+        )
+
+    def test_no_trailing_newline(self) -> None:
+        async def read() -> list:
+            return await collect(AsyncIGCReader(feed(self.data.rstrip())))
+
+        self.assertEqual(len(self.run_async(read())), len(list(IGCReader(SAMPLE))))
+
+    @parameterized.expand([(1, ), (2, ), (4096, )])
+    def test_batches(self, batch_size: int) -> None:
+        async def read() -> list:
+            return await collect(AsyncIGCReader(feed(self.data), batch_size=batch_size).batches())
+
+        items = self.run_async(read())
+        records = list(IGCReader(SAMPLE))
+        expected = [record for record in records if not isinstance(record, BRecord)]
+        self.assertEqual([str(item) for item in items if not isinstance(item, FixBatch)], [str(r) for r in expected])
+
+        batches = [item for item in items if isinstance(item, FixBatch)]
+        fixes = [record for record in records if isinstance(record, BRecord)]
+        self.assertEqual(sum(len(batch.fixes.time) for batch in batches), len(fixes))
+        table = FixTable.from_records(fixes)
+        np.testing.assert_array_equal(np.concatenate([batch.fixes.latitude for batch in batches]), table.fixes.latitude)
+        self.assertEqual(batches[0].extensions['FXA'][0], fixes[0].extensions['FXA'].encode())
+
+    def test_order(self) -> None:
+        async def read() -> list:
+            return await collect(AsyncIGCReader(feed(self.data)).batches())
+
+        types = ''.join(
+            'B' if isinstance(item, FixBatch) else item.RECORD_TYPE.value for item in self.run_async(read())
+        )
+        self.assertEqual(types, 'AHHHIJCCLFBEKBDG')
+
+    def test_batch_error(self) -> None:
+        async def read() -> list:
+            return await collect(AsyncIGCReader(feed(b'AXCSAAA\nB1101355206343N00006198WA005870055\n')).batches())
+
+        with self.assertRaisesRegex(RecordError, 'начиная со строки 2'):
+            self.run_async(read())
+
+    def test_pending_batches(self) -> None:
+        lock = threading.Lock()
+        running, most = 0, 0
+
+        def decode(*args):
+            nonlocal running, most
+            with lock:
+                running += 1
+                most = max(most, running)
+            try:
+                time.sleep(.005)
+                return decode_batch(*args)
+            finally:
+                with lock:
+                    running -= 1
+
+        async def read() -> list:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                reader = AsyncIGCReader(feed(synthetic_flight(2_000), 1 << 16), executor=executor, batch_size=100)
+                return await collect(reader.batches())
+
+        with mock.patch('igcrepair.reader.aio.decode_batch', side_effect=decode):
+            items = self.run_async(read())
+        self.assertEqual(sum(len(item.fixes.time) for item in items if isinstance(item, FixBatch)), 2_000)
+        self.assertEqual(most, 2)
+
+    def test_concurrent_uploads(self) -> None:
+        """
+        Много одновременных загрузок через сокеты обслуживаются одним циклом событий.
+        """
+        flights = [synthetic_flight(2000, seed=seed) for seed in range(20)]
+
+        async def upload(port: int, data: bytes) -> None:
+            _, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(data)
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+
+        async def run() -> list:
+            received = []
+
+            async def handle(stream: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+                count = 0
+                async for item in AsyncIGCReader(stream, executor=executor, batch_size=256).batches():
+                    if isinstance(item, FixBatch):
+                        count += len(item.fixes.time)
+                received.append(count)
+                writer.close()
+
+            server = await asyncio.start_server(handle, '127.0.0.1', 0, limit=1 << 12)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                await asyncio.gather(*(upload(port, data) for data in flights))
+                while len(received) < len(flights):
+                    await asyncio.sleep(0.01)
+            return received
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            received = asyncio.run(asyncio.wait_for(run(), 30))
+        self.assertEqual(sorted(received), [2000] * len(flights))
@@ -0,0 +1,111 @@
+import random
+import unittest
+from typing import List
+
+import numpy as np
+from parameterized import parameterized
+
+from igcrepair.reader.batch import decode_b_records
+from igcrepair.reader.constants import (
+    B_RECORD_TIME,
+    B_RECORD_LATITUDE,
+    B_RECORD_LONGITUDE,
+    B_RECORD_VALIDITY,
+    B_RECORD_PRESSURE_ALTITUDE,
+    B_RECORD_GNSS_ALTITUDE,
+)
+from igcrepair.reader.fields import (
+    TimeUTC,
+    Latitude,
+    Longitude,
+    Validity,
+    PressureAltitude,
+    GNSSAltitude,
+)
+from igcrepair.reader.utils import RecordError, RecordFieldError, record2field
+
+
+def random_b_record(rng: random.Random) -> str:
+    return 'B{0:02d}{1:02d}{2:02d}{3:02d}{4:05d}{5}{6:03d}{7:05d}{8}{9}{10}{11:05d}{12}'.format(
+        rng.randint(0, 23), rng.randint(0, 59), rng.randint(0, 59),
+        rng.randint(0, 89), rng.randint(0, 59999), rng.choice('NSns'),
+        rng.randint(0, 179), rng.randint(0, 59999), rng.choice('EWew'),
+        rng.choice('AVav'),
+        rng.choice(['{0:05d}'.format(rng.randint(0, 9999)), '-{0:04d}'.format(rng.randint(0, 9999))]),
+        rng.randint(0, 99999),
+        rng.choice(['', '123', '0812345']),
+    )
+
+
+class TestDecodeBRecords(unittest.TestCase):
+
+    def assert_same_as_fields(self, lines: List[str], newline: str = '\n') -> None:
+        fixes = decode_b_records(newline.join(lines).encode())
+        self.assertEqual(len(fixes.time), len(lines))
+        for i, line in enumerate(lines):
+            time = record2field(line, TimeUTC, B_RECORD_TIME).value
+            self.assertEqual(fixes.time[i], time.hour * 3600 + time.minute * 60 + time.second)
+            self.assertEqual(fixes.latitude[i], record2field(line, Latitude, B_RECORD_LATITUDE).dd)
+            self.assertEqual(fixes.longitude[i], record2field(line, Longitude, B_RECORD_LONGITUDE).dd)
+            self.assertEqual(fixes.validity[i], record2field(line, Validity, B_RECORD_VALIDITY).value == 'A')
+            self.assertEqual(
+                fixes.pressure_altitude[i], record2field(line, PressureAltitude, B_RECORD_PRESSURE_ALTITUDE).value
+            )
+            self.assertEqual(fixes.gnss_altitude[i], record2field(line, GNSSAltitude, B_RECORD_GNSS_ALTITUDE).value)
+
+    @parameterized.expand(
+        [
+            (['B1101355206343N00006198WA0058700558'], ),
+            (['B0000000000000N00000000EA0000000000', 'b2359599000000s18000000wv-999999999'], ),
+            (['B1101355206343N00006198WA00587005581234', 'B1101365206343N00006198WV-001200000'], ),
+        ]
+    )
+    def test(self, lines: List[str]) -> None:
+        self.assert_same_as_fields(lines)
+        self.assert_same_as_fields(lines, newline='\r\n')
+
+    def test_random(self) -> None:
+        rng = random.Random(0)
+        self.assert_same_as_fields([random_b_record(rng) for _ in range(2000)])
+
+    def test_dtypes(self) -> None:
+        fixes = decode_b_records(b'B1101355206343N00006198WA0058700558\r\n\r\n')
+        self.assertEqual(fixes.time.dtype, np.int32)
+        self.assertEqual(fixes.latitude.dtype, np.float64)
+        self.assertEqual(fixes.longitude.dtype, np.float64)
+        self.assertEqual(fixes.validity.dtype, np.bool_)
+        self.assertEqual(fixes.pressure_altitude.dtype, np.int32)
+        self.assertEqual(fixes.gnss_altitude.dtype, np.int32)
+        self.assertEqual(len(fixes.time), 1)
+
+    def test_empty(self) -> None:
+        fixes = decode_b_records(b'')
+        self.assertEqual(len(fixes.time), 0)
+
+    @parameterized.expand(
+        [
+            (b'B1101355206343N00006198WA005870055', RecordError, 'Длина B-записи номер 1'),
+            (b'B1101355206343N00006198WA0058700558\nB11', RecordError, 'Длина B-записи номер 2'),
+            (b'A1101355206343N00006198WA0058700558', RecordFieldError, 'B-записи номер 1'),
+            (b'B2401355206343N00006198WA0058700558', RecordFieldError, 'B-записи номер 1'),
+            (b'B1160355206343N00006198WA0058700558', RecordFieldError, 'B-записи номер 1'),
+            (b'B1101605206343N00006198WA0058700558', RecordFieldError, 'B-записи номер 1'),
+            (b'B1101359100000N00006198WA0058700558', RecordFieldError, 'B-записи номер 1'),
+            (b'B1101359000001N00006198WA0058700558', RecordFieldError, 'B-записи номер 1'),
+            (b'B1101355260001N00006198WA0058700558', RecordFieldError, 'B-записи номер 1'),
+            (b'B1101355206343E00006198WA0058700558', RecordFieldError, 'B-записи номер 1'),
+            (b'B1101355206343N18000001WA0058700558', RecordFieldError, 'B-записи номер 1'),
+            (b'B1101355206343N00006198NA0058700558', RecordFieldError, 'B-записи номер 1'),
+            (b'B1101355206343N00006198WB0058700558', RecordFieldError, 'B-записи номер 1'),
+            (b'B1101355206343N00006198WA1058700558', RecordFieldError, 'B-записи номер 1'),
+            (b'B1101355206343N00006198WA00587-0558', RecordFieldError, 'B-записи номер 1'),
+            (b'B1101355206343N00006198WA0058700558\nB11013552063a3N00006198WA0058700558', RecordFieldError, 'номер 2'),
+        ]
+    )
+    def test_exception(self, buffer: bytes, expected_exception: type, expected_msg: str) -> None:
+        with self.assertRaisesRegex(expected_exception, expected_msg):
+            decode_b_records(buffer)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import json
+import os
+import tempfile
+import unittest
+
+from benchmarks.suite import Case, Result, compare, load, run, save
+
+
+def result(ops_per_second: float, peak_memory: int = 1000) -> Result:
+    return Result('case', 10, 10 / ops_per_second, ops_per_second, {'p50': 1.}, peak_memory)
+
+
+class TestSuite(unittest.TestCase):
+
+    def test_run(self) -> None:
+        case = Case('squares', 100, lambda: [[i * i for i in range(10)] for _ in range(10)])
+        measured = run(case, repeat=2)
+        self.assertEqual(measured.name, 'squares')
+        self.assertGreater(measured.ops_per_second, 0)
+        self.assertEqual(set(measured.latency), {'p50', 'p90', 'p99'})
+        self.assertGreater(measured.peak_memory, 0)
+        self.assertIsNone(run(case, repeat=1, memory=False).peak_memory)
+
+    def test_compare(self) -> None:
+        baseline = {'case': result(100.)._asdict()}
+        self.assertEqual(compare([result(95.)], baseline, threshold=10), [])
+        self.assertEqual(len(compare([result(85.)], baseline, threshold=10)), 1)
+        self.assertEqual(len(compare([result(85., 2000)], baseline, threshold=10)), 2)
+        self.assertEqual(compare([result(1.)._replace(name='new')], baseline), [])
+
+    def test_save_load(self) -> None:
+        file = tempfile.NamedTemporaryFile(suffix='.json', delete=False)
+        file.close()
+        self.addCleanup(os.remove, file.name)
+        save([result(100.)], file.name)
+        self.assertEqual(load(file.name), json.loads(json.dumps({'case': result(100.)._asdict()})))
@@ -0,0 +1,135 @@
+import inspect
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from parameterized import parameterized
+
+from benchmarks.synthetic import synthetic_flight
+from igcrepair.reader import cache as cache_module, classifier, constants, mapped, utils
+from igcrepair.reader.cache import ParseCache, cache_version, file_hash
+from igcrepair.reader.mapped import MappedIGCFile
+from igcrepair.reader.table import FixTable
+
+
+SAMPLE = os.path.join(os.path.dirname(__file__), 'data', 'sample.igc')
+
+
+class TestParseCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.cache = ParseCache(os.path.join(self.directory, 'cache'))
+
+    def flight(self, name: str, n_fixes: int, seed: int = 0) -> str:
+        path = os.path.join(self.directory, name)
+        with open(path, 'wb') as file:
+            file.write(synthetic_flight(n_fixes, seed))
+        return path
+
+    def test_hit(self) -> None:
+        track = self.cache.load(SAMPLE)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+
+        with mock.patch.object(MappedIGCFile, 'columns', side_effect=AssertionError('файл разобран повторно')):
+            cached = self.cache.load(shutil.copy(SAMPLE, os.path.join(self.directory, 'copy.igc')))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(cached.i_record, track.i_record)
+        for column, expected in zip(cached.fixes, track.fixes):
+            np.testing.assert_array_equal(column, expected)
+        np.testing.assert_array_equal(cached.extensions['ENL'], track.extensions['ENL'])
+
+    def test_changed_file(self) -> None:
+        path = self.flight('flight.igc', 100)
+        self.cache.load(path)
+        with open(path, 'ab') as file:
+            file.write(b'LXXXchanged\r\n')
+        self.cache.load(path)
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_from_file(self) -> None:
+        path = self.flight('flight.igc', 100)
+        for _ in range(2):
+            table = FixTable.from_file(path, cache=self.cache)
+            np.testing.assert_array_equal(table.fixes.latitude, FixTable.from_file(path).fixes.latitude)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_version(self) -> None:
+        self.cache.load(SAMPLE)
+        old_directory = self.cache.version_directory
+        with mock.patch.object(cache_module, 'cache_version', return_value='0' * 16):
+            self.assertNotEqual(self.cache.version_directory, old_directory)
+            self.cache.load(SAMPLE)
+            self.assertEqual(self.cache.misses, 2)
+            self.assertFalse(os.path.exists(old_directory))
+        self.assertEqual(len(cache_version()), 16)
+
+    def test_eviction(self) -> None:
+        paths = [self.flight('{0}.igc'.format(i), 1000, seed=i) for i in range(4)]
+        for i, path in enumerate(paths):
+            self.cache.load(path)
+            # Время последнего использования задается явно, чтобы порядок не зависел от точности часов.
+            os.utime(self.cache.entry(file_hash(path)), (i, i))
+        entry_size = os.path.getsize(self.cache.entry(file_hash(paths[0])))
+
+        os.utime(self.cache.entry(file_hash(paths[0])), (10, 10))
+        self.cache.max_size = entry_size * 2 + entry_size // 2
+        self.cache.evict()
+        self.assertLessEqual(self.cache.size, self.cache.max_size)
+        self.assertEqual(
+            [os.path.exists(self.cache.entry(file_hash(path))) for path in paths], [True, False, False, True]
+        )
+
+    def test_empty_file(self) -> None:
+        path = os.path.join(self.directory, 'empty.igc')
+        open(path, 'wb').close()
+        self.assertEqual(len(self.cache.load(path)), 0)
+        self.assertEqual(len(self.cache.load(path)), 0)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_clear(self) -> None:
+        self.cache.load(SAMPLE)
+        self.cache.clear()
+        self.assertEqual(self.cache.size, 0)
+        self.assertEqual(self.cache.misses, 0)
+        self.assertEqual(os.listdir(self.cache.directory), [])
+
+    def test_shared_directory(self) -> None:
+        # Кэш в существующем каталоге не должен удалять чужие данные ни при вытеснении, ни при очистке.
+        cache = ParseCache(self.directory)
+        foreign = [os.path.join(self.directory, name) for name in ('data', '0123456789abcdef', 'igcrepair-old')]
+        for path in foreign:
+            os.makedirs(path)
+        cache.load(SAMPLE)
+        with mock.patch.object(cache_module, 'cache_version', return_value='0' * 16):
+            cache.load(SAMPLE)
+        cache.clear()
+        self.assertTrue(all(os.path.isdir(path) for path in foreign))
+        self.assertEqual(
+            sorted(name for name in os.listdir(self.directory) if name.startswith(cache_module.VERSION_PREFIX)),
+            ['igcrepair-old'],
+        )
+
+    def test_temporary_files_ignored(self) -> None:
+        self.cache.load(SAMPLE)
+        name = cache_module.TEMPORARY_PREFIX + 'abc' + cache_module.ENTRY_SUFFIX
+        temporary = os.path.join(self.cache.version_directory, name)
+        open(temporary, 'wb').close()
+        self.assertEqual(len(self.cache._entries()), 1)
+        self.cache.max_size = 0
+        self.cache.evict()
+        self.assertTrue(os.path.exists(temporary))
+        self.assertEqual(self.cache.size, 0)
+
+    @parameterized.expand([(module.__name__, module) for module in (constants, classifier, utils, mapped)])
+    def test_version_modules(self, _, module) -> None:
+        getsource = inspect.getsource
+        with mock.patch.object(
+            cache_module.inspect, 'getsource',
+            side_effect=lambda source: getsource(source) + ('#' if source is module else ''),
+        ):
+            self.assertNotEqual(cache_version.__wrapped__(), cache_version())
@@ -0,0 +1,89 @@
+import re
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from igcrepair.reader.batch import decode_rows_with_masks
+from igcrepair.reader.classifier import FieldClassifier, compile_classifier
+from igcrepair.reader.extensions_fields import ExtensionSubtype, NumberOfExtensions
+from igcrepair.reader.fields import (
+    RecordLiteral,
+    ManufacturerCode,
+    IDExtension,
+    TextString,
+    DataSource,
+    Validity,
+    Latitude,
+    Longitude,
+    PressureAltitude,
+    GNSSAltitude,
+)
+
+
+FIELDS = [
+    (RecordLiteral, ['B', 'b', 'G', 'X', 'BB', '']),
+    (ManufacturerCode, ['XCS', 'xc1', 'XC', 'XC-', 'XCSS']),
+    (IDExtension, ['', 'ABC123', 'abc', 'A B', 'A-1']),
+    (TextString, ['', 'Pilot Name', 'Пилот', 'a\rb', 'a\n']),
+    (DataSource, ['F', 'o', 'P', 'X', 'FF']),
+    (Validity, ['A', 'v', 'B', 'AV', '']),
+    (Latitude, ['5206343N', '5206343s', '5206343E', '520634XN', '52063430N', '5206343']),
+    (Longitude, ['00006198W', '00006198e', '00006198N', '0000619W', '0000-198W']),
+    (PressureAltitude, ['00587', '-0587', '--587', '0-587', '1234', '123456', '+0587']),
+    (GNSSAltitude, ['00558', '0055A', '-0558', '0558']),
+    (NumberOfExtensions, ['03', '3', '0A', '003']),
+    (ExtensionSubtype, ['FXA', 'l**', 'FX', 'FX-']),
+]
+
+
+class TestFieldClassifier(unittest.TestCase):
+
+    @parameterized.expand([(field.__name__, field, values) for field, values in FIELDS])
+    def test_match_array(self, _, field, values) -> None:
+        for width in {len(value.encode()) for value in values}:
+            same_width = [value.encode() for value in values if len(value.encode()) == width]
+            if not width:
+                continue
+            expected = [re.fullmatch(field.STRING_PATTERN, value.decode()) is not None for value in same_width]
+            columns = np.frombuffer(b''.join(same_width), dtype=np.uint8).reshape(len(same_width), width)
+            np.testing.assert_array_equal(field.STRING_CLASSES.match_array(columns), expected)
+            np.testing.assert_array_equal(field.STRING_CLASSES.match_array(np.array(same_width)), expected)
+
+    @parameterized.expand([(field.__name__, field) for field, _ in FIELDS])
+    def test_scalar_pattern_compiled(self, _, field) -> None:
+        # Отдельные значения проверяются скомпилированным выражением, таблицы - для векторной проверки.
+        self.assertIsInstance(field.STRING_PATTERN, re.Pattern)
+        self.assertIs(field.STRING_CLASSES.pattern, field.STRING_PATTERN)
+
+    def test_lookup(self) -> None:
+        classifier = compile_classifier(r'[0-][0-9]{2}x\d')
+        self.assertEqual(classifier.width, 5)
+        self.assertEqual(np.flatnonzero(classifier.lookup[0]).tolist(), [ord('-'), ord('0')])
+        self.assertEqual(np.flatnonzero(classifier.lookup[3]).tolist(), [ord('x')])
+        self.assertIs(compile_classifier(r'[0-][0-9]{2}x\d'), classifier)
+
+    def test_shared(self) -> None:
+        self.assertIs(ManufacturerCode.STRING_CLASSES, compile_classifier(ManufacturerCode.STRING_PATTERN))
+        self.assertIs(Latitude.STRING_CLASSES, compile_classifier(Latitude.STRING_PATTERN))
+
+    @parameterized.expand([
+        ('group', r'(AB){2}'),
+        ('alternation', r'A|B'),
+        ('range quantifier', r'[0-9]{2,3}'),
+        ('any', r'.{3}'),
+        ('after repeat', r'[A-Z]*[0-9]'),
+        ('non-ascii', r'[А-Я]{2}'),
+        ('word', r'\w{2}'),
+    ])
+    def test_unsupported(self, _, pattern) -> None:
+        with self.assertRaises(ValueError):
+            FieldClassifier(re.compile(pattern))
+
+    def test_decode_rows_masks(self) -> None:
+        lines = [b'B1101355206343N00006198WA0058700558', b'B1101355206343N00006198WX-05870055-']
+        rows = np.frombuffer(b''.join(lines), dtype=np.uint8).reshape(2, -1)
+        _, masks = decode_rows_with_masks(rows)
+        self.assertEqual(masks[Validity].tolist(), [True, False])
+        self.assertEqual(masks[PressureAltitude].tolist(), [True, True])
+        self.assertEqual(masks[GNSSAltitude].tolist(), [True, False])
@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from parameterized import parameterized
+
+from benchmarks.synthetic import synthetic_flight
+from igcrepair.reader.mapped import MappedIGCFile
+from igcrepair.reader.table import FixTable
+from igcrepair.writer import columnar
+from igcrepair.writer.columnar import Track, default_suffix, export_file, read_track, write_track
+
+
+SAMPLE = os.path.join(os.path.dirname(__file__), 'data', 'sample.igc')
+
+SUFFIXES = ['.npz'] + (['.arrow', '.feather', '.parquet'] if columnar.pyarrow is not None else [])
+
+
+class TestColumnar(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def assertTrackEqual(self, track: Track, expected: Track) -> None:
+        for column, expected_column in zip(track.fixes, expected.fixes):
+            self.assertEqual(column.dtype, expected_column.dtype)
+            np.testing.assert_array_equal(column, expected_column)
+        self.assertEqual(list(track.extensions), list(expected.extensions))
+        for subtype, values in expected.extensions.items():
+            self.assertEqual(track.extensions[subtype].dtype, values.dtype)
+            np.testing.assert_array_equal(track.extensions[subtype], values)
+        self.assertEqual(track.i_record, expected.i_record)
+
+    @parameterized.expand([(suffix, ) for suffix in SUFFIXES])
+    def test_export_file(self, suffix: str) -> None:
+        path = export_file(SAMPLE, os.path.join(self.directory, 'sample' + suffix))
+        with MappedIGCFile(SAMPLE) as file:
+            fixes, extensions = file.columns()
+            expected = Track(fixes, extensions, str(file.i_record))
+        track = read_track(path)
+        self.assertEqual(len(track), 3)
+        self.assertTrackEqual(track, expected)
+        self.assertEqual(track.extensions['FXA'].tolist(), [b'205', b'305', b'404'])
+
+    @parameterized.expand([(suffix, ) for suffix in SUFFIXES])
+    def test_without_extensions(self, suffix: str) -> None:
+        source = os.path.join(self.directory, 'flight.igc')
+        with open(source, 'wb') as file:
+            file.write(synthetic_flight(500))
+        track = read_track(export_file(source, os.path.join(self.directory, 'flight' + suffix)))
+        self.assertIsNone(track.i_record)
+        self.assertEqual(track.extensions, {})
+        self.assertTrackEqual(track, Track(FixTable.from_file(source).fixes, {}))
+
+    @parameterized.expand([(suffix, ) for suffix in SUFFIXES])
+    def test_empty(self, suffix: str) -> None:
+        with MappedIGCFile(SAMPLE) as file:
+            fixes, extensions = file.columns(10)
+        path = os.path.join(self.directory, 'empty' + suffix)
+        write_track(path, Track(fixes, extensions, 'I00'))
+        self.assertTrackEqual(read_track(path), Track(fixes, extensions, 'I00'))
+
+    def test_memory_map(self) -> None:
+        path = export_file(SAMPLE, os.path.join(self.directory, 'sample.npz'))
+        track = read_track(path)
+        self.assertFalse(track.fixes.latitude.flags.writeable)
+        self.assertFalse(track.fixes.latitude.flags.owndata)
+
+    def test_without_pyarrow(self) -> None:
+        with mock.patch.object(columnar, 'pyarrow', None):
+            self.assertEqual(default_suffix(), '.npz')
+            path = export_file(shutil.copy(SAMPLE, self.directory))
+            self.assertTrue(path.endswith('.npz'))
+            self.assertEqual(len(read_track(path)), 3)
+            with self.assertRaisesRegex(ImportError, 'pyarrow'):
+                export_file(SAMPLE, os.path.join(self.directory, 'sample.arrow'))
+
+    def test_unknown_format(self) -> None:
+        with self.assertRaisesRegex(ValueError, 'Неизвестный формат'):
+            export_file(SAMPLE, os.path.join(self.directory, 'sample.csv'))
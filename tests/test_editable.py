@@ -0,0 +1,244 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from parameterized import parameterized
+
+from benchmarks.synthetic import synthetic_flight
+from igcrepair.reader.fields import Latitude, Validity
+from igcrepair.reader.records import BRecord
+from igcrepair.reader.utils import RecordError, RecordFieldError
+from igcrepair.repair.editable import EditableTrack
+
+
+SAMPLE = os.path.join(os.path.dirname(__file__), 'data', 'sample.igc')
+
+
+class TestEditableTrack(unittest.TestCase):
+
+    def setUp(self):
+        with open(SAMPLE, 'rb') as file:
+            self.data = file.read()
+        self.lines = self.data.split(b'\n')
+        self.track = EditableTrack(self.data)
+
+    def test_index(self):
+        self.assertEqual(len(self.track), 3)
+        self.assertIs(self.track[0], self.track[0])
+        self.assertIs(self.track[-1], self.track[2])
+        self.assertIsInstance(self.track[1], BRecord)
+        self.assertEqual(str(self.track[2]), 'B1603405407143N00249366WV002880042940409952')
+        self.assertEqual(self.track.i_record.values(str(self.track[0])), self.track[0].extensions)
+        with self.assertRaises(IndexError):
+            self.track[3]
+
+    def test_unchanged(self):
+        self.track[0], self.track[1]
+        self.assertEqual(self.track.patch(), [])
+        self.assertEqual(self.track.data, self.data)
+
+    @parameterized.expand([
+        ('latitude', lambda record: setattr(record.latitude, 'dd', -54.5), b'5430000S00249342WA00280004212'),
+        ('longitude', lambda record: setattr(record.longitude, 'dd', 2.), b'5407121N00200000EA00280004212'),
+        ('pressure', lambda record: setattr(record.pressure_altitude, 'value', -15), b'5407121N00249342WA-00150042'),
+        ('gnss', lambda record: setattr(record.gnss_altitude, 'value', 7), b'5407121N00249342WA0028000007'),
+        ('validity', lambda record: setattr(record, 'validity', Validity.from_string('V')), b'00249342WV0028'),
+        ('validity value', lambda record: setattr(record.validity, 'value', 'V'), b'00249342WV0028'),
+        ('field', lambda record: setattr(record, 'latitude', Latitude(1.)), b'B1602400100000N00249342WA'),
+        ('extension', lambda record: record.extensions.__setitem__('ENL', '123'), b'042120509123\r'),
+    ])
+    def test_edit(self, _, edit, line):
+        edit(self.track[0])
+        self.assertEqual(self.track.dirty, [0])
+        self.track.patch()
+        self.assertEqual(self.track.dirty, [])
+        lines = self.track.data.split(b'\n')
+        self.assertIn(line, lines[10] + b'\r')
+        self.assertEqual(lines[:10] + lines[11:], self.lines[:10] + self.lines[11:])
+
+    def test_assigned_field_is_tracked(self):
+        record = self.track[0]
+        latitude = Latitude(1.)
+        record.latitude = latitude
+        self.track.patch()
+        record.latitude.dd = 2.
+        self.assertEqual(self.track.dirty, [0])
+        latitude.dd = 3.
+        self.assertEqual(record.latitude.dd, 2.)
+
+    def test_validation(self):
+        with self.assertRaises(RecordFieldError):
+            self.track[0].latitude.dd = 91.
+        with self.assertRaises(RecordFieldError):
+            self.track[0].pressure_altitude.value = 10_000
+        self.track[0].extensions['ENL'] = '12'
+        with self.assertRaisesRegex(RecordError, 'Строка 11'):
+            self.track.patch()
+
+    def test_dirty_ranges(self):
+        track = EditableTrack(synthetic_flight(100))
+        for i in (3, 4, 5, 10, 50, 51):
+            track[i].gnss_altitude.value = 100
+        track.mark(99)
+        self.assertEqual(track.dirty_ranges(), [(3, 6), (10, 11), (50, 52), (99, 100)])
+
+    def test_length_change(self):
+        self.track[0].extensions['ENL'] = '12345'
+        self.track[2].pressure_altitude.value = 1
+        self.track.patch()
+        lines = self.track.data.split(b'\n')
+        self.assertEqual(lines[10], b'B1602405407121N00249342WA00280004212050912345')
+        self.assertEqual(lines[14], b'B1603405407143N00249366WV000010042940409952')
+        self.assertEqual(lines[:10] + lines[11:14] + lines[15:], self.lines[:10] + self.lines[11:14] + self.lines[15:])
+
+        self.track[1].validity = Validity.from_string('V')
+        self.track.patch()
+        self.assertEqual(self.track.data.split(b'\n')[11], b'B1603105407132N00249354WV002840042530509951')
+
+    @parameterized.expand([
+        ('del', lambda extensions: extensions.__delitem__('ENL')),
+        ('pop', lambda extensions: extensions.pop('ENL')),
+        ('clear', lambda extensions: extensions.clear()),
+    ])
+    def test_extension_delete(self, _, delete):
+        with self.assertRaisesRegex(RecordFieldError, 'нельзя удалить'):
+            delete(self.track[0].extensions)
+        self.assertEqual(self.track[0].extensions['ENL'], '950')
+        self.assertEqual(self.track.dirty, [])
+
+    def test_extensions_replaced_without_declared(self):
+        self.track[0].extensions = {'FXA': '001'}
+        with self.assertRaisesRegex(RecordFieldError, 'Строка 11: Дополнение ENL') as context:
+            self.track.patch()
+        self.assertEqual(context.exception.field, 'ENL')
+        self.assertEqual(self.track.data, self.data)
+
+    def test_record_error(self):
+        track = EditableTrack(self.data.replace(b'B1603105407132N', b'B1663105407132N'))
+        with self.assertRaisesRegex(RecordFieldError, 'Строка 12'):
+            track[1]
+
+
+class TestUndeclaredBytes(unittest.TestCase):
+
+    DATA = (
+        b'AXCSAAA\r\n'
+        b'I023638FXA4143ENL\r\n'
+        b'B1101355206343N00006198WA0058700558010XX195\r\n'
+        b'B1101365206343N00006198WA0058700558010XX195ZZ\r\n'
+    )
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'flight.igc')
+        with open(self.path, 'wb') as file:
+            file.write(self.DATA)
+
+    def test_gap(self):
+        track = EditableTrack.open(self.path)
+        track[0].pressure_altitude.value = 1
+        track.save()
+        with open(self.path, 'rb') as file:
+            lines = file.read().split(b'\r\n')
+        self.assertEqual(lines[2], b'B1101355206343N00006198WA0000100558010XX195')
+        self.assertEqual(lines[3], self.DATA.split(b'\r\n')[3])
+
+    def test_trailing(self):
+        track = EditableTrack.open(self.path)
+        track[1].extensions['ENL'] = '200'
+        track[1].latitude.dd = 1.
+        patches = track.patch()
+        self.assertEqual(patches[0][2], b'B1101360100000N00006198WA0058700558010XX200ZZ')
+        self.assertEqual(bytes(track.data).split(b'\r\n')[2], self.DATA.split(b'\r\n')[2])
+
+    def test_extension_length_change(self):
+        track = EditableTrack.open(self.path)
+        track[1].extensions['FXA'] = '0100'
+        track.patch()
+        self.assertEqual(bytes(track.data).split(b'\r\n')[3], b'B1101365206343N00006198WA00587005580100XX195ZZ')
+
+
+class TestSave(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'flight.igc')
+        self.data = synthetic_flight(50_000)
+        with open(self.path, 'wb') as file:
+            file.write(self.data)
+
+    def read(self, path=None) -> bytes:
+        with open(path or self.path, 'rb') as file:
+            return file.read()
+
+    def test_in_place(self):
+        track = EditableTrack.open(self.path)
+        for i in (0, 25_000, 49_999):
+            track[i].pressure_altitude.value = 1234
+        track.save()
+        self.assertEqual(self.read(), bytes(track.data))
+        lines = self.read().split(b'\r\n')
+        for i in (0, 25_000, 49_999):
+            self.assertEqual(lines[4 + i][25:30], b'01234')
+        self.assertEqual(sum(a != b for a, b in zip(lines, self.data.split(b'\r\n'))), 3)
+
+    def test_validity_in_place(self):
+        track = EditableTrack.open(self.path)
+        self.assertEqual(track[5].validity.value, 'A')
+        track[5].validity.value = 'V'
+        self.assertEqual(track.dirty, [5])
+        track.save()
+        self.assertEqual(Validity.from_string('A').value, 'A')
+        lines = self.read().split(b'\r\n')
+        self.assertEqual(lines[9], self.data.split(b'\r\n')[9].replace(b'A', b'V', 1))
+        self.assertEqual(EditableTrack.open(self.path)[5].validity.value, 'V')
+
+    def test_only_dirty_lines_serialized(self):
+        track = EditableTrack.open(self.path)
+        track[7].latitude.dd = 1.
+        track[8]
+        patches = track.patch()
+        self.assertEqual([start for start, _, _ in patches], [int(track.starts[7])])
+
+    def test_length_change(self):
+        track = EditableTrack.open(self.path)
+        track[3].extensions['ENL'] = '001'
+        track.save()
+        self.assertEqual(self.read(), bytes(track.data))
+        self.assertEqual(self.read().split(b'\r\n')[7], self.data.split(b'\r\n')[7] + b'001')
+
+    def test_repeated_saves(self):
+        track = EditableTrack.open(self.path)
+        track[0]
+        track.save()
+        track[1].latitude.dd = 1.
+        track.save()
+        track.mark(2)
+        track.save()
+        self.assertEqual(self.read(), bytes(track.data))
+        self.assertEqual(EditableTrack.open(self.path)[1].latitude.dd, 1.)
+
+    def test_other_path(self):
+        track = EditableTrack.open(self.path)
+        track[0].gnss_altitude.value = 1
+        destination = self.path + '.new'
+        track.save(destination)
+        self.assertEqual(self.read(), self.data)
+        self.assertEqual(self.read(destination), bytes(track.data))
+
+    def test_data_differs_from_file(self):
+        data = synthetic_flight(50_000, seed=1)
+        track = EditableTrack(data, self.path)
+        track[0].gnss_altitude.value = 1
+        track.save()
+        self.assertEqual(self.read(), bytes(track.data))
+        track[1].gnss_altitude.value = 2
+        track.save()
+        self.assertEqual(self.read(), bytes(track.data))
+
+    def test_no_path(self):
+        with self.assertRaises(ValueError):
+            EditableTrack(self.data).save()
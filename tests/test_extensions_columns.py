@@ -0,0 +1,105 @@
+import os
+import time
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from igcrepair.reader.batch import split_lines
+from igcrepair.reader.extensions_columns import (
+    EXTENSION_TYPES,
+    decode_extension_column,
+    decode_extensions,
+    register_extension_type,
+)
+from igcrepair.reader.layout import compile_layout
+from igcrepair.reader.mapped import MappedIGCFile
+from igcrepair.reader.utils import RecordFieldError
+
+
+SAMPLE = os.path.join(os.path.dirname(__file__), 'data', 'sample.igc')
+
+
+def columns(*values: bytes) -> np.ndarray:
+    return np.array(values).view(np.uint8).reshape(len(values), -1)
+
+
+class TestDecodeExtensionColumn(unittest.TestCase):
+
+    @parameterized.expand([
+        ('ENL', [b'000', b'950', b' 12'], np.int16, [0, 950, 12]),
+        ('AOP', [b'-45', b'+30', b'090'], np.int16, [-45, 30, 90]),
+        ('RPM', [b'09999', b'45000'], np.int32, [9999, 45000]),
+        ('ATS', [b'10132', b'09957'], np.float32, [1013.2, 995.7]),
+        ('ATS', [b'1013.2', b'0995.7'], np.float32, [1013.2, 995.7]),
+        ('ACZ', [b'-12', b'+35', b'010'], np.float32, [-1.2, 3.5, 1.]),
+        ('ACZ', [b'-1.2', b' 3.5'], np.float32, [-1.2, 3.5]),
+        ('TDS', [b'5', b'0'], np.float32, [.5, 0.]),
+        ('TDS', [b'25'], np.float32, [.25]),
+    ])
+    def test_values(self, subtype, values, dtype, expected):
+        decoded, valid = decode_extension_column(subtype, columns(*values))
+        self.assertEqual(decoded.dtype, dtype)
+        self.assertTrue(valid.all())
+        np.testing.assert_array_equal(decoded, np.array(expected, dtype=dtype))
+
+    @parameterized.expand([
+        ('letters', 'ENL', b'1A2'),
+        ('spaces', 'ENL', b'   '),
+        ('late sign', 'AOP', b'4-5'),
+        ('two points', 'ATS', b'1.1.1'),
+        ('point in integer', 'ENL', b'1.2'),
+        ('overflow', 'AOP', b'99999'),
+    ])
+    def test_invalid(self, _, subtype, value):
+        _, valid = decode_extension_column(subtype, columns(value))
+        self.assertFalse(valid[0])
+
+    def test_registry(self):
+        self.addCleanup(EXTENSION_TYPES.pop, 'LCU', None)
+        raw = {'LCU': np.array([b'123'])}
+        self.assertEqual(decode_extensions(raw)['LCU'].tolist(), [b'123'])
+        register_extension_type('lcu', np.float32, 2)
+        self.assertEqual(decode_extensions(raw)['LCU'].tolist(), [np.float32(1.23)])
+        with self.assertRaises(ValueError):
+            register_extension_type('LCU', np.int16, 1)
+        with self.assertRaises(ValueError):
+            register_extension_type('LCU', 'S3')
+
+    def test_decode_extensions_error(self):
+        with self.assertRaisesRegex(RecordFieldError, 'ENL в B-записи номер 2'):
+            decode_extensions({'ENL': np.array([b'001', b'0X1'])})
+
+
+class TestTypedLayout(unittest.TestCase):
+
+    def test_sample(self):
+        with MappedIGCFile(SAMPLE) as file:
+            fixes, raw = file.columns()
+            typed_fixes, typed = file.columns(typed=True)
+        np.testing.assert_array_equal(typed_fixes.latitude, fixes.latitude)
+        for subtype, values in raw.items():
+            np.testing.assert_array_equal(typed[subtype], values.astype(np.int64))
+            self.assertEqual(typed[subtype].dtype, np.int16)
+
+    def test_aerobatic(self):
+        # 8 Гц: доли секунды, ускорения, угловые скорости и углы ориентации.
+        n_fixes = 200_000
+        rng = np.random.default_rng(0)
+        layout = compile_layout('I093636TDS3740ACX4144ACY4548ACZ4952ANX5356ANY5760ANZ6164AOP6568AOR')
+        tds = rng.integers(0, 10, n_fixes)
+        acz = rng.integers(-99, 100, n_fixes)
+        aor = rng.integers(-180, 181, n_fixes)
+        lines = [
+            'B1200004500000N00700000EA0100001100{0}{1:+04d}{1:+04d}{1:+04d}{1:+04d}{1:+04d}{1:+04d}{2:+04d}{2:+04d}'
+            .format(t, z, r) for t, z, r in zip(tds.tolist(), acz.tolist(), aor.tolist())
+        ]
+        data = np.frombuffer('\n'.join(lines).encode(), dtype=np.uint8)
+        starts, lengths = split_lines(data)
+        start = time.perf_counter()
+        _, extensions = layout.decode_lines(data, starts, lengths, typed=True)
+        self.assertLess(time.perf_counter() - start, 2.)
+        np.testing.assert_array_equal(extensions['TDS'], (tds / 10).astype(np.float32))
+        np.testing.assert_array_equal(extensions['ACZ'], (acz / 10).astype(np.float32))
+        np.testing.assert_array_equal(extensions['AOR'], aor.astype(np.int16))
+        self.assertEqual(extensions['ANX'].dtype, np.int16)
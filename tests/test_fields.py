@@ -2,6 +2,7 @@ import datetime
 import unittest
 from typing import Type, Any, Union
 
+import numpy as np
 from parameterized import parameterized
 
 from igcrepair.reader.fields import (
@@ -12,13 +13,16 @@ from igcrepair.reader.fields import (
     UniqueID,
     IDExtension,
     Validity,
+    InternedField,
     TimeUTC,
     Latitude,
     Longitude,
     PressureAltitude,
     GNSSAltitude,
+    Coordinates,
+    round_array,
 )
-from igcrepair.reader.extensions_fields import Extension
+from igcrepair.reader.extensions_fields import Extension, ExtensionSubtype, StartByteNumber
 
 
 class BaseTestString(unittest.TestCase):
@@ -275,6 +279,9 @@ class TestTimeUTC(unittest.TestCase):
             ('010560', r'Формат даты для поля .* не соответствует формату .*\.'),
             ('016000', r'Формат даты для поля .* не соответствует формату .*\.'),
             ('250500', r'Формат даты для поля .* не соответствует формату .*\.'),
+            ('01 510', r'Формат даты для поля .* не соответствует формату .*\.'),
+            ('-10510', r'Формат даты для поля .* не соответствует формату .*\.'),
+            ('０１０５１０', r'Формат даты для поля .* не соответствует формату .*\.'),
             (True, r'Передаваемое значение должно быть типа <str>\.'),
             (False, r'Передаваемое значение должно быть типа <str>\.'),
             (None, r'Передаваемое значение должно быть типа <str>\.'),
@@ -284,6 +291,55 @@ class TestTimeUTC(unittest.TestCase):
     def test_from_string_exception(self, value: Any, msg: str) -> None:
         with self.assertRaisesRegex(RecordFieldError, msg):
             TimeUTC.from_string(value)
+        with self.assertRaisesRegex(RecordFieldError, msg):
+            TimeUTC.seconds_from_string(value)
+        with self.assertRaisesRegex(RecordFieldError, msg):
+            TimeUTC.seconds_from_strings(['000000', value])
+
+    @parameterized.expand(
+        [
+            ('010510', 3910),
+            ('000000', 0),
+            ('235959', 86399),
+        ]
+    )
+    def test_seconds(self, string: str, expected_seconds: int) -> None:
+        self.assertEqual(TimeUTC.seconds_from_string(string), expected_seconds)
+        self.assertEqual(TimeUTC.from_string(string).seconds, expected_seconds)
+        self.assertEqual(str(TimeUTC.from_seconds(expected_seconds)), string)
+
+    def test_seconds_bulk(self) -> None:
+        strings = ['{0:02d}{1:02d}{2:02d}'.format(h, m, s) for h in range(24) for m in range(0, 60, 7) for s in range(60)]
+        expected = [TimeUTC.from_string(string).seconds for string in strings]
+        seconds = TimeUTC.seconds_from_strings(strings)
+        self.assertEqual(seconds.dtype, np.int32)
+        self.assertEqual(seconds.tolist(), expected)
+        self.assertEqual(TimeUTC.seconds_from_bytes(''.join(strings).encode()).tolist(), expected)
+        self.assertEqual(len(TimeUTC.seconds_from_strings([])), 0)
+
+    @parameterized.expand(
+        [
+            (b'01051', ),
+            (b'010560', ),
+            (b'24000000000', ),
+            (b'00000a', ),
+        ]
+    )
+    def test_seconds_from_bytes_exception(self, buffer: bytes) -> None:
+        with self.assertRaisesRegex(RecordFieldError, r'Формат даты для поля TimeUTC'):
+            TimeUTC.seconds_from_bytes(buffer)
+
+    @parameterized.expand(
+        [
+            (-1, ),
+            (86400, ),
+            (1., ),
+            ('0', ),
+        ]
+    )
+    def test_from_seconds_exception(self, seconds: Any) -> None:
+        with self.assertRaisesRegex(RecordFieldError, r'Количество секунд должно быть в промежутке'):
+            TimeUTC.from_seconds(seconds)
 
 
 class TestLatitude(unittest.TestCase):
@@ -354,6 +410,18 @@ class TestLatitude(unittest.TestCase):
         latitude = Latitude.from_string(string)
         self.assertEqual(latitude.dd, expected_dd)
 
+    @parameterized.expand(
+        [
+            ('0000000N', ),
+            ('5407121N', ),
+            ('0559999S', ),
+            ('8959999N', ),
+            ('9000000S', ),
+        ]
+    )
+    def test_str(self, string: str) -> None:
+        self.assertEqual(str(Latitude.from_string(string)), string)
+
     @parameterized.expand(
         [
             (0., 0, 0, 'S', 'degrees должен быть типа <int>.'),
@@ -461,6 +529,17 @@ class TestLongitude(unittest.TestCase):
         longitude = Longitude.from_string(string)
         self.assertEqual(longitude.dd, expected_dd)
 
+    @parameterized.expand(
+        [
+            ('00249342W', ),
+            ('00259999E', ),
+            ('17959999W', ),
+            ('18000000E', ),
+        ]
+    )
+    def test_str(self, string: str) -> None:
+        self.assertEqual(str(Longitude.from_string(string)), string)
+
     @parameterized.expand(
         [
             ('18000000S', 'Неправильный формат долготы.'),
@@ -476,6 +555,83 @@ class TestLongitude(unittest.TestCase):
             Longitude.from_string(string)
 
 
+class TestCoordinatesArray(unittest.TestCase):
+
+    def values(self, field: Type[Coordinates]) -> np.ndarray:
+        rng = np.random.default_rng(0)
+        bound = field.BOUNDS[1]
+        return np.concatenate(
+            [
+                rng.uniform(-bound, bound, 2000),
+                rng.integers(-bound * 60000, bound * 60000, 2000) / 60000,
+                [0., -0., bound, -bound, 1 - 0.0000001, -(bound - 1) - 0.99999999, 12.9999999999],
+            ]
+        )
+
+    def test_round_array(self) -> None:
+        rng = np.random.default_rng(1)
+        values = np.concatenate([rng.uniform(0, 60, 20000), np.arange(-10000, 10000) / 2e10])
+        expected = np.array([round(float(value), 10) for value in values])
+        np.testing.assert_array_equal(round_array(values, 10).view(np.int64), expected.view(np.int64))
+
+    @parameterized.expand([(Latitude, ), (Longitude, )])
+    def test_to_arrays(self, field: Type[Coordinates]) -> None:
+        values = self.values(field)
+        degrees, decimal_minutes, sides = field.to_dmm_array(values)
+        dms = field.to_dms_array(values)
+        strings = field.format_array(values)
+        for i, value in enumerate(values):
+            coordinates = field(float(value))
+            self.assertEqual(coordinates.dmm, (degrees[i], decimal_minutes[i], sides[i]))
+            self.assertEqual(coordinates.dms, tuple(column[i] for column in dms))
+            self.assertEqual(str(coordinates).encode(), strings[i])
+
+    @parameterized.expand([(Latitude, ), (Longitude, )])
+    def test_from_arrays(self, field: Type[Coordinates]) -> None:
+        values = self.values(field)
+        strings = field.format_array(values)
+        dd = field.from_string_array(strings)
+        self.assertEqual(dd.tolist(), [field.from_string(string.decode()).dd for string in strings])
+        np.testing.assert_array_equal(field.from_string_array([string.decode() for string in strings]), dd)
+
+        degrees, decimal_minutes, sides = field.to_dmm_array(values)
+        self.assertEqual(
+            field.from_dmm_array(degrees, decimal_minutes, sides).tolist(),
+            [field.from_dmm(int(d), float(m), str(s)).dd for d, m, s in zip(degrees, decimal_minutes, sides)],
+        )
+        degrees, minutes, decimal_seconds, sides = field.to_dms_array(values)
+        self.assertEqual(
+            field.from_dms_array(degrees, minutes, decimal_seconds, sides).tolist(),
+            [
+                field.from_dms(int(d), int(m), float(s), str(side)).dd
+                for d, m, s, side in zip(degrees, minutes, decimal_seconds, sides)
+            ],
+        )
+
+    @parameterized.expand(
+        [
+            (Latitude, ['5206343N', '5206343X'], 'Неправильный формат широты. Элемент 1.'),
+            (Latitude, ['5206343N', '52063434N'], 'Неправильный формат широты.'),
+            (Latitude, ['9100000N'], 'Неправильный формат широты. Элемент 0.'),
+            (Latitude, ['520634ЗN'], 'Неправильный формат широты.'),
+            (Longitude, ['00006198w', '0000619aW'], 'Неправильный формат долготы. Элемент 1.'),
+        ]
+    )
+    def test_from_string_array_exception(self, field: Type[Coordinates], strings: list, expected_msg: str) -> None:
+        with self.assertRaisesRegex(RecordFieldError, expected_msg):
+            field.from_string_array(strings)
+
+    def test_empty(self) -> None:
+        self.assertEqual(Latitude.from_string_array([]).size, 0)
+        self.assertEqual(Longitude.format_array([]).size, 0)
+
+    def test_out_of_bounds(self) -> None:
+        with self.assertRaisesRegex(RecordFieldError, 'decimal_degrees'):
+            Latitude.format_array([10., 90.5])
+        with self.assertRaisesRegex(RecordFieldError, 'side'):
+            Latitude.from_dmm_array([1], [1.], ['E'])
+
+
 class TestPressureAltitude(unittest.TestCase):
 
     @parameterized.expand(
@@ -533,6 +689,73 @@ class TestGNSSAltitude(unittest.TestCase):
             GNSSAltitude(value)
 
 
+class TestInternedField(unittest.TestCase):
+
+    @parameterized.expand(
+        [
+            (RecordLiteral, 'b', 'B'),
+            (Validity, 'A', 'A'),
+            (ManufacturerCode, 'xcs', 'XCS'),
+            (ExtensionSubtype, 'FXA', 'FXA'),
+            (StartByteNumber, '36', 36),
+        ]
+    )
+    def test_from_string(self, field: Type[InternedField], string: str, expected_value: Union[str, int]) -> None:
+        field.cache_clear()
+        first = field.from_string(string)
+        second = field.from_string(string)
+        self.assertIs(first, second)
+        self.assertEqual(second.value, expected_value)
+        self.assertEqual(field.cache_info(), (1, 1, field.CACHE_SIZE, 1))
+
+        with self.assertRaisesRegex(RecordFieldError, 'нельзя изменить'):
+            first.value = expected_value
+        self.assertEqual(second.value, expected_value)
+
+    @parameterized.expand(
+        [
+            (Validity, 'A', 'V'),
+            (ManufacturerCode, 'xcs', 'LXN'),
+            (ExtensionSubtype, 'FXA', 'ENL'),
+            (StartByteNumber, '36', 38),
+        ]
+    )
+    def test_constructed_mutable(self, field: Type[InternedField], string: str, new_value: Union[str, int]) -> None:
+        field.cache_clear()
+        shared = field.from_string(string)
+        constructed = field(shared.value)
+        constructed.value = new_value
+        self.assertEqual(str(constructed.value), str(new_value).upper())
+        with self.assertRaisesRegex(RecordFieldError, 'нельзя изменить'):
+            shared.value = new_value
+        self.assertIs(field.from_string(string), shared)
+        self.assertNotEqual(str(shared.value), str(new_value).upper())
+
+    def test_cache_size(self) -> None:
+        StartByteNumber.cache_clear()
+        self.addCleanup(setattr, StartByteNumber, 'CACHE_SIZE', StartByteNumber.CACHE_SIZE)
+        StartByteNumber.CACHE_SIZE = 10
+        fields = [StartByteNumber.from_string('{0:02d}'.format(i)) for i in range(100)]
+        self.assertEqual([field.value for field in fields], list(range(100)))
+        self.assertEqual(StartByteNumber.cache_info(), (0, 100, 10, 10))
+
+    def test_separate_caches(self) -> None:
+        self.assertIsNot(RecordLiteral._interned, Validity._interned)
+        self.assertIsNot(RecordLiteral.from_string('A'), Validity.from_string('A'))
+
+    @parameterized.expand([(None, ), (1, ), (['A'], ), (b'A', )])
+    def test_from_string_type(self, value: Any) -> None:
+        with self.assertRaisesRegex(RecordFieldError, r'Передаваемое значение должно быть типа \<str\>\.'):
+            Validity.from_string(value)
+
+    def test_invalid_not_cached(self) -> None:
+        Validity.cache_clear()
+        for _ in range(2):
+            with self.assertRaises(RecordFieldError):
+                Validity.from_string('X')
+        self.assertEqual(Validity.cache_info(), (0, 2, Validity.CACHE_SIZE, 0))
+
+
 class TestExtension(unittest.TestCase):
 
     @parameterized.expand(
@@ -0,0 +1,154 @@
+import time
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from igcrepair.reader.batch import Fixes
+from igcrepair.repair.gaps import LINEAR, SPLINE, estimate_interval, find_bad_fixes, repair_gaps
+from igcrepair.repair.geo import distance, wrap_longitude
+from tests.helpers import fixes
+
+
+# Потеря GPS на двух точках (V, координаты повторяются) и пропуск записи между 4 и 8 секундами.
+TRACK = fixes(
+    time=[0, 1, 2, 3, 4, 8, 9],
+    latitude=[0., .001, .001, .001, .004, .008, .009],
+    longitude=[10., 10., 10., 10., 10., 10., 10.],
+    validity=[True, True, False, False, True, True, True],
+    pressure_altitude=[100, 101, 105, 103, 104, 108, 109],
+    gnss_altitude=[110, 111, 0, 0, 114, 118, 119],
+)
+
+
+class TestGeo(unittest.TestCase):
+
+    def test_distance(self):
+        self.assertAlmostEqual(float(distance(0., 0., 1., 0.)), 111_195., delta=1.)
+        self.assertAlmostEqual(float(distance(0., 179.9, 0., -179.9)), float(distance(0., 0., 0., .2)))
+        self.assertEqual(float(distance(45., 45., 45., 45.)), 0.)
+
+    def test_wrap_longitude(self):
+        np.testing.assert_array_equal(wrap_longitude(np.array([181., -181., 10., 540.])), [-179., 179., 10., -180.])
+
+
+class TestFindBadFixes(unittest.TestCase):
+
+    def test_masks(self):
+        invalid, same = find_bad_fixes(TRACK)
+        np.testing.assert_array_equal(invalid, [0, 0, 1, 1, 0, 0, 0])
+        np.testing.assert_array_equal(same, [0, 0, 1, 1, 0, 0, 0])
+        _, same = find_bad_fixes(TRACK, repeated=False)
+        self.assertFalse(same.any())
+
+    @parameterized.expand([
+        ([0, 1, 2, 3], 1),
+        ([0, 4, 8, 9, 12, 16], 4),
+        ([86398, 86399, 0, 1], 1),
+        ([5], 1),
+    ])
+    def test_estimate_interval(self, time, interval):
+        self.assertEqual(estimate_interval(np.array(time)), interval)
+
+
+class TestRepairGaps(unittest.TestCase):
+
+    def test_linear(self):
+        extensions = {'ENL': np.array([b'01', b'02', b'03', b'04', b'05', b'06', b'07'])}
+        repair = repair_gaps(TRACK, extensions)
+        result = repair.fixes
+        np.testing.assert_array_equal(result.time, np.arange(10))
+        np.testing.assert_allclose(result.latitude, [0., .001, .002, .003, .004, .005, .006, .007, .008, .009])
+        np.testing.assert_array_equal(result.longitude, 10.)
+        np.testing.assert_array_equal(result.validity, [1, 1, 0, 0, 1, 0, 0, 0, 1, 1])
+        # Барометрическая высота потерянных точек сохраняется, GNSS-высота идет за ней.
+        np.testing.assert_array_equal(result.pressure_altitude, [100, 101, 105, 103, 104, 105, 106, 107, 108, 109])
+        np.testing.assert_array_equal(result.gnss_altitude, [110, 111, 115, 113, 114, 115, 116, 117, 118, 119])
+        np.testing.assert_array_equal(repair.source, [0, 1, 2, 3, 4, -1, -1, -1, 5, 6])
+        np.testing.assert_array_equal(repair.extensions['ENL'], [b'01', b'02', b'03', b'04', b'05', b'05', b'05', b'05',
+                                                                 b'06', b'07'])
+
+        segments = repair.segments
+        self.assertEqual(len(segments), 2)
+        np.testing.assert_array_equal(segments['start'], [2, 5])
+        np.testing.assert_array_equal(segments['stop'], [4, 8])
+        np.testing.assert_array_equal(segments['time'], [1, 4])
+        np.testing.assert_array_equal(segments['duration'], [3, 4])
+        np.testing.assert_array_equal(segments['invalid'], [2, 0])
+        np.testing.assert_array_equal(segments['repeated'], [0, 0])
+        np.testing.assert_array_equal(segments['inserted'], [0, 3])
+        np.testing.assert_array_equal(segments['filled'], [True, True])
+        self.assertAlmostEqual(segments['max_shift'][0], float(distance(.001, 10., .003, 10.)), places=3)
+        self.assertEqual(segments['max_shift'][1], 0.)
+
+    def test_spline_follows_curve(self):
+        time = np.arange(20)
+        latitude = 1e-4 * time ** 2
+        validity = np.ones(20, dtype=bool)
+        validity[8:12] = False
+        track = fixes(time, latitude, np.zeros(20), validity, np.zeros(20), np.zeros(20))
+        linear = repair_gaps(track, method=LINEAR).fixes.latitude
+        spline = repair_gaps(track, method=SPLINE).fixes.latitude
+        error_linear = np.abs(linear - latitude)[8:12].max()
+        error_spline = np.abs(spline - latitude)[8:12].max()
+        self.assertLess(error_spline, error_linear / 5)
+        np.testing.assert_array_equal(spline[validity], latitude[validity])
+
+    def test_repeated_with_valid_flag(self):
+        track = fixes([0, 1, 2, 3], [0., 1., 1., 3.], [0., 0., 0., 0.], [1, 1, 1, 1], [0] * 4, [0] * 4)
+        repair = repair_gaps(track)
+        np.testing.assert_array_equal(repair.fixes.latitude, [0., 1., 2., 3.])
+        np.testing.assert_array_equal(repair.segments['repeated'], [1])
+        np.testing.assert_array_equal(repair_gaps(track, repeated=False).fixes.latitude, track.latitude)
+
+    def test_max_gap(self):
+        track = fixes([0, 1, 1000, 1001], [0., .001, .002, .003], [0.] * 4, [1, 1, 1, 1], [0] * 4, [0] * 4)
+        repair = repair_gaps(track, interval=1, max_gap=600)
+        self.assertEqual(len(repair.fixes.time), 4)
+        np.testing.assert_array_equal(repair.segments['filled'], [False])
+        self.assertEqual(len(repair_gaps(track, interval=1, max_gap=1000).fixes.time), 1002)
+
+    def test_edges_unchanged(self):
+        track = fixes(
+            [0, 1, 2, 3, 4], [5., 5., 1., 2., 2.], [0.] * 5, [0, 0, 1, 1, 0], [0] * 5, [9] * 5
+        )
+        repair = repair_gaps(track)
+        for column, expected in zip(repair.fixes, track):
+            np.testing.assert_array_equal(column, expected)
+        self.assertEqual(len(repair.segments), 0)
+
+    def test_midnight(self):
+        track = fixes([86398, 86399, 1, 2], [0., .001, .003, .004], [0.] * 4, [1] * 4, [0] * 4, [0] * 4)
+        repair = repair_gaps(track)
+        np.testing.assert_array_equal(repair.fixes.time, [86398, 86399, 0, 1, 2])
+        np.testing.assert_allclose(repair.fixes.latitude, [0., .001, .002, .003, .004])
+
+    def test_antimeridian(self):
+        track = fixes([0, 1, 2], [0., 0., 0.], [179.9, 0., -179.9], [1, 0, 1], [0] * 3, [0] * 3)
+        self.assertAlmostEqual(abs(repair_gaps(track).fixes.longitude[1]), 180.)
+
+    def test_empty(self):
+        repair = repair_gaps(Fixes.empty())
+        self.assertEqual(len(repair.fixes.time), 0)
+        self.assertEqual(len(repair.segments), 0)
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            repair_gaps(TRACK, method='nearest')
+
+    def test_speed(self):
+        n_fixes = 1_000_000
+        rng = np.random.default_rng(0)
+        keep = rng.random(n_fixes) > 0.01
+        track = fixes(
+            ((43200 + np.arange(n_fixes)) % 86400)[keep],
+            (45 + np.cumsum(rng.normal(0, 1e-4, n_fixes)))[keep],
+            (10 + np.cumsum(rng.normal(0, 1e-4, n_fixes)))[keep],
+            (rng.random(n_fixes) > 0.02)[keep],
+            np.full(n_fixes, 1000)[keep],
+            np.full(n_fixes, 1040)[keep],
+        )
+        start = time.perf_counter()
+        repair = repair_gaps(track)
+        self.assertLess(time.perf_counter() - start, 3.)
+        self.assertEqual(len(repair.fixes.time), n_fixes)
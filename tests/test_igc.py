@@ -0,0 +1,186 @@
+import asyncio
+import io
+import os
+import tempfile
+import time
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from benchmarks.synthetic import HEADER, synthetic_flight
+from igcrepair.reader.aio import AsyncIGCReader, FixBatch
+from igcrepair.reader.batch import Fixes, split_lines
+from igcrepair.reader.layout import compile_layout
+from igcrepair.reader.mapped import MappedIGCFile
+from igcrepair.reader.records import IRecord, BRecord
+from igcrepair.reader.stream import IGCReader
+from igcrepair.reader.utils import RecordError, RecordFieldError
+from igcrepair.writer.igc import IGCWriter, format_b_records
+from tests.helpers import fixes
+
+
+SAMPLE = os.path.join(os.path.dirname(__file__), 'data', 'sample.igc')
+
+
+async def batches(data: bytes) -> list:
+    stream = asyncio.StreamReader()
+    stream.feed_data(data)
+    stream.feed_eof()
+    return [item async for item in AsyncIGCReader(stream, batch_size=2).batches()]
+
+
+class TestFormatBRecords(unittest.TestCase):
+
+    @parameterized.expand([
+        ('B1602405407121N00249342WA002800042120509950', 'I033638FXA3940SIU4143ENL'),
+        ('B0000000000000N00000000EV-999900000', None),
+        ('B2359599000000S18000000WA0999999999', None),
+        ('B1200004500000S00000001EA-000100050123', 'I013638ENL'),
+    ])
+    def test_matches_b_record(self, line, i_record):
+        i_record = IRecord.from_string(i_record) if i_record is not None else None
+        record = BRecord.from_string(line, i_record)
+        columns = fixes(
+            [record.time.seconds],
+            [record.latitude.dd],
+            [record.longitude.dd],
+            [record.validity.value == 'A'],
+            [record.pressure_altitude.value],
+            [record.gnss_altitude.value],
+        )
+        extensions = {subtype: np.array([value.encode()]) for subtype, value in record.extensions.items()}
+        self.assertEqual(format_b_records(columns, extensions, i_record, b'\n'), str(record).encode() + b'\n')
+
+    def test_empty(self):
+        extensions = {'ENL': np.array([], dtype='S3')}
+        self.assertEqual(format_b_records(Fixes.empty(), extensions, IRecord.from_string('I013638ENL')), b'')
+
+    @parameterized.expand([
+        ('time', fixes([86400], [0.], [0.], [True], [0], [0])),
+        ('latitude', fixes([0], [90.5], [0.], [True], [0], [0])),
+        ('longitude', fixes([0], [0.], [np.nan], [True], [0], [0])),
+        ('pressure', fixes([0], [0.], [0.], [True], [-10000], [0])),
+        ('gnss', fixes([0], [0.], [0.], [True], [0], [-1])),
+    ])
+    def test_out_of_bounds(self, _, columns):
+        with self.assertRaises(RecordFieldError):
+            format_b_records(columns)
+
+    @parameterized.expand([
+        ('missing', {}),
+        ('width', {'ENL': np.array([b'0001'])}),
+        ('length', {'ENL': np.array([b'001', b'002'])}),
+        ('dtype', {'ENL': np.array([1])}),
+    ])
+    def test_bad_extensions(self, _, extensions):
+        with self.assertRaises(RecordError):
+            format_b_records(fixes([0], [0.], [0.], [True], [0], [0]), extensions, IRecord.from_string('I013638ENL'))
+
+
+    @parameterized.expand([('I023636LAD3737LOD',), ('I033638ENL3940LAD4142LOD',), ('I013637LOD',)])
+    def test_precise_round_trip(self, i_record):
+        rng = np.random.default_rng(0)
+        n_fixes = 10_000
+        layout = compile_layout(i_record)
+        i_record = IRecord.from_string(i_record)
+        columns = fixes(
+            rng.integers(0, 86400, n_fixes),
+            rng.uniform(-90, 90, n_fixes),
+            rng.uniform(-180, 180, n_fixes),
+            rng.random(n_fixes) > .5,
+            rng.integers(-9999, 10000, n_fixes),
+            rng.integers(0, 100000, n_fixes),
+        )
+        extensions = {'ENL': rng.integers(0, 1000, n_fixes).astype('S3')}
+        data = np.frombuffer(format_b_records(columns, extensions, i_record, b'\n', precise=True), dtype=np.uint8)
+        decoded, decoded_extensions = layout.decode_lines(data, *split_lines(data), precise=True)
+        self.assertEqual(format_b_records(decoded, decoded_extensions, i_record, b'\n', precise=True), data.tobytes())
+
+        # Погрешность - половина последнего записанного знака минут: основная часть содержит отброшенные тысячные, а
+        # LAD и LOD - следующие цифры.
+        for values, expected, field in (
+            (decoded.latitude, columns.latitude, layout.latitude_digits),
+            (decoded.longitude, columns.longitude, layout.longitude_digits),
+        ):
+            width = field.stop - field.start if field is not None else 0
+            self.assertLess(np.abs(values - expected).max(), .5e-3 / 10 ** width / 60 + 1e-10)
+
+    def test_precise_without_digits(self):
+        # Без LAD и LOD в I-записи precise ничего не меняет.
+        columns = fixes([0], [54.11869], [-2.8], [True], [0], [0])
+        i_record = IRecord.from_string('I013638ENL')
+        extensions = {'ENL': np.array([b'001'])}
+        expected = format_b_records(columns, extensions, i_record)
+        self.assertEqual(format_b_records(columns, extensions, i_record, precise=True), expected)
+
+
+class TestIGCWriter(unittest.TestCase):
+
+    def test_round_trip_sample(self):
+        with open(SAMPLE, 'rb') as file:
+            data = file.read()
+
+        output = io.BytesIO()
+        writer = IGCWriter(output, newline=b'\n')
+        for item in asyncio.run(batches(data)):
+            if isinstance(item, FixBatch):
+                writer.write_fixes(item.fixes, item.extensions)
+            else:
+                writer.write_record(item)
+        writer.close()
+        self.assertEqual(output.getvalue(), data)
+
+    @parameterized.expand([(0,), (1,), (5_000,)])
+    def test_round_trip_synthetic(self, n_fixes):
+        data = synthetic_flight(n_fixes)
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'source.igc')
+            with open(source, 'wb') as file:
+                file.write(data)
+            with MappedIGCFile(source) as file:
+                columns, extensions = file.columns()
+            records = list(IGCReader(source, record_types='AHG'))
+
+            path = os.path.join(directory, 'written.igc')
+            with IGCWriter(path) as writer:
+                writer.write_records(records[:len(HEADER)])
+                writer.write_fixes(columns, extensions)
+                writer.write_records(records[len(HEADER):])
+            with open(path, 'rb') as file:
+                self.assertEqual(file.read(), data)
+
+    def test_i_record_layout(self):
+        i_record = IRecord.from_string('I023638FXA3940ENL')
+        output = io.BytesIO()
+        with IGCWriter(output) as writer:
+            writer.write_record(i_record)
+            writer.write_fixes(
+                fixes([43200], [54.1], [-2.8], [True], [100], [140]),
+                {'FXA': np.array([b'012']), 'ENL': np.array([b'34'])},
+            )
+        self.assertIs(writer.i_record, i_record)
+        self.assertEqual(output.getvalue(), b'I023638FXA3940ENL\r\nB1200005406000N00248000WA001000014001234\r\n')
+
+    def test_speed(self):
+        # Запись 100 тысяч точек должна занимать миллисекунды, а не секунды.
+        n_fixes = 100_000
+        columns = fixes(
+            np.arange(n_fixes) % 86400,
+            np.linspace(-89, 89, n_fixes),
+            np.linspace(-179, 179, n_fixes),
+            np.ones(n_fixes),
+            np.arange(n_fixes) % 9999,
+            np.arange(n_fixes) % 9999,
+        )
+        extensions = {'ENL': np.full(n_fixes, b'001')}
+        i_record = IRecord.from_string('I013638ENL')
+        seconds = float('inf')
+        for _ in range(3):
+            output = io.BytesIO()
+            start = time.perf_counter()
+            with IGCWriter(output) as writer:
+                writer.write_fixes(columns, extensions, i_record)
+            seconds = min(seconds, time.perf_counter() - start)
+        self.assertEqual(len(output.getvalue()), n_fixes * 40)
+        self.assertLess(seconds, 0.5)
@@ -0,0 +1,106 @@
+import random
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from igcrepair.reader.batch import split_lines
+from igcrepair.reader.layout import compile_layout
+from igcrepair.reader.records import BRecord, IRecord
+from igcrepair.reader.utils import RecordError, RecordFieldError
+from tests.test_batch import random_b_record
+
+
+I_RECORD = 'I033638FXA3940SIU4143ENL'
+
+
+class TestBRecordLayout(unittest.TestCase):
+
+    def test_decode(self) -> None:
+        layout = compile_layout(I_RECORD)
+        i_record = IRecord.from_string(I_RECORD)
+        rng = random.Random(0)
+        for _ in range(500):
+            line = random_b_record(rng)[:35] + '{0:03d}{1:02d}{2:03d}'.format(
+                rng.randint(0, 999), rng.randint(0, 99), rng.randint(0, 999)
+            )
+            expected = BRecord.from_string(line, i_record)
+            time = expected.time.value
+            self.assertEqual(
+                layout.decode(line),
+                (
+                    time.hour * 3600 + time.minute * 60 + time.second,
+                    expected.latitude.dd,
+                    expected.longitude.dd,
+                    expected.validity.value == 'A',
+                    expected.pressure_altitude.value,
+                    expected.gnss_altitude.value,
+                    *expected.extensions.values(),
+                ),
+            )
+            record = layout.record(line)
+            self.assertEqual(str(record), str(expected))
+            self.assertEqual(record.extensions, expected.extensions)
+
+    def test_layout(self) -> None:
+        layout = compile_layout('I024143ENL3638FXA')
+        self.assertEqual(layout.subtypes, ('FXA', 'ENL'))
+        self.assertEqual(layout.slices, (slice(35, 38), slice(40, 43)))
+        self.assertEqual(layout.length, 43)
+        self.assertEqual(compile_layout('I00').length, 35)
+
+    def test_cache(self) -> None:
+        compile_layout.cache_clear()
+        layout = compile_layout(I_RECORD)
+        self.assertIs(compile_layout(I_RECORD + '\r\n'), layout)
+        self.assertIs(compile_layout(IRecord.from_string(I_RECORD)), layout)
+        info = compile_layout.cache_info()
+        self.assertEqual((info.hits, info.misses), (2, 1))
+
+    def test_decode_lines(self) -> None:
+        lines = [
+            'B1602405407121N00249342WA00280004212050995012',
+            'B1603105407132N00249354WV002840042530509951',
+        ]
+        layout = compile_layout(I_RECORD)
+        data = np.frombuffer('\r\n'.join(lines).encode(), dtype=np.uint8)
+        fixes, extensions = layout.decode_lines(data, *split_lines(data))
+        self.assertEqual(fixes.time.tolist(), [57760, 57790])
+        self.assertEqual(fixes.validity.tolist(), [True, False])
+        self.assertEqual(extensions['FXA'].tolist(), [b'205', b'305'])
+        self.assertEqual(extensions['SIU'].tolist(), [b'09', b'09'])
+        self.assertEqual(extensions['ENL'].tolist(), [b'950', b'951'])
+
+    def test_decode_lines_precise(self) -> None:
+        lines = ['B1602405407121N00249342WA002800042142', 'B1603105407132S00249354EV0028400425X1']
+        layout = compile_layout('I023636LAD3737LOD')
+        data = np.frombuffer('\n'.join(lines).encode(), dtype=np.uint8)
+        fixes, extensions = layout.decode_lines(data, *split_lines(data[:len(lines[0])]), precise=True)
+        self.assertEqual(fixes.latitude.tolist(), [round(54 + 7.1214 / 60, 10)])
+        self.assertEqual(fixes.longitude.tolist(), [round(-(2 + 49.3422 / 60), 10)])
+        self.assertEqual(extensions['LAD'].tolist(), [b'4'])
+
+        fixes, _ = layout.decode_lines(data, *split_lines(data), precise=False)
+        self.assertEqual(fixes.latitude.tolist(), [round(54 + 7.121 / 60, 10), round(-(54 + 7.132 / 60), 10)])
+        with self.assertRaises(RecordFieldError):
+            layout.decode_lines(data, *split_lines(data), precise=True)
+
+    @parameterized.expand(
+        [
+            ('B1602405407121N00249342WA0028000421205099', RecordError),
+            ('B1602405407121N00249', RecordError),
+            ('B16024X', RecordError),
+            ('B1602405407121N00249342WX0028000421205099501', RecordFieldError),
+            ('B2402405407121N00249342WA0028000421205099501', RecordFieldError),
+            ('B1602409107121N00249342WA0028000421205099501', RecordFieldError),
+            ('B1602405460001N00249342WA0028000421205099501', RecordFieldError),
+            ('B1602405407121N18000001WA0028000421205099501', RecordFieldError),
+        ]
+    )
+    def test_decode_exception(self, line: str, expected_exception: type) -> None:
+        with self.assertRaises(expected_exception):
+            compile_layout(I_RECORD).decode(line)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import time
+import unittest
+from unittest import mock
+
+from parameterized import parameterized
+
+from igcrepair.reader.fields import TimeUTC, Latitude
+from igcrepair.reader.lazy import LazyBRecord, LazyIRecord
+from igcrepair.reader.records import IRecord, BRecord
+from igcrepair.reader.stream import IGCReader
+from igcrepair.reader.utils import RecordError, RecordFieldError
+
+
+SAMPLE = os.path.join(os.path.dirname(__file__), 'data', 'sample.igc')
+
+I_RECORD = 'I033638FXA3940SIU4143ENL'
+B_RECORD = 'B1101355206343N00006198WA005870055801004195'
+
+
+class TestLazyBRecord(unittest.TestCase):
+
+    def test_values(self) -> None:
+        eager = BRecord.from_string(B_RECORD, IRecord.from_string(I_RECORD))
+        lazy = LazyBRecord.from_string(B_RECORD, IRecord.from_string(I_RECORD))
+        for name in BRecord.__slots__:
+            self.assertEqual(str(getattr(lazy, name)), str(getattr(eager, name)))
+        self.assertEqual(str(lazy), str(eager))
+        self.assertEqual(str(lazy.decode()), B_RECORD)
+        self.assertIs(type(lazy.decode()), BRecord)
+
+    def test_decodes_once(self) -> None:
+        record = LazyBRecord.from_string(B_RECORD)
+        with mock.patch.object(TimeUTC, 'from_string', wraps=TimeUTC.from_string) as time_utc, \
+                mock.patch.object(Latitude, 'from_string', wraps=Latitude.from_string) as latitude:
+            self.assertEqual(record.time.seconds, 11 * 3600 + 1 * 60 + 35)
+            self.assertEqual(record.time.seconds, 11 * 3600 + 1 * 60 + 35)
+        self.assertEqual(time_utc.call_count, 1)
+        self.assertEqual(latitude.call_count, 0)
+
+    def test_memoryview(self) -> None:
+        data = ('HFDTE160701\n' + B_RECORD + '\n').encode()
+        record = LazyBRecord.from_string(memoryview(data)[12:12 + len(B_RECORD)], IRecord.from_string(I_RECORD))
+        self.assertEqual(str(record), B_RECORD)
+        self.assertEqual(record.extensions, {'FXA': '010', 'SIU': '04', 'ENL': '195'})
+
+    def test_set(self) -> None:
+        record = LazyBRecord.from_string(B_RECORD)
+        record.time = TimeUTC.from_string('120000')
+        self.assertTrue(str(record).startswith('B120000'))
+        self.assertEqual(record.extensions, {})
+
+    @parameterized.expand([
+        ('short', B_RECORD[:30], RecordError),
+        ('type', 'C' + B_RECORD[1:], RecordError),
+        ('bytes', b'C' + B_RECORD[1:].encode(), RecordError),
+    ])
+    def test_check(self, _, line, error) -> None:
+        with self.assertRaises(error):
+            LazyBRecord.from_string(line)
+
+    def test_field_error_on_access(self) -> None:
+        record = LazyBRecord.from_string(B_RECORD[:1] + '99' + B_RECORD[3:])
+        self.assertEqual(record.gnss_altitude.value, 558)
+        with self.assertRaises(RecordFieldError):
+            record.time
+
+    def test_unknown_attribute(self) -> None:
+        with self.assertRaises(AttributeError):
+            LazyBRecord.from_string(B_RECORD).speed
+
+    def test_faster(self) -> None:
+        lines = ['B{0:02d}{1:02d}{2:02d}4500000N00700000EA0100001100'.format(i // 3600 % 24, i // 60 % 60, i % 60)
+                 for i in range(20_000)]
+
+        def scan(cls: type) -> float:
+            start = time.perf_counter()
+            for line in lines:
+                cls.from_string(line).time
+            return time.perf_counter() - start
+
+        self.assertLess(scan(LazyBRecord) * 2, scan(BRecord))
+
+
+class TestLazyIRecord(unittest.TestCase):
+
+    def test_values(self) -> None:
+        record = LazyIRecord.from_string(I_RECORD)
+        self.assertFalse(hasattr(record, 'x'))
+        self.assertEqual(str(record), I_RECORD)
+        self.assertEqual(len(record), 3)
+        self.assertEqual(record.values(B_RECORD), IRecord.from_string(I_RECORD).values(B_RECORD))
+
+    def test_immutable(self) -> None:
+        record = LazyIRecord.from_string(I_RECORD)
+        record.extensions
+        with self.assertRaises(RecordError):
+            record.extensions = ()
+
+    def test_layout(self) -> None:
+        record = LazyBRecord.from_string(B_RECORD, LazyIRecord.from_string(I_RECORD))
+        self.assertEqual(record.extensions['ENL'], '195')
+
+
+class TestLazyReader(unittest.TestCase):
+
+    def test_sample(self) -> None:
+        eager = list(IGCReader(SAMPLE, record_types='B'))
+        lazy = list(IGCReader(SAMPLE, record_types='B', lazy=True))
+        self.assertTrue(all(type(record) is LazyBRecord for record in lazy))
+        self.assertEqual([str(record) for record in lazy], [str(record) for record in eager])
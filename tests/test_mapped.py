@@ -0,0 +1,126 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from parameterized import parameterized
+
+from igcrepair.reader.batch import decode_b_records
+from igcrepair.reader.fields import Latitude
+from igcrepair.reader.mapped import MappedIGCFile
+from igcrepair.reader.records import BRecord, IRecord
+from igcrepair.reader.stream import IGCReader
+from igcrepair.reader.utils import RecordError, RecordFieldError, record2field
+
+
+SAMPLE = os.path.join(os.path.dirname(__file__), 'data', 'sample.igc')
+
+
+class TestMappedIGCFile(unittest.TestCase):
+
+    def setUp(self) -> None:
+        with open(SAMPLE, 'rb') as file:
+            self.lines = file.read().splitlines()
+        self.fixes = [record for record in IGCReader(SAMPLE) if isinstance(record, BRecord)]
+
+    def write(self, data: bytes) -> str:
+        file = tempfile.NamedTemporaryFile(suffix='.igc', delete=False)
+        file.write(data)
+        file.close()
+        self.addCleanup(os.remove, file.name)
+        return file.name
+
+    @parameterized.expand(
+        [
+            (b'\n', b''),
+            (b'\r\n', b'\r\n'),
+            (b'\r\n', b'\r\n\r\n'),
+        ]
+    )
+    def test_index(self, newline: bytes, tail: bytes) -> None:
+        path = self.write(newline.join(self.lines) + tail)
+        with MappedIGCFile(path) as file:
+            self.assertEqual(file.count('B'), 3)
+            self.assertEqual(file.count('h'), 3)
+            self.assertEqual(file.count('X'), 0)
+            self.assertEqual(set(file.offsets), {line[:1].decode() for line in self.lines})
+            for i, line in enumerate(line for line in self.lines if line.startswith(b'B')):
+                view = file.line('B', i)
+                self.assertIsInstance(view, memoryview)
+                self.assertEqual(bytes(view), line)
+                view.release()
+            self.assertEqual(bytes(file.line('G', -1)), self.lines[-1])
+
+    def test_fix(self) -> None:
+        with MappedIGCFile(SAMPLE) as file:
+            for i, expected in enumerate(self.fixes):
+                fix = file.fix(i)
+                self.assertEqual(str(fix), str(expected))
+                self.assertEqual(fix.extensions, expected.extensions)
+            self.assertEqual(str(file.i_record), 'I033638FXA3940SIU4143ENL')
+            self.assertEqual(str(file.record('K', 0)), 'K16024800090')
+
+    def test_memoryview_parsing(self) -> None:
+        with MappedIGCFile(SAMPLE) as file:
+            view = file.line('I', 0)
+            self.assertEqual(str(IRecord.from_string(view)), 'I033638FXA3940SIU4143ENL')
+            view.release()
+            view = file.line('B', 0)
+            self.assertEqual(record2field(view, Latitude, slice(7, 15)).dd, self.fixes[0].latitude.dd)
+            view.release()
+
+    @parameterized.expand(
+        [
+            (0, None),
+            (1, None),
+            (1, 2),
+            (3, None),
+        ]
+    )
+    def test_fixes(self, start: int, stop: int) -> None:
+        expected = decode_b_records(b'\n'.join(line for line in self.lines if line.startswith(b'B')))
+        with MappedIGCFile(SAMPLE) as file:
+            fixes = file.fixes(start, stop)
+        for column, expected_column in zip(fixes, expected):
+            np.testing.assert_array_equal(column, expected_column[start:stop])
+
+    @parameterized.expand([(b'\n',), (b'\r\n',)])
+    def test_b_lines_vectorized(self, newline: bytes) -> None:
+        path = self.write(newline.join(self.lines))
+        with MappedIGCFile(path) as file:
+            file.i_record
+            with mock.patch.object(MappedIGCFile, '_end', side_effect=AssertionError):
+                _, lengths = file._b_lines(0, None)
+                columns, _ = file.columns()
+        self.assertEqual(lengths.tolist(), [len(line) for line in self.lines if line.startswith(b'B')])
+        np.testing.assert_array_equal(columns.time, [fix.time.seconds for fix in self.fixes])
+
+    @parameterized.expand(
+        [
+            ('format', b'B1601405407121N00249342WX002800042120595009', RecordFieldError),
+            ('length', b'B1601405407121N0024934', RecordError),
+        ]
+    )
+    def test_error_line_number(self, _, bad_line: bytes, error: type) -> None:
+        lines = list(self.lines)
+        b_lines = [i for i, line in enumerate(lines) if line.startswith(b'B')]
+        lines[b_lines[1]] = bad_line
+        path = self.write(b'\r\n'.join(lines))
+        with MappedIGCFile(path) as file:
+            with self.assertRaisesRegex(error, r'^Строка {0}: .*B-записи номер 2'.format(b_lines[1] + 1)):
+                file.fixes()
+            with self.assertRaisesRegex(error, r'^Строка {0}: '.format(b_lines[1] + 1)):
+                file.columns()
+
+    def test_empty(self) -> None:
+        with MappedIGCFile(self.write(b'')) as file:
+            self.assertEqual(file.count('B'), 0)
+            self.assertIsNone(file.i_record)
+            self.assertEqual(len(file.fixes().time), 0)
+            with self.assertRaises(IndexError):
+                file.fix(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
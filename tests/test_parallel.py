@@ -0,0 +1,81 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+import numpy as np
+from parameterized import parameterized
+
+from igcrepair.reader.mapped import MappedIGCFile
+from igcrepair.reader.parallel import ingest, ingest_file, iter_igc_files, main
+from igcrepair.reader.validation import validate_file
+
+
+SAMPLE = os.path.join(os.path.dirname(__file__), 'data', 'sample.igc')
+
+
+class TestParallel(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        os.mkdir(os.path.join(self.directory, 'day'))
+        for i in range(6):
+            shutil.copy(SAMPLE, os.path.join(self.directory, 'day', '{0}.IGC'.format(i)))
+        with open(SAMPLE, 'rb') as file:
+            data = file.read()
+        with open(os.path.join(self.directory, 'broken.igc'), 'wb') as file:
+            file.write(data.replace(b'\nB', b'\nB99', 1))
+        with open(os.path.join(self.directory, 'notes.txt'), 'wb') as file:
+            file.write(b'not a track')
+
+    def test_iter_igc_files(self) -> None:
+        files = iter_igc_files(self.directory)
+        self.assertEqual(
+            [os.path.relpath(path, self.directory) for path in files],
+            ['broken.igc'] + [os.path.join('day', '{0}.IGC'.format(i)) for i in range(6)],
+        )
+        self.assertEqual(iter_igc_files([SAMPLE, self.directory])[0], SAMPLE)
+
+    def test_ingest_file(self) -> None:
+        result = ingest_file(SAMPLE)
+        self.assertTrue(result.ok)
+        with MappedIGCFile(SAMPLE) as file:
+            fixes = file.fixes()
+            self.assertEqual(result.i_record, str(file.i_record))
+        for column, expected in zip(result.fixes, fixes):
+            np.testing.assert_array_equal(column, expected)
+
+    def test_ingest_broken(self) -> None:
+        path = os.path.join(self.directory, 'broken.igc')
+        result = ingest_file(path)
+        self.assertFalse(result.ok)
+        np.testing.assert_array_equal(result.errors, validate_file(path))
+        self.assertEqual(len(result.fixes.time), len(ingest_file(SAMPLE).fixes.time) - 1)
+
+    def test_ingest_missing(self) -> None:
+        result = ingest_file(os.path.join(self.directory, 'missing.igc'))
+        self.assertIsNotNone(result.error)
+        self.assertEqual(result.errors.size, 0)
+
+    @parameterized.expand([(1, None), (2, None), (3, 1)])
+    def test_ingest(self, max_workers: int, chunksize: int) -> None:
+        expected = [ingest_file(path) for path in iter_igc_files(self.directory)]
+        results = list(ingest(self.directory, max_workers=max_workers, chunksize=chunksize))
+        self.assertEqual([result.path for result in results], [result.path for result in expected])
+        for result, expected_result in zip(results, expected):
+            self.assertEqual(result.i_record, expected_result.i_record)
+            np.testing.assert_array_equal(result.errors, expected_result.errors)
+            for column, expected_column in zip(result.fixes, expected_result.fixes):
+                np.testing.assert_array_equal(column, expected_column)
+
+    def test_main(self) -> None:
+        output = io.StringIO()
+        with redirect_stdout(output):
+            code = main([self.directory, '--workers', '2', '--errors'])
+        self.assertEqual(code, 1)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len([line for line in lines if not line.startswith(' ')]), 7)
+        self.assertTrue(any(line.startswith('  строка') for line in lines))
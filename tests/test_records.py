@@ -1,9 +1,25 @@
+import datetime
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
 from parameterized import parameterized
 
-from igcrepair.reader.records import IRecord
-from igcrepair.reader.utils import RecordFieldError
+from igcrepair.reader.records import (
+    ARecord,
+    HRecord,
+    IRecord,
+    JRecord,
+    BRecord,
+    KRecord,
+    ERecord,
+    FRecord,
+    CRecord,
+    DRecord,
+    GRecord,
+    LRecord,
+)
+from igcrepair.reader.utils import RecordError, RecordFieldError
 
 
 class TestIRecord(unittest.TestCase):
@@ -46,6 +62,195 @@ class TestIRecord(unittest.TestCase):
         with self.assertRaisesRegex(RecordFieldError, expected_msg):
             IRecord.from_string(string)
 
+    @parameterized.expand(
+        [
+            ('I023636LAD3737LOD', ),
+            ('I033638FXA3940SIU4143ENL', ),
+            ('I00', ),
+        ]
+    )
+    def test_str(self, string: str) -> None:
+        self.assertEqual(str(IRecord.from_string(string)), string)
+
+    @parameterized.expand(
+        [
+            ('J023636LAD3737LOD', RecordError, r'Неправильный тип записи\. Должен быть "I", передан "J"\.'),
+            ('I', RecordError, r'Длина записи "I" должна быть не меньше 3\.'),
+            (None, RecordError, r'Передаваемое значение должно быть типа <str>\.'),
+        ]
+    )
+    def test_record_type_exception(self, string: str, expected_exception: type, expected_msg: str) -> None:
+        with self.assertRaisesRegex(expected_exception, expected_msg):
+            IRecord.from_string(string)
+
+
+    def test_cache(self) -> None:
+        lines = ['I023636LAD3737LOD', 'I033638FXA3940SIU4143ENL', 'I013636ENL', 'I00', 'I023638FXA3941ENL']
+        IRecord.cache_clear()
+        records = [IRecord.from_string(lines[i % len(lines)]) for i in range(1000)]
+        self.assertEqual(IRecord.cache_info().misses, len(lines))
+        self.assertEqual(IRecord.cache_info().hits, 1000 - len(lines))
+        self.assertIs(records[0], records[len(lines)])
+        self.assertIs(IRecord.from_string(lines[0].encode()), records[0])
+        self.assertIsNot(JRecord.from_string('J' + lines[0][1:]), records[0])
+
+    def test_cache_threads(self) -> None:
+        IRecord.cache_clear()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            records = list(executor.map(IRecord.from_string, ['I033638FXA3940SIU4143ENL'] * 200))
+        self.assertTrue(all(str(record) == 'I033638FXA3940SIU4143ENL' for record in records))
+        self.assertLessEqual(IRecord.cache_info().currsize, 1)
+
+    def test_immutable(self) -> None:
+        record = IRecord.from_string('I023636LAD3737LOD')
+        with self.assertRaisesRegex(RecordError, 'нельзя изменить'):
+            record.extensions = ()
+        with self.assertRaisesRegex(RecordError, 'нельзя изменить'):
+            del record.extensions
+        with self.assertRaisesRegex(RecordFieldError, 'нельзя изменить'):
+            record.extensions[0].subtype = record.extensions[1].subtype
+        with self.assertRaisesRegex(RecordFieldError, 'нельзя изменить'):
+            record.extensions[0].start.value = 1
+        self.assertEqual(str(record), 'I023636LAD3737LOD')
+
+
+class TestJRecord(unittest.TestCase):
+
+    def test_from_string(self) -> None:
+        record = JRecord.from_string('J010812HDT')
+        self.assertEqual(len(record), 1)
+        self.assertEqual(record.extensions[0].subtype.value, 'HDT')
+        self.assertEqual(str(record), 'J010812HDT')
+
+
+class TestBRecord(unittest.TestCase):
+
+    @parameterized.expand(
+        [
+            ('B1602405407121N00249342WA0028000421', None, {}),
+            ('B1602405407121N00249342WA0028000421', IRecord.from_string('I00'), {}),
+            (
+                'B1602405407121N00249342WA00280004212050995',
+                IRecord.from_string('I033638FXA3940SIU4142ENL'),
+                {'FXA': '205', 'SIU': '09', 'ENL': '95'},
+            ),
+        ]
+    )
+    def test_from_string(self, string: str, layout: IRecord, expected_extensions: dict) -> None:
+        record = BRecord.from_string(string, layout)
+        self.assertEqual(record.time.value, datetime.time(16, 2, 40))
+        self.assertEqual(record.latitude.dd, round(54 + 7.121 / 60, 10))
+        self.assertEqual(record.longitude.dd, -round(2 + 49.342 / 60, 10))
+        self.assertEqual(record.validity.value, 'A')
+        self.assertEqual(record.pressure_altitude.value, 280)
+        self.assertEqual(record.gnss_altitude.value, 421)
+        self.assertEqual(record.extensions, expected_extensions)
+        self.assertEqual(str(record), string)
+
+    @parameterized.expand(
+        [
+            ('B1602405407121N00249342WA002800042', None, RecordError, r'Длина записи "B" должна быть не меньше 35\.'),
+            (
+                'B1602405407121N00249342WA0028000421205',
+                IRecord.from_string('I023638FXA3940SIU'),
+                RecordError,
+                r'Дополнение SIU выходит за пределы записи длины 38\.',
+            ),
+            ('B1602405407121N00249342WX0028000421', None, RecordFieldError, r'Формат поля Validity'),
+        ]
+    )
+    def test_from_string_exception(
+        self,
+        string: str,
+        layout: IRecord,
+        expected_exception: type,
+        expected_msg: str,
+    ) -> None:
+        with self.assertRaisesRegex(expected_exception, expected_msg):
+            BRecord.from_string(string, layout)
+
+
+class TestRecords(unittest.TestCase):
+
+    @parameterized.expand(
+        [
+            (ARecord, 'AXCSAAA'),
+            (ARecord, 'AFLA6NGFLIGHT1'),
+            (ARecord, 'ALXNGIIFLIGHT:1'),
+            (ARecord, 'AXSX001 SeeYou'),
+            (HRecord, 'HFDTE160701'),
+            (HRecord, 'HFPLTPILOTINCHARGE:Bloggs Bill D'),
+            (KRecord, 'K160248'),
+            (ERecord, 'E160245PEVPILOT EVENT'),
+            (ERecord, 'E160245PEV'),
+            (FRecord, 'F1605010205090701'),
+            (FRecord, 'F160501'),
+            (CRecord, 'C5111359N00101503WSTART'),
+            (DRecord, 'D20331'),
+            (GRecord, 'GABCDEF1234567890'),
+            (LRecord, 'LXXXcomment text'),
+        ]
+    )
+    def test_str(self, record_class: type, string: str) -> None:
+        self.assertEqual(str(record_class.from_string(string)), string)
+
+    def test_fields(self) -> None:
+        record = ARecord.from_string('AXCSAAA')
+        self.assertEqual(record.manufacturer.value, 'XCS')
+        self.assertEqual(record.unique_id.value, 'AAA')
+        self.assertEqual(record.id_extension.value, '')
+
+        record = HRecord.from_string('HFDTE160701')
+        self.assertEqual(record.source.value, 'F')
+        self.assertEqual(record.subject.value, 'DTE')
+        self.assertEqual(record.text.value, '160701')
+
+        record = KRecord.from_string('K16024800090', JRecord.from_string('J010812HDT'))
+        self.assertEqual(record.extensions, {'HDT': '00090'})
+
+        record = FRecord.from_string('F1605010205090701')
+        self.assertEqual([satellite.value for satellite in record.satellites], [2, 5, 9, 7, 1])
+
+    @parameterized.expand(
+        [
+            ('gap', 'I023638FXA4143ENL', 'B1101355206343N00006198WA0058700558010XX195'),
+            ('trailing', 'I023638FXA3940SIU', 'B1101355206343N00006198WA005870055801004205950'),
+            ('no layout', None, 'B1101355206343N00006198WA0058700558010XX195'),
+        ]
+    )
+    def test_b_record_round_trip(self, _, i_record: Optional[str], string: str) -> None:
+        layout = IRecord.from_string(i_record) if i_record is not None else None
+        record = BRecord.from_string(string, layout)
+        self.assertEqual(str(record), string)
+        record.extensions['FXA'] = '123'
+        if layout is not None:
+            self.assertEqual(str(record), string[:35] + '123' + string[38:])
+
+    def test_k_record_round_trip(self) -> None:
+        record = KRecord.from_string('K16024800090 12', JRecord.from_string('J010812HDT'))
+        self.assertEqual(str(record), 'K16024800090 12')
+        record.extensions['HDT'] = '00180'
+        self.assertEqual(str(record), 'K16024800180 12')
+
+    def test_extensions_padded(self) -> None:
+        layout = IRecord.from_string('I023638FXA4143ENL')
+        record = BRecord.from_string('B1101355206343N00006198WA0058700558010XX195', layout)
+        record.tail = ''
+        self.assertEqual(str(record)[35:], '010  195')
+
+    @parameterized.expand(
+        [
+            (ARecord, 'AXCS', RecordError),
+            (HRecord, 'HXDTE160701', RecordFieldError),
+            (FRecord, 'F160501020', RecordError),
+            (ERecord, 'E160245', RecordError),
+            (LRecord, 'Bcomment', RecordError),
+        ]
+    )
+    def test_from_string_exception(self, record_class: type, string: str, expected_exception: type) -> None:
+        with self.assertRaises(expected_exception):
+            record_class.from_string(string)
+
 
 if __name__ == '__main__':
     unittest.main()
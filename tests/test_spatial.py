@@ -0,0 +1,120 @@
+import time
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from igcrepair.reader.batch import Fixes
+from igcrepair.reader.table import FixTable
+from igcrepair.repair.geo import distance
+from igcrepair.repair.spatial import SpatialIndex
+
+
+def random_track(n_fixes: int, latitude: float, longitude: float, seed: int = 0) -> Fixes:
+    rng = np.random.default_rng(seed)
+    return Fixes(
+        np.arange(n_fixes, dtype=np.int32),
+        latitude + np.cumsum(rng.normal(0, 1e-3, n_fixes)),
+        (longitude + np.cumsum(rng.normal(0, 1e-3, n_fixes)) + 180) % 360 - 180,
+        np.ones(n_fixes, dtype=bool),
+        np.zeros(n_fixes, dtype=np.int32),
+        np.zeros(n_fixes, dtype=np.int32),
+    )
+
+
+class TestSpatialIndex(unittest.TestCase):
+
+    @parameterized.expand([
+        ('alps', 46., 8.),
+        ('antimeridian', 0., 179.9),
+        ('north', 89.8, 0.),
+    ])
+    def test_matches_linear_scan(self, _, latitude, longitude):
+        track = random_track(20_000, latitude, longitude)
+        index = SpatialIndex.from_fixes(track)
+        rng = np.random.default_rng(1)
+        for i in rng.integers(0, 20_000, 20):
+            center = track.latitude[i], track.longitude[i]
+            for radius in (100., 2_000., 20_000.):
+                expected = np.flatnonzero(distance(*center, track.latitude, track.longitude) <= radius)
+                np.testing.assert_array_equal(index.within(*center, radius), expected)
+
+            south, north = center[0] - .01, center[0] + .02
+            west, east = (center[1] - .03 + 180) % 360 - 180, (center[1] + .01 + 180) % 360 - 180
+            inside_longitude = (
+                (track.longitude >= west) & (track.longitude <= east) if west <= east
+                else (track.longitude >= west) | (track.longitude <= east)
+            )
+            expected = np.flatnonzero((track.latitude >= south) & (track.latitude <= north) & inside_longitude)
+            np.testing.assert_array_equal(index.bbox(south, west, north, east), expected)
+
+            query = center[0] + .001, center[1]
+            distances = distance(*query, track.latitude, track.longitude)
+            self.assertEqual(index.nearest(*query), (int(np.argmin(distances)), float(distances.min())))
+
+    def test_bbox_antimeridian_same_column(self):
+        track = random_track(2_000, 40., 16.84)
+        index = SpatialIndex.from_fixes(track, cell=.5)
+        result = index.bbox(32.98, 16.858, 74.81, 16.828)
+        expected = np.flatnonzero(
+            (track.latitude >= 32.98) & (track.latitude <= 74.81)
+            & ((track.longitude >= 16.858) | (track.longitude <= 16.828))
+        )
+        self.assertEqual(len(np.unique(result)), len(result))
+        np.testing.assert_array_equal(result, expected)
+
+    def test_nearest_far(self):
+        index = SpatialIndex.from_fixes(random_track(100, 46., 8.))
+        i, meters = index.nearest(-46., -172.)
+        self.assertGreater(meters, 15_000_000)
+        self.assertEqual(i, int(np.argmin(distance(-46., -172., index.latitude, index.longitude))))
+        with self.assertRaises(ValueError):
+            SpatialIndex().nearest(0., 0.)
+
+    def test_incremental(self):
+        track = random_track(5_000, 46., 8.)
+        bulk = SpatialIndex.from_fixes(track)
+        streamed = SpatialIndex()
+        for i in range(3_000):
+            streamed.append(track.latitude[i], track.longitude[i], track.time[i])
+        streamed.extend(track.latitude[3_000:], track.longitude[3_000:], track.time[3_000:])
+        streamed.append(46., 8., 5_000)
+        self.assertEqual(len(streamed), 5_001)
+        for i in (0, 2_999, 4_999):
+            center = track.latitude[i], track.longitude[i]
+            within = streamed.within(*center, 1_000.)
+            np.testing.assert_array_equal(within[within < 5_000], bulk.within(*center, 1_000.))
+        bbox = streamed.bbox(45., 7., 47., 9.)
+        np.testing.assert_array_equal(bbox[bbox < 5_000], bulk.bbox(45., 7., 47., 9.))
+        self.assertIn(5_000, streamed.within(46., 8., 1.))
+
+    def test_during(self):
+        index = SpatialIndex()
+        index.extend([0., 0., 0., 0.], [0., 0., 0., 0.], [10, 30, 20, 40])
+        np.testing.assert_array_equal(index.during(15, 35), [2, 1])
+        index.append(0., 0., 25)
+        np.testing.assert_array_equal(index.during(15, 35), [2, 4, 1])
+
+    def test_fix_table(self):
+        table = FixTable(random_track(100, 46., 8.))
+        self.assertIs(table.spatial_index, table.spatial_index)
+        self.assertEqual(len(table.spatial_index), 100)
+
+    def test_bad_cell(self):
+        with self.assertRaises(ValueError):
+            SpatialIndex(cell=0.)
+
+    def test_speed(self):
+        track = random_track(100_000, 46., 8.)
+        index = SpatialIndex.from_fixes(track)
+        rng = np.random.default_rng(2)
+        centers = rng.integers(0, 100_000, 200)
+        start = time.perf_counter()
+        for i in centers:
+            index.within(track.latitude[i], track.longitude[i], 1_000.)
+            index.bbox(track.latitude[i] - .01, track.longitude[i] - .01, track.latitude[i] + .01,
+                       track.longitude[i] + .01)
+            index.nearest(track.latitude[i] + .001, track.longitude[i])
+            index.during(int(track.time[i]), int(track.time[i]) + 60)
+        # Четыре запроса на центр; в среднем меньше 1 мс на запрос.
+        self.assertLess((time.perf_counter() - start) / (4 * len(centers)), 1e-3)
@@ -0,0 +1,139 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from benchmarks.synthetic import synthetic_flight
+from igcrepair.reader.batch import Fixes
+from igcrepair.reader.layout import compile_layout
+from igcrepair.repair.spikes import (
+    POSITION,
+    PRESSURE_ALTITUDE,
+    GNSS_ALTITUDE,
+    filter_spikes,
+    filter_spikes_stream,
+    find_spikes,
+)
+from tests.helpers import fixes
+
+
+def rows(track: Fixes) -> list:
+    return list(zip(*(column.tolist() for column in track)))
+
+
+def noisy_track(n_fixes: int = 5_000, seed: int = 0) -> Fixes:
+    """
+    Трек со случайными выбросами длиной 1-3 точки, в том числе через полночь и антимеридиан.
+    """
+    rng = np.random.default_rng(seed)
+    latitude = 45 + np.cumsum(rng.normal(0, 2e-4, n_fixes))
+    longitude = (179.5 + np.cumsum(rng.normal(0, 2e-4, n_fixes)) + 180) % 360 - 180
+    pressure_altitude = 1000 + np.cumsum(rng.integers(-3, 4, n_fixes))
+    gnss_altitude = pressure_altitude + 40
+    for length in (1, 2, 3):
+        spikes = rng.choice(np.arange(2, n_fixes - 4), 40, replace=False)
+        for offset in range(length):
+            latitude[spikes[:15] + offset] += 0.1
+            pressure_altitude[spikes[15:30] + offset] += 500
+            gnss_altitude[spikes[25:] + offset] -= 700
+    return fixes(
+        (86000 + np.arange(n_fixes)) % 86400,
+        np.round(latitude, 10),
+        np.round(longitude, 10),
+        pressure_altitude=pressure_altitude,
+        gnss_altitude=gnss_altitude,
+    )
+
+
+class TestFilterSpikes(unittest.TestCase):
+
+    def test_single_spikes(self):
+        track = fixes(
+            time=[0, 1, 2, 3, 4, 5],
+            latitude=[45., 45.0002, 46., 45.0006, 45.0008, 45.001],
+            longitude=[10.] * 6,
+            pressure_altitude=[100, 101, 102, 900, 104, 105],
+            gnss_altitude=[140, 141, 142, 143, 144, 900],
+        )
+        result = filter_spikes(track)
+        np.testing.assert_array_equal(result.flags, [0, 0, POSITION, PRESSURE_ALTITUDE, 0, 0])
+        np.testing.assert_allclose(result.fixes.latitude, [45., 45.0002, 45.0004, 45.0006, 45.0008, 45.001])
+        np.testing.assert_array_equal(result.fixes.pressure_altitude, [100, 101, 102, 103, 104, 105])
+        # Последняя точка не может быть выбросом: после нее нет опорной точки.
+        np.testing.assert_array_equal(result.fixes.gnss_altitude, track.gnss_altitude)
+
+    def test_flag_only(self):
+        track = fixes([0, 1, 2], [0., 1., 0.], [0.] * 3, pressure_altitude=[0] * 3, gnss_altitude=[0] * 3)
+        result = filter_spikes(track, correct=False)
+        np.testing.assert_array_equal(result.flags, [0, POSITION, 0])
+        np.testing.assert_array_equal(result.fixes.latitude, track.latitude)
+
+    def test_step_is_not_spike(self):
+        # Скачок без возврата (например, после долгой потери сигнала) не исправляется.
+        track = fixes(
+            [0, 1, 2, 3], [0., 0., 1., 1.], [0.] * 4, pressure_altitude=[0, 0, 500, 500], gnss_altitude=[0] * 4
+        )
+        self.assertFalse(filter_spikes(track).flags.any())
+
+    def test_max_length(self):
+        track = fixes([0, 1, 2, 3, 4], [0.] * 5, [0.] * 5, pressure_altitude=[0, 0, 800, 800, 0], gnss_altitude=[0] * 5)
+        self.assertFalse(filter_spikes(track, max_length=1).flags.any())
+        result = filter_spikes(track, max_length=2)
+        np.testing.assert_array_equal(result.flags, [0, 0, PRESSURE_ALTITUDE, PRESSURE_ALTITUDE, 0])
+        np.testing.assert_array_equal(result.fixes.pressure_altitude, [0] * 5)
+
+    def test_anchors(self):
+        track = fixes([0, 1, 2, 3], [0.] * 4, [0.] * 4, pressure_altitude=[0] * 4, gnss_altitude=[0, 0, 900, 0])
+        left, right = find_spikes(track)[GNSS_ALTITUDE]
+        np.testing.assert_array_equal(left, [-1, -1, 1, -1])
+        np.testing.assert_array_equal(right, [-1, -1, 3, -1])
+
+    def test_antimeridian(self):
+        track = fixes([0, 1, 2], [0.] * 3, [179.9995, 10., -179.9995], pressure_altitude=[0] * 3, gnss_altitude=[0] * 3)
+        result = filter_spikes(track)
+        self.assertEqual(result.flags[1], POSITION)
+        self.assertAlmostEqual(abs(result.fixes.longitude[1]), 180.)
+
+    @parameterized.expand([(0,), (1,), (2,)])
+    def test_short(self, n_fixes):
+        zeros = [0] * n_fixes
+        track = fixes(range(n_fixes), [0.] * n_fixes, [0.] * n_fixes, pressure_altitude=zeros, gnss_altitude=zeros)
+        self.assertFalse(filter_spikes(track).flags.any())
+        self.assertEqual(len(list(filter_spikes_stream(rows(track)))), n_fixes)
+
+    def test_bad_max_length(self):
+        with self.assertRaises(ValueError):
+            filter_spikes(Fixes.empty(), max_length=0)
+        with self.assertRaises(ValueError):
+            list(filter_spikes_stream([], max_length=0))
+
+
+class TestFilterSpikesStream(unittest.TestCase):
+
+    @parameterized.expand([(1, True), (2, True), (3, True), (2, False)])
+    def test_matches_batch(self, max_length, correct):
+        track = noisy_track()
+        batch = filter_spikes(track, max_length=max_length, correct=correct)
+        stream = list(filter_spikes_stream(rows(track), max_length=max_length, correct=correct))
+        self.assertGreater(np.count_nonzero(batch.flags), 30)
+        np.testing.assert_array_equal([flags for _, flags in stream], batch.flags)
+        self.assertEqual([fix for fix, _ in stream], rows(batch.fixes))
+
+    def test_lazy(self):
+        def source():
+            yield from rows(noisy_track(100))
+            raise AssertionError('Генератор прочитан дальше, чем нужно.')
+
+        stream = filter_spikes_stream(source(), max_length=3)
+        self.assertEqual(len([next(stream) for _ in range(97)]), 97)
+
+    def test_decoded_lines(self):
+        # Точки BRecordLayout.decode: дополнения проходят без изменений.
+        layout = compile_layout('I013638ENL')
+        data = synthetic_flight(200)
+        lines = [line.decode() + '001' for line in data.split(b'\r\n') if line.startswith(b'B')]
+        lines[50] = lines[50][:25] + '09000' + lines[50][30:]
+        stream = list(filter_spikes_stream(layout.decode(line) for line in lines))
+        self.assertEqual([i for i, (_, flags) in enumerate(stream) if flags], [50])
+        self.assertEqual(stream[50][0][-1], '001')
+        self.assertEqual(stream[50][0][4], round((layout.decode(lines[49])[4] + layout.decode(lines[51])[4]) / 2))
@@ -0,0 +1,67 @@
+import io
+import os
+import unittest
+
+from parameterized import parameterized
+
+from igcrepair.reader.records import BRecord, KRecord, IRecord, JRecord
+from igcrepair.reader.stream import IGCReader
+from igcrepair.reader.utils import RecordError, RecordFieldError
+
+
+SAMPLE = os.path.join(os.path.dirname(__file__), 'data', 'sample.igc')
+
+
+def sample_lines():
+    with open(SAMPLE) as file:
+        return file.read().splitlines()
+
+
+class TestIGCReader(unittest.TestCase):
+
+    def test_path(self) -> None:
+        records = list(IGCReader(SAMPLE))
+        self.assertEqual([str(record) for record in records], sample_lines())
+        self.assertEqual(
+            ''.join(record.RECORD_TYPE.value for record in records),
+            'AHHHIJCCLFBBEKBDG',
+        )
+
+    @parameterized.expand(
+        [
+            ('\n', ),
+            ('\r\n', ),
+        ]
+    )
+    def test_file_object(self, newline: str) -> None:
+        data = (newline.join(sample_lines()) + newline).encode()
+        self.assertEqual([str(record) for record in IGCReader(io.BytesIO(data))], sample_lines())
+        self.assertEqual([str(record) for record in IGCReader(io.StringIO(data.decode()))], sample_lines())
+
+    def test_extensions(self) -> None:
+        reader = IGCReader(SAMPLE)
+        records = [record for record in reader if isinstance(record, (BRecord, KRecord))]
+        self.assertEqual(records[0].extensions, {'FXA': '205', 'SIU': '09', 'ENL': '950'})
+        self.assertEqual(records[2].extensions, {'HDT': '00090'})
+        self.assertIsInstance(reader.i_record, IRecord)
+        self.assertIsInstance(reader.j_record, JRecord)
+
+    def test_record_types(self) -> None:
+        records = list(IGCReader(SAMPLE, record_types='b'))
+        self.assertEqual(len(records), 3)
+        self.assertTrue(all(isinstance(record, BRecord) for record in records))
+        self.assertEqual(records[0].extensions, {'FXA': '205', 'SIU': '09', 'ENL': '950'})
+
+    def test_lazy(self) -> None:
+        records = iter(IGCReader(io.StringIO('AXCSAAA\nBroken line\n')))
+        self.assertEqual(str(next(records)), 'AXCSAAA')
+        with self.assertRaisesRegex(RecordError, r'Строка 2: '):
+            next(records)
+
+    def test_unknown_record_type(self) -> None:
+        with self.assertRaisesRegex(RecordFieldError, r'Строка 1: '):
+            list(IGCReader(io.StringIO('XXCSAAA\n')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import io
+import os
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_flight
+from igcrepair.reader.fields import Latitude, PressureAltitude, TimeUTC
+from igcrepair.reader.records import BRecord
+from igcrepair.reader.stream import IGCReader
+from igcrepair.reader.table import FixTable
+
+
+SAMPLE = os.path.join(os.path.dirname(__file__), 'data', 'sample.igc')
+
+
+class TestFixTable(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.records = [record for record in IGCReader(SAMPLE) if isinstance(record, BRecord)]
+
+    def test_from_file(self) -> None:
+        table = FixTable.from_file(SAMPLE)
+        self.assertEqual(len(table), 3)
+        for record, expected in zip(table, self.records):
+            self.assertEqual(str(record), str(expected)[:35])
+
+    def test_from_records(self) -> None:
+        table = FixTable.from_records(self.records)
+        expected = FixTable.from_file(SAMPLE)
+        for column, expected_column in zip(table.fixes, expected.fixes):
+            self.assertEqual(column.dtype, expected_column.dtype)
+            np.testing.assert_array_equal(column, expected_column)
+
+    def test_fields(self) -> None:
+        table = FixTable.from_file(SAMPLE)
+        self.assertIsInstance(table.time(0), TimeUTC)
+        self.assertEqual(table.time(0).value, self.records[0].time.value)
+        self.assertIsInstance(table.latitude(1), Latitude)
+        self.assertEqual(table.latitude(1).dd, self.records[1].latitude.dd)
+        self.assertIsInstance(table.pressure_altitude(2), PressureAltitude)
+        self.assertEqual(table.validity(2).value, 'V')
+
+    def test_slice(self) -> None:
+        table = FixTable.from_file(SAMPLE)[1:]
+        self.assertIsInstance(table, FixTable)
+        self.assertEqual(len(table), 2)
+        self.assertEqual(str(table[0]), str(self.records[1])[:35])
+
+    def test_slots(self) -> None:
+        record = FixTable.from_file(SAMPLE)[0]
+        for value in (record, record.time, record.latitude, record.validity, record.pressure_altitude):
+            self.assertFalse(hasattr(value, '__dict__'))
+
+    def test_memory(self) -> None:
+        data = synthetic_flight(2000)
+
+        tracemalloc.start()
+        records = list(IGCReader(io.BytesIO(data), record_types='B'))
+        records_size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        table = FixTable.from_records(records)
+        del records
+        table_size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.assertEqual(len(table), 2000)
+        self.assertGreaterEqual(records_size / table_size, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import datetime
+import time
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from igcrepair.reader.batch import Fixes
+from igcrepair.reader.records import HRecord, ARecord
+from igcrepair.reader.utils import RecordFieldError
+from igcrepair.repair.timestamps import find_flight_date, normalize_time, parse_date, time_range, to_epoch
+from tests.helpers import fixes
+
+
+DATE = datetime.date(2001, 7, 16)
+EPOCH = 995241600
+
+
+class TestFlightDate(unittest.TestCase):
+
+    @parameterized.expand([
+        ('160701', datetime.date(2001, 7, 16)),
+        ('DATE:160701,01', datetime.date(2001, 7, 16)),
+        ('311299', datetime.date(1999, 12, 31)),
+    ])
+    def test_parse_date(self, text, date):
+        self.assertEqual(parse_date(text), date)
+
+    @parameterized.expand([('',), ('1607',), ('DATE:320101',), ('160001',)])
+    def test_parse_date_wrong(self, text):
+        with self.assertRaises(RecordFieldError):
+            parse_date(text)
+
+    def test_find_flight_date(self):
+        records = [
+            ARecord.from_string('AXXXABC'),
+            HRecord.from_string('HFPLTPILOT:X'),
+            HRecord.from_string('HFDTE160701'),
+        ]
+        self.assertEqual(find_flight_date(records), DATE)
+        self.assertIsNone(find_flight_date(records[:2]))
+
+
+class TestToEpoch(unittest.TestCase):
+
+    def test_rollover(self):
+        epoch = to_epoch(np.array([86398, 86399, 0, 1, 86399, 0]), DATE)
+        self.assertEqual(epoch.dtype, np.int64)
+        np.testing.assert_array_equal(epoch - EPOCH, [86398, 86399, 86400, 86401, 86399, 86400])
+        epoch = to_epoch(np.array([80000, 20000, 60000, 10000]), DATE)
+        np.testing.assert_array_equal(epoch - EPOCH, [80000, 106400, 146400, 182800])
+
+    def test_backwards_is_not_rollover(self):
+        np.testing.assert_array_equal(to_epoch(np.array([100, 90, 110]), DATE) - EPOCH, [100, 90, 110])
+
+    def test_time_range(self):
+        epoch = EPOCH + np.array([0, 1, 5, 10])
+        self.assertEqual(time_range(epoch, EPOCH + 1, EPOCH + 10), slice(1, 3))
+
+
+class TestNormalizeTime(unittest.TestCase):
+
+    def test_drop(self):
+        track = fixes([86398, 86399, 86399, 86397, 0, 2, 1, 3])
+        extensions = {'ENL': np.array([b'1', b'2', b'3', b'4', b'5', b'6', b'7', b'8'])}
+        result = normalize_time(track, DATE, extensions)
+        np.testing.assert_array_equal(result.epoch - EPOCH, [86398, 86399, 86400, 86402, 86403])
+        np.testing.assert_array_equal(result.fixes.time, [86398, 86399, 0, 2, 3])
+        np.testing.assert_array_equal(result.source, [0, 1, 4, 5, 7])
+        np.testing.assert_array_equal(result.fixes.latitude, [0., 1., 4., 5., 7.])
+        np.testing.assert_array_equal(result.extensions['ENL'], [b'1', b'2', b'5', b'6', b'8'])
+        self.assertEqual((result.rollovers, result.duplicates, result.backwards), (1, 1, 2))
+
+    def test_resample(self):
+        track = fixes([10, 12, 13, 17], latitude=[0., .002, .003, .007], longitude=[179.999, -179.999, 0., 0.])
+        result = normalize_time(track, DATE, interval=2)
+        np.testing.assert_array_equal(result.fixes.time, [10, 12, 14, 16])
+        np.testing.assert_allclose(result.fixes.latitude, [0., .002, .004, .006])
+        self.assertEqual(result.fixes.longitude[1], -179.999)
+        np.testing.assert_array_equal(result.fixes.pressure_altitude, [0, 10, 22, 28])
+        np.testing.assert_array_equal(result.source, [0, 1, 2, 2])
+        self.assertTrue(np.all(np.diff(result.epoch) == 2))
+
+    def test_resample_antimeridian(self):
+        track = fixes([0, 2], latitude=[0., 0.], longitude=[179.999, -179.999])
+        self.assertAlmostEqual(abs(normalize_time(track, DATE, interval=1).fixes.longitude[1]), 180.)
+
+    @parameterized.expand([(None,), (5,)])
+    def test_empty(self, interval):
+        result = normalize_time(Fixes.empty(), DATE, interval=interval)
+        self.assertEqual(len(result.epoch), 0)
+        self.assertEqual(result.epoch.dtype, np.int64)
+
+    def test_bad_interval(self):
+        with self.assertRaises(ValueError):
+            normalize_time(fixes([0, 1]), DATE, interval=0)
+
+    def test_speed(self):
+        n_fixes = 1_000_000
+        rng = np.random.default_rng(0)
+        seconds = (50_000 + np.arange(n_fixes) + rng.integers(-2, 3, n_fixes)) % 86400
+        track = fixes(seconds, latitude=rng.random(n_fixes), longitude=rng.random(n_fixes))
+        start = time.perf_counter()
+        result = normalize_time(track, DATE, interval=1)
+        self.assertLess(time.perf_counter() - start, 3.)
+        self.assertTrue(np.all(np.diff(result.epoch) == 1))
+        self.assertEqual(result.rollovers, 12)
@@ -4,7 +4,7 @@ from unittest.mock import MagicMock
 
 from parameterized import parameterized
 
-from igcrepair.reader.utils import record2field
+from igcrepair.reader.utils import record2field, record2string
 
 
 class TestGetField(unittest.TestCase):
@@ -25,3 +25,15 @@ class TestGetField(unittest.TestCase):
         record2field(s, mocked_field, *idx)
         args, _ = mocked_field.from_string.call_args
         self.assertEqual(args[0], expected_value)
+
+    @parameterized.expand(
+        [
+            (b'abcdefghijklmopqrstuvwxyz', [0, ], 'a'),
+            (b'abcdefghijklmopqrstuvwxyz', [1, 3, ], 'bd'),
+            (b'abcdefghijklmopqrstuvwxyz', [-1, ], 'z'),
+            (memoryview(b'abcdefghijklmopqrstuvwxyz'), [slice(1, 4), 5], 'bcdf'),
+            (memoryview(b'abcdefghijklmopqrstuvwxyz'), [slice(100, None)], ''),
+        ]
+    )
+    def test_record2string_bytes(self, s: bytes, idx: List[Union[int, slice]], expected_value: str) -> None:
+        self.assertEqual(record2string(s, *idx), expected_value)
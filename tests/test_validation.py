@@ -0,0 +1,100 @@
+import os
+import random
+import tempfile
+import unittest
+
+from parameterized import parameterized
+
+from igcrepair.reader.records import BRecord
+from igcrepair.reader.utils import RecordError, RecordFieldError
+from igcrepair.reader.validation import validate_buffer, validate_file
+from tests.test_batch import random_b_record
+
+
+SAMPLE = os.path.join(os.path.dirname(__file__), 'data', 'sample.igc')
+
+I_RECORD = b'I033638FXA3940SIU4143ENL'
+B_RECORD = b'B1101355206343N00006198WA0058700558'
+
+
+class TestValidation(unittest.TestCase):
+
+    def test_sample(self) -> None:
+        self.assertEqual(validate_file(SAMPLE).size, 0)
+
+    def test_empty(self) -> None:
+        file = tempfile.NamedTemporaryFile(suffix='.igc', delete=False)
+        file.close()
+        self.addCleanup(os.remove, file.name)
+        self.assertEqual(validate_file(file.name).size, 0)
+        self.assertEqual(validate_buffer(b'').size, 0)
+
+    def test_all_errors(self) -> None:
+        table = validate_buffer(
+            b'\r\n'.join(
+                [
+                    I_RECORD,
+                    B_RECORD + b'000001002',
+                    b'B1160005206343X00006198WQ00587xx558000001002',
+                    b'Q line',
+                    b'',
+                    b'HQDTE',
+                    b'B11013',
+                    B_RECORD + b'0000',
+                ]
+            )
+        )
+        self.assertEqual(
+            [(int(row['line']), str(row['record_type']), str(row['field'])) for row in table],
+            [
+                (3, 'B', 'TimeUTC'),
+                (3, 'B', 'Latitude'),
+                (3, 'B', 'Validity'),
+                (3, 'B', 'GNSSAltitude'),
+                (4, 'Q', 'RecordLiteral'),
+                (6, 'H', 'DataSource'),
+                (7, 'B', 'BRecord'),
+                (8, 'B', 'Extension'),
+                (8, 'B', 'Extension'),
+            ],
+        )
+        self.assertTrue(all(table['reason']))
+
+    def test_extensions_by_preceding_i_record(self) -> None:
+        table = validate_buffer(
+            b'\r\n'.join(
+                [
+                    b'I013638ENL',
+                    B_RECORD + b'001',
+                    b'I023638ENL3945TAS',
+                    B_RECORD + b'0011234567',
+                    B_RECORD + b'001',
+                    b'I013638ENL',
+                    B_RECORD + b'002',
+                ]
+            )
+        )
+        self.assertEqual([(int(row['line']), str(row['field'])) for row in table], [(5, 'Extension')])
+        self.assertIn('TAS', str(table['reason'][0]))
+
+    @parameterized.expand([(seed,) for seed in range(5)])
+    def test_agrees_with_records(self, seed: int) -> None:
+        rng = random.Random(seed)
+        lines = []
+        for _ in range(200):
+            line = list(random_b_record(rng))
+            if rng.random() < 0.5:
+                line[rng.randrange(1, len(line))] = rng.choice('0123456789ANSEWV-x ')
+            lines.append(''.join(line))
+
+        table = validate_buffer('\n'.join(lines).encode())
+        for number, line in enumerate(lines, start=1):
+            fields = set(table['field'][table['line'] == number])
+            try:
+                BRecord.from_string(line)
+            except RecordFieldError as error:
+                self.assertIn(error.field, fields)
+            except RecordError:
+                self.assertTrue(fields)
+            else:
+                self.assertFalse(fields, line)